@@ -1,108 +1,2986 @@
 import time
+APP_STARTED = time.perf_counter()  # startup report: everything is timed from here
 import threading
 import sys
 import os
 import subprocess
 import io
-import winreg
+import socket
+import socketserver
+import struct
+import array
+import math
 import configparser
 import logging
+import bisect
+import queue
+import signal
+import collections
+import json
+import random
+import concurrent.futures
+from dataclasses import dataclass
 from datetime import datetime
-from pystray import Icon, MenuItem as item
-from PIL import Image, ImageDraw
 import ctypes
-from pycaw.pycaw import AudioUtilities, IAudioEndpointVolume
-from comtypes import CLSCTX_ALL, wintypes
+# pystray, PIL, pycaw and comtypes are imported where used: --headless never loads the tray ones,
+# and http.server (ssl, email, http.client) is only loaded when the metrics endpoint is enabled
+
+IMPORT_SECONDS = time.perf_counter() - APP_STARTED
+APP_VERSION = "1.0.3"
+BUS_COUNT = 8  # Voicemeeter Potato, the largest edition: buses 0-7 (A1-A5, B1-B3)
+
+DEFAULT_CONFIG = {
+    'Voicemeeter': {
+        'dll_path': r'c:\Program Files (x86)\VB\Voicemeeter\VoicemeeterRemote64.dll',
+        'backend': 'dll',
+        'vban_host': '127.0.0.1',
+        'vban_port': '6980',
+        'vban_stream': 'Command1',
+        'vban_max_rate': '30',
+        'dll_max_rate': '30',
+        'reconnect_min_delay': '0.5',
+        'reconnect_max_delay': '30'
+    },
+    'Logging': {
+        'enabled': 'true',
+        'verbose': 'false',
+        'log_file': 'VCVM.log',
+        'queued': 'true',
+        'trace_size': '2048',
+        'record': 'false'
+    },
+    'Tray': {
+        'icon_mode': 'status',
+        'volume_icon_steps': '20'
+    },
+    'Metrics': {
+        'enabled': 'true',
+        'http_port': '0'
+    },
+    'Control': {
+        'enabled': 'true',
+        'port': '47811'
+    },
+    'Metering': {
+        'enabled': 'false',
+        'source': 'voicemeeter',
+        'rate': '30',
+        'window': '0.3',
+        'channels': '2',
+        'rule': 'none',
+        'cap_db': '-12',
+        'duck_bus': '-1',
+        'duck_threshold_db': '-30',
+        'duck_amount_db': '10',
+        'max_reduction_db': '24',
+        'release_db_per_s': '6'
+    },
+    'Settings': {
+        'curve_power': '0.55',
+        'sync_interval': '0.3',
+        'sync_interval_idle': '2',
+        'idle_after': '10',
+        'echo_window': '2',
+        'gain_threshold': '3.0',
+        'volume_threshold': '1',
+        'bus': '0',
+        'volume_events': 'true',
+        'event_fallback_poll': '5',
+        'ramp_duration': '0.2',
+        'ramp_rate': '60',
+        'ramp_buses': 'false',
+        'windows_max_rate': '30'
+    },
+    'Sessions': {
+        'enabled': 'false',
+        'refresh_interval': '10'
+    },
+    'Startup': {
+        'ready_timeout': '120',
+        'probe_max_interval': '1'
+    }
+}
+
+class BufferedFileHandler(logging.FileHandler):
+    """FileHandler that leaves flushing to the log writer, so a whole batch costs one disk write"""
+
+    def flush(self):
+        pass
+
+    def flush_now(self):
+        logging.FileHandler.flush(self)
+
+    def close(self):
+        self.flush_now()
+        logging.FileHandler.close(self)
+
+
+class LatencyHistogram:
+    """Latency histogram with power-of-two microsecond buckets (1us .. ~8s)"""
+
+    BOUNDS_US = [2 ** i for i in range(24)]
+
+    def __init__(self):
+        self.buckets = [0] * (len(self.BOUNDS_US) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds):
+        micros = seconds * 1e6
+        self.buckets[bisect.bisect_left(self.BOUNDS_US, micros)] += 1
+        self.count += 1
+        self.total += micros
+        if micros > self.max:
+            self.max = micros
+
+    def percentile(self, fraction):
+        """Upper bound of the bucket holding the given fraction of observations"""
+        if not self.count:
+            return 0
+        rank = fraction * self.count
+        seen = 0
+        for index, count in enumerate(self.buckets):
+            seen += count
+            if seen >= rank:
+                return self.BOUNDS_US[index] if index < len(self.BOUNDS_US) else round(self.max, 1)
+        return round(self.max, 1)
+
+    def snapshot(self):
+        return {
+            'count': self.count,
+            'avg_us': round(self.total / self.count, 1) if self.count else 0,
+            'max_us': round(self.max, 1),
+            'p50_us': self.percentile(0.5),
+            'p99_us': self.percentile(0.99),
+            'buckets_us': {(f"<={bound}" if index < len(self.BOUNDS_US) else f">{self.BOUNDS_US[-1]}"): count
+                           for index, (bound, count) in enumerate(zip(self.BOUNDS_US + [None], self.buckets)) if count},
+        }
+
+
+class Metrics:
+    """Counters and latency histograms for DLL/COM calls and sync iterations, exported as a JSON snapshot"""
+
+    def __init__(self):
+        self.enabled = True
+        self.started = time.time()
+        self.counters = collections.Counter()
+        self.histograms = collections.defaultdict(LatencyHistogram)
+        self.providers = {}  # section name -> callable returning a JSON-friendly dict
+        self.lock = threading.Lock()
+
+    def incr(self, name, amount=1):
+        if self.enabled:
+            with self.lock:
+                self.counters[name] += amount
+
+    def observe(self, name, seconds):
+        if self.enabled:
+            with self.lock:
+                self.histograms[name].observe(seconds)
+
+    def snapshot(self):
+        with self.lock:
+            data = {
+                'version': APP_VERSION,
+                'timestamp': time.time(),
+                'uptime_s': round(time.time() - self.started, 1),
+                'counters': dict(self.counters),
+                'latency': {name: histogram.snapshot() for name, histogram in sorted(self.histograms.items())},
+            }
+        for name, provider in self.providers.items():
+            try:
+                data[name] = provider()
+            except Exception as e:
+                data[name] = {'error': str(e)}
+        return data
+
+    def to_json(self):
+        return json.dumps(self.snapshot(), indent=2, default=str)
+
+
+class TraceBuffer:
+    """Fixed-size in-memory history of sync events, only written to disk on demand"""
+
+    def __init__(self, size=2048):
+        self.events = collections.deque(maxlen=size)
+
+    def record(self, windows_vol, vm_gain, decision, detail=None, result=0):
+        """Append one event: a tuple append, no formatting and no I/O"""
+        self.events.append((time.time(), windows_vol, vm_gain, decision, detail, result))
+
+    def resize(self, size):
+        if size != self.events.maxlen:
+            self.events = collections.deque(self.events, maxlen=size)
+
+    def dump(self, path, reason):
+        """Write the buffered events to path, oldest first"""
+        events = list(self.events)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(f"VCVM trace dump - {reason} - {len(events)} events\n")
+            for created, windows_vol, vm_gain, decision, detail, result in events:
+                stamp = datetime.fromtimestamp(created).strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]
+                f.write(f"{stamp} win={windows_vol} gain={vm_gain} decision={decision} detail={detail} result={result}\n")
+        return len(events)
+
 
 class LoggerMaster:
+    LEVELS = {'debug': logging.DEBUG, 'info': logging.INFO, 'warning': logging.WARNING, 'error': logging.ERROR}
+
     def __init__(self):
         self.logger = None
         self.logging_enabled = False        
+        self.verbose_enabled = False
+        self.queued = True
         self.log_file = "VCVM.log" 
+        self.log_queue = queue.SimpleQueue()
+        self.write_lock = threading.Lock()
+        self.writer_thread = None
+        self.trace = TraceBuffer()
+        self.last_trace_dump = 0
         sys.excepthook = self.handle_exception 
         
     def setup_logging(self):
         """Setup logging configuration"""
+        self.flush()
+        with self.write_lock:
+            self._setup_handlers()
+        if self.logger and self.queued and self.writer_thread is None:
+            self.writer_thread = threading.Thread(target=self._writer, name="LogWriter", daemon=True)
+            self.writer_thread.start()
+
+    def _setup_handlers(self):
         if self.logger:  
             for handler in self.logger.handlers[:]:
                 self.logger.removeHandler(handler)
                 handler.close() 
 
-        if self.logging_enabled:
-            self.logger = logging.getLogger('VolumeControl for Voicemeeter') 
-            self.logger.setLevel(logging.DEBUG)
-            
+        if self.logging_enabled:
+            self.logger = logging.getLogger('VolumeControl for Voicemeeter') 
+            self.logger.setLevel(logging.DEBUG)
+            
+            try:
+                file_handler = BufferedFileHandler(self.log_file, encoding='utf-8') if self.queued else logging.FileHandler(self.log_file, encoding='utf-8')
+                file_handler.setLevel(logging.DEBUG)
+                formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+                file_handler.setFormatter(formatter)
+                self.logger.addHandler(file_handler)
+            except IOError as e:
+                print(f"ERROR: Failed to open log file {self.log_file}: {e}")
+            
+            console_handler = logging.StreamHandler()
+            console_handler.setLevel(logging.INFO) 
+            formatter_console = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+            console_handler.setFormatter(formatter_console)
+            self.logger.addHandler(console_handler)
+
+            self.logger.propagate = False
+        else:
+            self.logger = None 
+      
+    def log(self, message, level='info', exc_info=None, args=()):
+        """Log a message, formatted with message % args only when it gets written"""
+        if self.logger and self.queued and self.writer_thread:
+            if exc_info is True:
+                exc_info = sys.exc_info()
+            self.log_queue.put((time.time(), self.LEVELS.get(level.lower(), logging.INFO), message, args, exc_info))
+        elif self.logger:
+            if args:
+                message = message % args
+            if level.lower() == 'debug':
+                self.logger.debug(message, exc_info=exc_info)
+            elif level.lower() == 'warning':
+                self.logger.warning(message, exc_info=exc_info)
+            elif level.lower() == 'error':
+                self.logger.error(message, exc_info=exc_info)
+            else:
+                self.logger.info(message, exc_info=exc_info)
+        else:
+            if args:
+                message = message % args
+            print(f"{datetime.now().strftime('%Y-%m-%d %H:%M:%S')} - {level.upper()} - {message}")
+            if exc_info:
+                import traceback
+                traceback.print_exception(exc_info[0], exc_info[1], exc_info[2], file=sys.stderr)
+            
+    def verbose(self, message, *args):
+        """Debug message that costs nothing but this check while verbose logging is off"""
+        if self.verbose_enabled:
+            self.log(message, 'debug', args=args)
+
+    def _writer(self):
+        """Background writer: drain the queue in batches and flush files once per batch"""
+        while True:
+            batch = [self.log_queue.get()]
+            try:
+                while len(batch) < 500:
+                    batch.append(self.log_queue.get_nowait())
+            except queue.Empty:
+                pass
+            with self.write_lock:
+                for entry in batch:
+                    if isinstance(entry, threading.Event):
+                        continue
+                    self._write(*entry)
+                if self.logger:
+                    for handler in self.logger.handlers:
+                        if isinstance(handler, BufferedFileHandler):
+                            handler.flush_now()
+            for entry in batch:
+                if isinstance(entry, threading.Event):
+                    entry.set()
+
+    def _write(self, created, levelno, message, args, exc_info):
+        if not self.logger:
+            return
+        try:
+            record = self.logger.makeRecord(self.logger.name, levelno, "(unknown file)", 0, message, args, exc_info)
+            record.created = created
+            record.msecs = (created - int(created)) * 1000
+            self.logger.handle(record)
+        except Exception as e:
+            print(f"ERROR: Failed to write log record: {e}")
+
+    def flush(self, timeout=2):
+        """Wait until everything queued so far is written to disk"""
+        if self.writer_thread is None or not self.writer_thread.is_alive():
+            return
+        done = threading.Event()
+        self.log_queue.put(done)
+        done.wait(timeout)
+
+    def handle_exception(self, exc_type, exc_value, exc_traceback):
+        if issubclass(exc_type, KeyboardInterrupt):
+            sys.__excepthook__(exc_type, exc_value, exc_traceback)
+            return
+        self.log("Uncaught exception", level='error', exc_info=(exc_type, exc_value, exc_traceback))
+        self.dump_trace("uncaught exception", force=True)
+        self.flush()
+
+    def dump_trace(self, reason, force=False):
+        """Write the trace buffer next to the log file, at most once a minute unless forced"""
+        now = time.monotonic()
+        if not force and self.last_trace_dump and now - self.last_trace_dump < 60:
+            return None
+        self.last_trace_dump = now
+        path = os.path.join(os.path.dirname(os.path.abspath(self.log_file)),
+                            f"VCVM_trace_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log")
+        try:
+            count = self.trace.dump(path, reason)
+            self.log(f"Dumped {count} trace events to {path} ({reason})")
+            return path
+        except Exception as e:
+            self.log(f"Failed to dump trace: {e}", 'error')
+            return None
+
+
+class VolumeEndpoint:
+    """Interface to the Windows master volume endpoint used by the sync engine"""
+
+    def get_volume(self):
+        """Return the master volume in percent (0-100)"""
+        raise NotImplementedError
+
+    def set_volume(self, vol_percent):
+        """Set the master volume in percent (0-100)"""
+        raise NotImplementedError
+
+    def get_mute(self):
+        """Return True if the endpoint is muted"""
+        raise NotImplementedError
+
+    def set_mute(self, muted):
+        """Mute or unmute the endpoint"""
+        raise NotImplementedError
+
+    def register_callback(self, callback):
+        """Register callback(volume, timestamp, muted) for volume and mute changes, return True if events are supported"""
+        return False
+
+    def unregister_callback(self):
+        """Stop delivering volume change events"""
+        pass
+
+
+class WindowsVolumeEndpoint(VolumeEndpoint):
+    """Endpoint backed by IAudioEndpointVolume, with change notifications through IAudioEndpointVolumeCallback"""
+
+    def __init__(self, interface):
+        self.interface = interface
+        self._notifier = None
+
+    def get_volume(self):
+        return int(self.interface.GetMasterVolumeLevelScalar() * 100)
+
+    def set_volume(self, vol_percent):
+        self.interface.SetMasterVolumeLevelScalar(vol_percent / 100, None)
+
+    def get_mute(self):
+        return bool(self.interface.GetMute())
+
+    def set_mute(self, muted):
+        self.interface.SetMute(int(muted), None)
+
+    def register_callback(self, callback):
+        try:
+            from comtypes import COMObject
+            from pycaw.pycaw import IAudioEndpointVolumeCallback
+        except ImportError as e:
+            logclass.log(f"Volume change notifications not available: {e}", 'warning')
+            return False
+
+        class VolumeNotifier(COMObject):
+            _com_interfaces_ = [IAudioEndpointVolumeCallback]
+
+            def OnNotify(self, pNotify):
+                # Runs on a COM worker thread: only hand the value over, never block here
+                notify = pNotify.contents
+                callback(int(notify.fMasterVolume * 100), time.perf_counter(), bool(notify.bMuted))
+                return 0
+
+        try:
+            notifier = VolumeNotifier()
+            self.interface.RegisterControlChangeNotify(notifier)
+            self._notifier = notifier
+            return True
+        except Exception as e:
+            logclass.log(f"Failed to register volume change callback: {e}", 'warning')
+            return False
+
+    def unregister_callback(self):
+        if self._notifier is None:
+            return
+        try:
+            self.interface.UnregisterControlChangeNotify(self._notifier)
+        except Exception as e:
+            logclass.log(f"Failed to unregister volume change callback: {e}", 'warning')
+        self._notifier = None
+
+
+class FakeVolumeEndpoint(VolumeEndpoint):
+    """Scriptable in-process endpoint to drive the sync engine without Windows audio"""
+
+    def __init__(self, volume=50, events=True):
+        self.volume = volume
+        self.muted = False
+        self.events = events
+        self.callback = None
+        self.writes = []  # (timestamp, volume) of every set_volume call
+        self._lock = threading.Lock()
+
+    def get_volume(self):
+        with self._lock:
+            return self.volume
+
+    def set_volume(self, vol_percent):
+        with self._lock:
+            self.volume = int(vol_percent)
+            self.writes.append((time.perf_counter(), self.volume))
+        self._notify()
+
+    def get_mute(self):
+        with self._lock:
+            return self.muted
+
+    def set_mute(self, muted):
+        with self._lock:
+            self.muted = bool(muted)
+        self._notify()
+
+    def register_callback(self, callback):
+        if not self.events:
+            return False
+        self.callback = callback
+        return True
+
+    def unregister_callback(self):
+        self.callback = None
+
+    def emit(self, volume):
+        """Simulate a user volume change (key press, mouse wheel...)"""
+        with self._lock:
+            self.volume = int(volume)
+        self._notify()
+
+    def play(self, script):
+        """Replay a list of (delay_seconds, volume) steps on a background thread"""
+        def runner():
+            for delay, volume in script:
+                time.sleep(delay)
+                self.emit(volume)
+        thread = threading.Thread(target=runner, daemon=True)
+        thread.start()
+        return thread
+
+    def emit_mute(self, muted):
+        """Simulate the user muting or unmuting Windows"""
+        with self._lock:
+            self.muted = bool(muted)
+        self._notify()
+
+    def _notify(self):
+        callback = self.callback
+        if callback:
+            callback(self.volume, time.perf_counter(), self.muted)
+
+
+class DeviceEnumerator:
+    """Interface to the list of audio output devices and default device change notifications"""
+
+    def get_default(self):
+        """Return (device_id, friendly_name) of the default output device"""
+        raise NotImplementedError
+
+    def get_name(self, device_id):
+        return device_id
+
+    def create_endpoint(self, device_id):
+        """Return a VolumeEndpoint for the given device"""
+        raise NotImplementedError
+
+    def register(self, callback):
+        """Register callback(device_id) for default device changes, return True if supported"""
+        return False
+
+    def unregister(self):
+        pass
+
+
+class WindowsDeviceEnumerator(DeviceEnumerator):
+    """IMMDeviceEnumerator backed device list, notified through IMMNotificationClient when available"""
+
+    E_RENDER = 0
+    E_MULTIMEDIA = 1  # same role as AudioUtilities.GetSpeakers
+
+    _interfaces = None  # (IMMNotificationClient, IMMDeviceEnumerator with the callback methods), built on first use
+
+    @classmethod
+    def notification_interfaces(cls):
+        """IMMNotificationClient and an IMMDeviceEnumerator declaring its (Un)RegisterEndpointNotificationCallback.
+
+        pycaw 20220416 has neither: it ships no IMMNotificationClient and declares the two callback methods of
+        IMMDeviceEnumerator without their parameter, so both are declared here from mmdeviceapi.h.
+        """
+        if cls._interfaces is None:
+            from ctypes import HRESULT, POINTER
+            from ctypes.wintypes import DWORD, LPCWSTR
+            from comtypes import COMMETHOD, GUID, IUnknown
+            from pycaw.api.mmdeviceapi import IMMDevice, IMMDeviceCollection
+            from pycaw.api.mmdeviceapi.depend.structures import PROPERTYKEY
+
+            class IMMNotificationClient(IUnknown):
+                _iid_ = GUID('{7991EEC9-7E89-4D85-8390-6C703CEC60C0}')
+                _methods_ = (
+                    COMMETHOD([], HRESULT, 'OnDeviceStateChanged',
+                              (['in'], LPCWSTR, 'pwstrDeviceId'),
+                              (['in'], DWORD, 'dwNewState')),
+                    COMMETHOD([], HRESULT, 'OnDeviceAdded',
+                              (['in'], LPCWSTR, 'pwstrDeviceId')),
+                    COMMETHOD([], HRESULT, 'OnDeviceRemoved',
+                              (['in'], LPCWSTR, 'pwstrDeviceId')),
+                    COMMETHOD([], HRESULT, 'OnDefaultDeviceChanged',
+                              (['in'], DWORD, 'flow'),
+                              (['in'], DWORD, 'role'),
+                              (['in'], LPCWSTR, 'pwstrDefaultDeviceId')),
+                    COMMETHOD([], HRESULT, 'OnPropertyValueChanged',
+                              (['in'], LPCWSTR, 'pwstrDeviceId'),
+                              (['in'], PROPERTYKEY, 'key')))
+
+            class IMMDeviceEnumeratorNotify(IUnknown):
+                # Same interface as pycaw's IMMDeviceEnumerator, vtable in the same order
+                _iid_ = GUID('{A95664D2-9614-4F35-A746-DE8DB63617E6}')
+                _methods_ = (
+                    COMMETHOD([], HRESULT, 'EnumAudioEndpoints',
+                              (['in'], DWORD, 'dataFlow'),
+                              (['in'], DWORD, 'dwStateMask'),
+                              (['out'], POINTER(POINTER(IMMDeviceCollection)), 'ppDevices')),
+                    COMMETHOD([], HRESULT, 'GetDefaultAudioEndpoint',
+                              (['in'], DWORD, 'dataFlow'),
+                              (['in'], DWORD, 'role'),
+                              (['out'], POINTER(POINTER(IMMDevice)), 'ppDevices')),
+                    COMMETHOD([], HRESULT, 'GetDevice',
+                              (['in'], LPCWSTR, 'pwstrId'),
+                              (['out'], POINTER(POINTER(IMMDevice)), 'ppDevice')),
+                    COMMETHOD([], HRESULT, 'RegisterEndpointNotificationCallback',
+                              (['in'], POINTER(IMMNotificationClient), 'pClient')),
+                    COMMETHOD([], HRESULT, 'UnregisterEndpointNotificationCallback',
+                              (['in'], POINTER(IMMNotificationClient), 'pClient')))
+
+            cls._interfaces = (IMMNotificationClient, IMMDeviceEnumeratorNotify)
+        return cls._interfaces
+
+    def __init__(self):
+        import comtypes
+        from pycaw.constants import CLSID_MMDeviceEnumerator
+        from pycaw.pycaw import IMMDeviceEnumerator
+        self.enumerator = comtypes.CoCreateInstance(CLSID_MMDeviceEnumerator, IMMDeviceEnumerator, comtypes.CLSCTX_INPROC_SERVER)
+        self._notifier = None
+        self._notify_enumerator = None
+
+    def get_default(self):
+        device = self.enumerator.GetDefaultAudioEndpoint(self.E_RENDER, self.E_MULTIMEDIA)
+        device_id = device.GetId()
+        return device_id, self._friendly_name(device, device_id)
+
+    def get_name(self, device_id):
+        return self._friendly_name(self.enumerator.GetDevice(device_id), device_id)
+
+    def _friendly_name(self, device, device_id):
+        try:
+            from pycaw.pycaw import AudioUtilities
+            return AudioUtilities.CreateDevice(device).FriendlyName or device_id
+        except Exception:
+            return device_id
+
+    def create_endpoint(self, device_id):
+        from comtypes import CLSCTX_ALL
+        from pycaw.pycaw import IAudioEndpointVolume
+        device = self.enumerator.GetDevice(device_id)
+        interface = device.Activate(IAudioEndpointVolume._iid_, CLSCTX_ALL, None)
+        return WindowsVolumeEndpoint(ctypes.cast(interface, ctypes.POINTER(IAudioEndpointVolume)))
+
+    def register(self, callback):
+        try:
+            from comtypes import COMObject
+            IMMNotificationClient, IMMDeviceEnumeratorNotify = self.notification_interfaces()
+        except Exception as e:
+            logclass.log(f"Device change notifications not available: {e}", 'warning')
+            return False
+
+        role = self.E_MULTIMEDIA
+        flow = self.E_RENDER
+
+        class DeviceNotifier(COMObject):
+            _com_interfaces_ = [IMMNotificationClient]
+
+            def OnDefaultDeviceChanged(self, data_flow, device_role, device_id):
+                if data_flow == flow and device_role == role:
+                    callback(device_id)
+                return 0
+
+            def OnDeviceStateChanged(self, device_id, new_state):
+                return 0
+
+            def OnDeviceAdded(self, device_id):
+                return 0
+
+            def OnDeviceRemoved(self, device_id):
+                return 0
+
+            def OnPropertyValueChanged(self, device_id, key):
+                return 0
+
+        try:
+            notifier = DeviceNotifier()
+            enumerator = self.enumerator.QueryInterface(IMMDeviceEnumeratorNotify)
+            enumerator.RegisterEndpointNotificationCallback(notifier)
+            self._notifier = notifier
+            self._notify_enumerator = enumerator
+            return True
+        except Exception as e:
+            logclass.log(f"Failed to register device change callback: {e}", 'warning')
+            return False
+
+    def unregister(self):
+        if self._notifier is None:
+            return
+        try:
+            self._notify_enumerator.UnregisterEndpointNotificationCallback(self._notifier)
+        except Exception as e:
+            logclass.log(f"Failed to unregister device change callback: {e}", 'warning')
+        self._notifier = None
+        self._notify_enumerator = None
+
+
+class FakeDeviceEnumerator(DeviceEnumerator):
+    """In-process device list with FakeVolumeEndpoints that emits default device switches on demand"""
+
+    def __init__(self, devices, default_id=None, events=True):
+        self.devices = {}  # device_id -> (name, FakeVolumeEndpoint)
+        for device_id, name in devices.items():
+            self.add_device(device_id, name)
+        self.default_id = default_id or next(iter(self.devices))
+        self.events = events
+        self.callback = None
+
+    def add_device(self, device_id, name, volume=50):
+        self.devices[device_id] = (name, FakeVolumeEndpoint(volume))
+
+    def remove_device(self, device_id):
+        self.devices.pop(device_id, None)
+
+    def get_default(self):
+        return self.default_id, self.get_name(self.default_id)
+
+    def get_name(self, device_id):
+        return self.devices[device_id][0]
+
+    def create_endpoint(self, device_id):
+        if device_id not in self.devices:
+            raise OSError(f"Device {device_id} not found")
+        return self.devices[device_id][1]
+
+    def register(self, callback):
+        if not self.events:
+            return False
+        self.callback = callback
+        return True
+
+    def unregister(self):
+        self.callback = None
+
+    def switch(self, device_id):
+        """Make device_id the default output device and notify like Windows does"""
+        self.default_id = device_id
+        callback = self.callback
+        if callback:
+            callback(device_id)
+
+
+class SessionSource:
+    """Interface to the per-application audio sessions of the output device (the Windows volume mixer)"""
+
+    def open(self):
+        """(Re)attach to the sessions of the current default output device"""
+        pass
+
+    def list_sessions(self):
+        """Return {session key: process name} of the current sessions"""
+        raise NotImplementedError
+
+    def get_volume(self, key):
+        """Return the session volume in percent (0-100)"""
+        raise NotImplementedError
+
+    def set_volume(self, key, vol_percent):
+        raise NotImplementedError
+
+    def register(self, on_created, on_expired, on_volume):
+        """Register on_created(key, process), on_expired(key) and on_volume(key, volume), return True if supported"""
+        return False
+
+    def watch(self, key):
+        """Start delivering on_volume / on_expired for this session"""
+        pass
+
+    def unregister(self):
+        pass
+
+
+class WindowsSessionSource(SessionSource):
+    """Sessions of the default output device through IAudioSessionManager2, notified through pycaw's session callbacks.
+
+    Used from the SessionWatcher thread only, which joins the multithreaded apartment the notifications need.
+    """
+
+    def __init__(self):
+        self.manager = None
+        self.sessions = {}  # key -> pycaw AudioSession
+        self.names = {}  # key -> process name
+        self.notifier = None
+        self.events_class = None
+
+    def open(self):
+        from pycaw.pycaw import AudioUtilities
+        self.unregister()
+        self.manager = AudioUtilities.GetAudioSessionManager()
+        self.sessions = {}
+        self.names = {}
+
+    def process_name(self, key, session):
+        name = self.names.get(key)
+        if name is None:
+            try:
+                process = session.Process
+                name = process.name() if process is not None else f"pid {session.ProcessId}"
+            except Exception:
+                name = f"pid {session.ProcessId}"
+            self.names[key] = name
+        return name
+
+    def list_sessions(self):
+        from pycaw.pycaw import IAudioSessionControl2
+        from pycaw.utils import AudioSession
+        sessions = {}
+        enumerator = self.manager.GetSessionEnumerator()
+        for index in range(enumerator.GetCount()):
+            control = enumerator.GetSession(index)
+            if control is None:
+                continue
+            session = AudioSession(control.QueryInterface(IAudioSessionControl2))
+            key = session.InstanceIdentifier
+            # Keep the wrapper a notification is registered on
+            sessions[key] = self.sessions.get(key) or session
+        self.sessions = sessions
+        return {key: self.process_name(key, session) for key, session in sessions.items()}
+
+    def get_volume(self, key):
+        return int(round(self.sessions[key].SimpleAudioVolume.GetMasterVolume() * 100))
+
+    def set_volume(self, key, vol_percent):
+        self.sessions[key].SimpleAudioVolume.SetMasterVolume(vol_percent / 100, None)
+
+    def register(self, on_created, on_expired, on_volume):
+        try:
+            from pycaw.callbacks import AudioSessionEvents, AudioSessionNotification
+        except ImportError as e:
+            logclass.log(f"Audio session notifications not available: {e}", 'warning')
+            return False
+        source = self
+
+        class SessionNotifier(AudioSessionNotification):
+            def on_session_created(self, new_session):
+                key = new_session.InstanceIdentifier
+                source.sessions[key] = new_session
+                on_created(key, source.process_name(key, new_session))
+
+        class SessionEvents(AudioSessionEvents):
+            def __init__(self, key):
+                super().__init__()
+                self.key = key
+
+            def on_simple_volume_changed(self, new_volume, new_mute, event_context):
+                on_volume(self.key, int(round(new_volume * 100)))
+
+            def on_state_changed(self, new_state, new_state_id):
+                if new_state == "Expired":
+                    on_expired(self.key)
+
+            def on_session_disconnected(self, disconnect_reason, disconnect_reason_id):
+                on_expired(self.key)
+
+        try:
+            notifier = SessionNotifier()
+            self.manager.RegisterSessionNotification(notifier)
+            # Windows only starts sending OnSessionCreated once the sessions were enumerated
+            self.manager.GetSessionEnumerator()
+            self.notifier = notifier
+            self.events_class = SessionEvents
+            return True
+        except Exception as e:
+            logclass.log(f"Failed to register audio session callback: {e}", 'warning')
+            return False
+
+    def watch(self, key):
+        session = self.sessions.get(key)
+        if session is not None and self.events_class is not None:
+            session.register_notification(self.events_class(key))
+
+    def unregister(self):
+        for session in self.sessions.values():
+            try:
+                session.unregister_notification()
+            except Exception:
+                pass
+        if self.notifier is not None and self.manager is not None:
+            try:
+                self.manager.UnregisterSessionNotification(self.notifier)
+            except Exception as e:
+                logclass.log(f"Failed to unregister audio session callback: {e}", 'warning')
+        self.notifier = None
+
+
+class FakeSessionSource(SessionSource):
+    """Scriptable in-process sessions: start and stop apps, move their volume like the Windows mixer would"""
+
+    def __init__(self, sessions=None, events=True):
+        self.sessions = {}  # key -> [process, volume]
+        for key, (process, volume) in (sessions or {}).items():
+            self.sessions[key] = [process, volume]
+        self.events = events
+        self.callbacks = None
+        self.watched = set()
+        self.lock = threading.Lock()
+
+    def list_sessions(self):
+        with self.lock:
+            return {key: process for key, (process, _) in self.sessions.items()}
+
+    def get_volume(self, key):
+        with self.lock:
+            return self.sessions[key][1]
+
+    def set_volume(self, key, vol_percent):
+        with self.lock:
+            self.sessions[key][1] = int(vol_percent)
+        self._notify_volume(key)
+
+    def register(self, on_created, on_expired, on_volume):
+        if not self.events:
+            return False
+        self.callbacks = (on_created, on_expired, on_volume)
+        return True
+
+    def watch(self, key):
+        self.watched.add(key)
+
+    def unregister(self):
+        self.callbacks = None
+        self.watched.clear()
+
+    def add(self, key, process, volume=100):
+        """Simulate an application opening a session"""
+        with self.lock:
+            self.sessions[key] = [process, volume]
+        if self.callbacks:
+            self.callbacks[0](key, process)
+
+    def remove(self, key):
+        """Simulate a session expiring (application closed)"""
+        with self.lock:
+            self.sessions.pop(key, None)
+        if self.callbacks and key in self.watched:
+            self.callbacks[1](key)
+
+    def emit(self, key, volume):
+        """Simulate the user moving an application slider in the volume mixer"""
+        with self.lock:
+            self.sessions[key][1] = int(volume)
+        self._notify_volume(key)
+
+    def _notify_volume(self, key):
+        if self.callbacks and key in self.watched:
+            self.callbacks[2](key, self.sessions[key][1])
+
+
+class SessionWatcher:
+    """Cache of the mapped application sessions, kept current on its own thread from create / expire / volume events.
+
+    The sync loop only takes what changed since its last tick, so its cost does not grow with the number of open
+    sessions. The session list is re-enumerated every refresh_interval seconds in case a notification was missed;
+    without notifications, the mapped sessions' volumes are polled every poll_interval seconds.
+    """
+
+    def __init__(self, source, rule_for, refresh_interval=10, poll_interval=1, wake=None):
+        self.source = source
+        self.rule_for = rule_for  # rule_for(process name) -> SessionRule or None
+        self.refresh_interval = refresh_interval
+        self.poll_interval = poll_interval
+        self.wake = wake  # Event set when a mapped session volume changed
+        self.sessions = {}  # key -> (process, SessionRule) of the mapped sessions
+        self.volumes = {}  # key -> last known volume of a mapped session
+        self.ignored = set()  # keys of the sessions no rule maps
+        self.changes = {}  # key -> volume changed since the last take_changes()
+        self.lock = threading.Lock()
+        self.requests = queue.Queue()
+        self.events = False
+        self.stats = collections.Counter()
+        self.running = False
+        self.thread = None
+
+    def start(self):
+        self.running = True
+        self.thread = threading.Thread(target=self.run, name="SessionWatcher", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.running = False
+        self.requests.put(None)
+        if self.thread and self.thread.is_alive():
+            self.thread.join(timeout=2)
+
+    def request_reopen(self):
+        """The default output device changed: its sessions are different ones"""
+        self.requests.put(('reopen', None, None))
+
+    def set_volume(self, keys, volume):
+        """Set the volume of these sessions (from any thread, applied on the watcher thread)"""
+        with self.lock:
+            for key in keys:
+                # Known before Windows reports it back, so the notification is not taken as a user change
+                self.volumes[key] = volume
+        self.requests.put(('set', tuple(keys), volume))
+
+    def on_created(self, key, process):
+        self.requests.put(('created', key, process))
+
+    def on_expired(self, key):
+        self.requests.put(('expired', key, None))
+
+    def on_volume(self, key, volume):
+        """Notification thread (or polling): note the new volume of a mapped session"""
+        with self.lock:
+            if key not in self.sessions or self.volumes.get(key) == volume:
+                return
+            self.volumes[key] = volume
+            self.changes[key] = volume
+        self.stats['volume_changes'] += 1
+        if self.wake:
+            self.wake.set()
+
+    def take_changes(self):
+        """Sync thread: {key: (rule, volume)} of the mapped sessions whose volume changed since the last call"""
+        with self.lock:
+            if not self.changes:
+                return {}
+            changes, self.changes = self.changes, {}
+            return {key: (self.sessions[key][1], volume) for key, volume in changes.items() if key in self.sessions}
+
+    def keys_for(self, strip):
+        with self.lock:
+            return [key for key, (_, rule) in self.sessions.items() if rule.strip == strip]
+
+    def strips(self):
+        with self.lock:
+            return sorted({rule.strip for _, rule in self.sessions.values()})
+
+    def state(self):
+        with self.lock:
+            return {'mapped': {key: process for key, (process, _) in self.sessions.items()},
+                    'ignored': len(self.ignored), 'events': self.events, **self.stats}
+
+    def run(self):
+        try:
+            import comtypes
+            # Session notifications are only delivered to the multithreaded apartment
+            comtypes.CoInitializeEx(comtypes.COINIT_MULTITHREADED)
+        except Exception:
+            pass
+        try:
+            self.open()
+        except Exception as e:
+            logclass.log(f"Failed to list audio sessions: {e}", 'error')
+        next_refresh = time.monotonic() + self.refresh_interval
+        while self.running:
+            timeout = max(0.0, next_refresh - time.monotonic())
+            if not self.events:
+                timeout = min(timeout, self.poll_interval)
+            try:
+                request = self.requests.get(timeout=timeout)
+            except queue.Empty:
+                request = ('tick', None, None)
+            if request is None or not self.running:
+                break
+            kind, key, value = request
+            try:
+                if kind == 'created':
+                    self.add(key, value)
+                elif kind == 'expired':
+                    self.remove(key)
+                elif kind == 'set':
+                    for session_key in key:
+                        self.source.set_volume(session_key, value)
+                elif kind == 'reopen':
+                    self.open()
+                if time.monotonic() >= next_refresh:
+                    self.refresh()
+                    next_refresh = time.monotonic() + self.refresh_interval
+                elif kind == 'tick' and not self.events:
+                    for session_key in list(self.sessions):
+                        self.on_volume(session_key, self.source.get_volume(session_key))
+            except Exception as e:
+                logclass.log(f"Audio session {kind} failed: {e}", 'warning')
+        self.source.unregister()
+
+    def open(self):
+        self.source.open()
+        with self.lock:
+            self.sessions.clear()
+            self.volumes.clear()
+            self.changes.clear()
+        self.ignored.clear()
+        self.events = self.source.register(self.on_created, self.on_expired, self.on_volume)
+        if not self.events:
+            logclass.log(f"Audio session notifications unavailable - polling mapped sessions every {self.poll_interval}s")
+        self.refresh()
+
+    def refresh(self):
+        """Re-enumerate the sessions, adding and dropping what notifications missed"""
+        current = self.source.list_sessions()
+        for key, process in current.items():
+            if key not in self.sessions and key not in self.ignored:
+                self.add(key, process)
+        for key in [key for key in list(self.sessions) + list(self.ignored) if key not in current]:
+            self.remove(key)
+        self.stats['refreshes'] += 1
+
+    def add(self, key, process):
+        if key in self.sessions or key in self.ignored:
+            return
+        rule = self.rule_for(process)
+        if rule is None:
+            self.ignored.add(key)
+            return
+        volume = self.source.get_volume(key)
+        with self.lock:
+            self.sessions[key] = (process, rule)
+            self.volumes[key] = volume
+        if self.events:
+            self.source.watch(key)
+        logclass.log(f"Audio session '{process}' mapped to strip {rule.strip} ([{rule.section}])")
+
+    def remove(self, key):
+        self.ignored.discard(key)
+        with self.lock:
+            removed = self.sessions.pop(key, None)
+            self.volumes.pop(key, None)
+            self.changes.pop(key, None)
+        if removed:
+            logclass.verbose("Audio session '%s' closed", removed[0])
+
+
+class DeviceWatcher:
+    """Swaps the volume endpoint in the background when the default output device changes or breaks"""
+
+    def __init__(self, enumerator, on_switch, current_id=None, poll_interval=2):
+        self.enumerator = enumerator
+        self.on_switch = on_switch  # on_switch(endpoint, device_id, name)
+        self.current_id = current_id
+        self.poll_interval = poll_interval
+        self.requests = queue.Queue()
+        self.events = False
+        self.running = False
+        self.thread = None
+
+    def start(self):
+        self.running = True
+        self.events = self.enumerator.register(self.request_switch)
+        if not self.events:
+            logclass.log(f"Default device notifications unavailable - checking the default device every {self.poll_interval}s")
+        self.thread = threading.Thread(target=self.run, name="DeviceWatcher", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.running = False
+        self.enumerator.unregister()
+        self.requests.put(None)
+        if self.thread and self.thread.is_alive():
+            self.thread.join(timeout=2)
+
+    def request_switch(self, device_id):
+        """Default device changed (called from the notification thread)"""
+        self.requests.put(('switch', device_id))
+
+    def request_refresh(self):
+        """The current endpoint failed: recreate it for whatever the default device is now"""
+        self.requests.put(('refresh', None))
+
+    def run(self):
+        try:
+            import comtypes
+            comtypes.CoInitialize()
+        except Exception:
+            pass
+        while self.running:
+            try:
+                request = self.requests.get(timeout=None if self.events else self.poll_interval)
+            except queue.Empty:
+                request = ('poll', None)
+            # Keep only the latest request of a burst (several roles notify for one switch)
+            try:
+                while True:
+                    request = self.requests.get_nowait() or request
+            except queue.Empty:
+                pass
+            if request is None or not self.running:
+                break
+            self.handle(*request)
+
+    def handle(self, kind, device_id):
+        delay = 0.2
+        for attempt in range(8):
+            if not self.running:
+                return
+            try:
+                if device_id is None:
+                    device_id, name = self.enumerator.get_default()
+                    if kind == 'poll' and device_id == self.current_id:
+                        return
+                else:
+                    name = self.enumerator.get_name(device_id)
+                endpoint = self.enumerator.create_endpoint(device_id)
+                self.current_id = device_id
+                self.on_switch(endpoint, device_id, name)
+                return
+            except Exception as e:
+                if kind == 'poll':
+                    return
+                logclass.log(f"Failed to open audio device (attempt {attempt+1}): {e}", 'warning')
+                device_id = None
+                time.sleep(delay)
+                delay = min(delay * 2, 5)
+        logclass.log("Giving up on reopening the audio device until the next device change", 'error')
+
+
+class TickScheduler:
+    """Deadline-based tick timing on the monotonic clock: fast while active, exponential backoff when idle.
+
+    The wake event only buys an extra tick. Write timers, meter rule writes, the session watcher and control
+    commands all share it, so a wake is not activity: the loop calls mark_active() once a tick actually moved a
+    Windows or Voicemeeter volume.
+    """
+
+    def __init__(self, fast_interval, slow_interval, idle_after, wake_event=None):
+        self.fast_interval = fast_interval
+        self.slow_interval = max(slow_interval, fast_interval)
+        self.idle_after = idle_after
+        self.wake_event = wake_event
+        now = time.monotonic()
+        self.interval = fast_interval
+        self.next_deadline = now + fast_interval
+        self.last_activity = now
+        self.jitter_avg = 0.0
+        self.jitter_max = 0.0
+        self.ticks = 0
+        self.early_wakes = 0
+        self.rate_window_start = now
+        self.rate_window_ticks = 0
+        self.effective_rate = 0.0
+
+    def configure(self, fast_interval, slow_interval, idle_after):
+        """New intervals from a settings reload, starting over at the fast rate"""
+        self.fast_interval = fast_interval
+        self.slow_interval = max(slow_interval, fast_interval)
+        self.idle_after = idle_after
+        self.mark_active()
+        self.interval = fast_interval
+
+    def mark_active(self):
+        """Something changed: go back to the fast rate right away"""
+        now = time.monotonic()
+        self.last_activity = now
+        if self.interval != self.fast_interval:
+            self.interval = self.fast_interval
+            self.next_deadline = min(self.next_deadline, now + self.fast_interval)
+
+    def wait(self):
+        """Sleep until the next deadline or until the wake event fires, return True when woken early"""
+        delay = self.next_deadline - time.monotonic()
+        woken = False
+        if delay > 0:
+            if self.wake_event is not None:
+                woken = self.wake_event.wait(delay)
+                if woken:
+                    self.wake_event.clear()
+            else:
+                time.sleep(delay)
+        now = time.monotonic()
+
+        if woken:
+            # Extra tick for an event: keep the deadline grid and the idle backoff as they are
+            self.early_wakes += 1
+        else:
+            jitter = now - self.next_deadline
+            self.jitter_avg += (jitter - self.jitter_avg) * 0.05
+            self.jitter_max = max(self.jitter_max, jitter)
+            if now - self.last_activity >= self.idle_after:
+                self.interval = min(self.interval * 2, self.slow_interval)
+            self.next_deadline += self.interval
+            if self.next_deadline <= now:
+                # Fell behind (suspend, long DLL call): restart the grid instead of bursting to catch up
+                self.next_deadline = now + self.interval
+
+        self.ticks += 1
+        self.rate_window_ticks += 1
+        elapsed = now - self.rate_window_start
+        if elapsed >= 2:
+            self.effective_rate = self.rate_window_ticks / elapsed
+            self.rate_window_start = now
+            self.rate_window_ticks = 0
+        return woken
+
+    def stats(self):
+        """Measured tick jitter and effective poll rate"""
+        return {
+            'interval': self.interval,
+            'effective_rate_hz': round(self.effective_rate, 2),
+            'jitter_avg_ms': round(self.jitter_avg * 1000, 3),
+            'jitter_max_ms': round(self.jitter_max * 1000, 3),
+            'ticks': self.ticks,
+            'early_wakes': self.early_wakes,
+        }
+
+
+class WriteJournal:
+    """Values VCVM recently wrote to each parameter, so the sync loop can tell its own echoes from external changes"""
+
+    def __init__(self, ttl=2.0, clock=time.monotonic):
+        self.ttl = ttl
+        self.clock = clock  # replay passes its virtual clock
+        self.entries = {}  # key -> deque of (value, clock time)
+        self.lock = threading.Lock()
+
+    def record(self, key, value):
+        with self.lock:
+            writes = self.entries.get(key)
+            if writes is None:
+                writes = self.entries[key] = collections.deque(maxlen=64)
+            writes.append((value, self.clock()))
+
+    def is_echo(self, key, value, tolerance):
+        """True if value is within tolerance of something written to key in the last ttl seconds"""
+        with self.lock:
+            writes = self.entries.get(key)
+            if not writes:
+                return False
+            expired = self.clock() - self.ttl
+            while writes and writes[0][1] < expired:
+                writes.popleft()
+            return any(abs(written - value) <= tolerance for written, _ in writes)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+class BusSnapshot:
+    """Gain and mute of every synced bus from one read pass, packed in arrays so two snapshots compare in one go"""
+
+    def __init__(self, buses, gains, mutes):
+        self.buses = tuple(buses)
+        self.gains = array.array('f', gains)
+        self.mutes = array.array('B', mutes)
+
+    def same_as(self, other):
+        return (other is not None and self.buses == other.buses
+                and self.gains == other.gains and self.mutes == other.mutes)
+
+    def changed(self, other):
+        """(buses whose gain changed, buses whose mute changed) since other; only walked when same_as() failed"""
+        if other is None or self.buses != other.buses:
+            return self.buses, self.buses
+        gains = [bus for bus, a, b in zip(self.buses, self.gains, other.gains) if a != b]
+        mutes = [bus for bus, a, b in zip(self.buses, self.mutes, other.mutes) if a != b]
+        return gains, mutes
+
+    def gain(self, bus):
+        return self.gains[self.buses.index(bus)]
+
+    def muted(self, bus):
+        return bool(self.mutes[self.buses.index(bus)])
+
+    def to_dict(self):
+        return {bus: {'gain': round(gain, 2), 'mute': bool(mute)}
+                for bus, gain, mute in zip(self.buses, self.gains, self.mutes)}
+
+
+class SyncCore:
+    """Sync decisions without any I/O: fresh readings in, what to write out. Shared by the sync loop and replay"""
+
+    def __init__(self, journal):
+        self.journal = journal
+        self.last_windows_vol = 0
+        self.last_vm_gain = 0
+        self.last_windows_mute = None
+        self.last_vm_mute = None
+
+    def decide(self, windows_vol, vm_gain, settings, curve, bus=0):
+        """Return (decision, value): the gain to write for 'windows->vm', the volume for 'vm->windows', else None.
+
+        vm_gain is the gain of bus, the synced bus that moved last.
+        """
+        windows_changed = abs(windows_vol - self.last_windows_vol) >= settings.volume_threshold
+        vm_changed = abs(vm_gain - self.last_vm_gain) >= settings.gain_threshold
+        if windows_changed and self.journal.is_echo('windows', windows_vol, 1):
+            # Endpoint reporting a value we wrote ourselves (ramp steps, mixer-driven changes)
+            return 'windows-echo', None
+        if windows_changed:
+            return 'windows->vm', curve.volume_to_gain(windows_vol)
+        if vm_changed and self.journal.is_echo(VoicemeeterVolumeSync.bus_key(bus), vm_gain, 0.01):
+            # Bus gain we wrote ourselves (bus ramp steps)
+            return 'vm-echo', None
+        if vm_changed:
+            return 'vm->windows', curve.gain_to_volume(vm_gain)
+        return 'idle', None
+
+    def settle(self, decision, windows_vol, vm_gain, value, windows_written=True):
+        """Take the readings (and what was written for them) as the new synced state"""
+        if decision == 'windows-echo':
+            self.last_windows_vol = windows_vol
+        elif decision == 'windows->vm':
+            self.last_windows_vol = windows_vol
+            self.last_vm_gain = value
+        elif decision == 'vm-echo':
+            self.last_vm_gain = vm_gain
+        elif decision == 'vm->windows':
+            self.last_vm_gain = vm_gain
+            if windows_written:
+                # A ramp moves last_windows_vol along instead
+                self.last_windows_vol = value
+
+    def decide_mute(self, windows_muted, vm_muted, bus=0):
+        """Return 'windows->vm', 'vm->windows', an echo or 'idle' for the mute state of both sides"""
+        if self.last_windows_mute is None or self.last_vm_mute is None:
+            return 'resync'
+        if windows_muted != self.last_windows_mute:
+            if self.journal.is_echo('windows_mute', windows_muted, 0):
+                return 'windows-echo'
+            return 'windows->vm'
+        if vm_muted != self.last_vm_mute:
+            if self.journal.is_echo(('mute', bus), vm_muted, 0):
+                return 'vm-echo'
+            return 'vm->windows'
+        return 'idle'
+
+    def settle_mute(self, decision, windows_muted, vm_muted):
+        if decision == 'windows->vm':
+            self.last_windows_mute = self.last_vm_mute = windows_muted
+        elif decision == 'vm->windows':
+            self.last_windows_mute = self.last_vm_mute = vm_muted
+        else:
+            self.last_windows_mute, self.last_vm_mute = windows_muted, vm_muted
+
+
+class RampEngine:
+    """Moves a value linearly to its target over a fixed duration at a fixed rate, on its own thread"""
+
+    def __init__(self, name, apply, duration=0.2, rate=60, on_converged=None):
+        self.name = name
+        self.apply = apply  # apply(value) called from the ramp thread
+        self.duration = duration
+        self.period = 1 / rate if rate > 0 else 1 / 60
+        self.on_converged = on_converged  # on_converged(seconds from first target to arrival)
+        self.lock = threading.Lock()
+        self.wake = threading.Event()
+        self.active = False
+        self.start_value = self.target = self.current = None
+        self.start_time = self.chain_start = 0
+        self.retargets = 0
+        self.running = False
+        self.thread = None
+
+    def start(self):
+        self.running = True
+        self.thread = threading.Thread(target=self.run, name=f"{self.name}Ramp", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.running = False
+        self.wake.set()
+        if self.thread and self.thread.is_alive():
+            self.thread.join(timeout=1)
+
+    def set_target(self, target, current):
+        """Ramp from current (or from where a running ramp is now) to target, replacing any ramp in progress"""
+        now = time.monotonic()
+        with self.lock:
+            if self.active:
+                self.retargets += 1
+                current = self.current
+            else:
+                self.chain_start = now
+            self.start_value = current
+            self.current = current
+            self.target = target
+            self.start_time = now
+            self.active = True
+        self.wake.set()
+
+    def run(self):
+        while self.running:
+            self.wake.wait()
+            self.wake.clear()
+            deadline = time.monotonic()
+            while self.running:
+                with self.lock:
+                    if not self.active:
+                        break
+                    now = time.monotonic()
+                    fraction = (now - self.start_time) / self.duration if self.duration > 0 else 1
+                    if fraction >= 1:
+                        value = self.target
+                        self.active = False
+                        converged = now - self.chain_start
+                    else:
+                        value = self.start_value + (self.target - self.start_value) * fraction
+                        converged = None
+                    self.current = value
+                try:
+                    self.apply(value)
+                except Exception as e:
+                    logclass.log(f"{self.name} ramp failed to apply {value}: {e}", 'error')
+                if converged is not None:
+                    if self.on_converged:
+                        self.on_converged(converged)
+                    break
+                deadline += self.period
+                delay = deadline - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                else:
+                    deadline = time.monotonic()
+
+
+class WriteCoalescer:
+    """Latest-value-wins write stage in front of a backend: at most max_rate writes per second, the last value always sent.
+
+    A write is passed on right away when the backend was not written for 1/max_rate seconds. Otherwise it waits,
+    replacing any value still waiting for the same parameter, and the wake event is set once it is due so the sync
+    loop writes it (flush_due) on its own thread. Batches are taken and written under one write lock, so they reach
+    the backend in the order they were taken even when the sync, ramp, meter and control threads write at once.
+    """
+
+    def __init__(self, name, apply, max_rate=30, wake=None):
+        self.name = name
+        self.apply = apply  # apply({parameter: value}) writes to the backend
+        self.wake = wake
+        self.min_interval = 1 / max_rate if max_rate > 0 else 0
+        self.pending = {}  # parameter -> latest value not written yet
+        self.last_write = 0
+        self.timer = None
+        self.lock = threading.Lock()  # pending, last_write, timer
+        self.write_lock = threading.RLock()  # held from taking a batch to the end of its write
+        self.stats = {'submitted': 0, 'written': 0, 'superseded': 0, 'deferred': 0}
+
+    def configure(self, max_rate):
+        with self.lock:
+            self.min_interval = 1 / max_rate if max_rate > 0 else 0
+
+    def submit(self, values):
+        """Write {parameter: value} now if the rate allows, else keep it for the trailing write; True if written"""
+        with self.lock:
+            self.stats['submitted'] += len(values)
+            for key, value in values.items():
+                if key in self.pending:
+                    self.stats['superseded'] += 1
+                self.pending[key] = value
+        with self.write_lock:
+            with self.lock:
+                batch = self._take_due()
+                if batch is None:
+                    self.stats['deferred'] += 1
+                    self._arm()
+            if batch is None:
+                return False
+            self._write(batch)
+        return True
+
+    def flush_due(self):
+        """Sync thread: write what is pending once its turn has come"""
+        if not self.pending:
+            return
+        with self.write_lock:
+            with self.lock:
+                batch = self._take_due()
+            if batch is not None:
+                self._write(batch)
+
+    def flush(self):
+        """Write whatever is pending right away (sync stopping)"""
+        with self.write_lock:
+            with self.lock:
+                batch, self.pending = self.pending, {}
+                self.last_write = time.monotonic()
+            if batch:
+                self._write(batch)
+
+    def _take_due(self):
+        now = time.monotonic()
+        if not self.pending or now - self.last_write < self.min_interval:
+            return None
+        batch, self.pending = self.pending, {}
+        self.last_write = now
+        return batch
+
+    def _arm(self):
+        if self.timer is not None or self.wake is None:
+            return
+        self.timer = threading.Timer(max(0.0, self.last_write + self.min_interval - time.monotonic()), self._due)
+        self.timer.daemon = True
+        self.timer.start()
+
+    def _due(self):
+        with self.lock:
+            self.timer = None
+        self.wake.set()
+
+    def _write(self, batch):
+        self.stats['written'] += len(batch)
+        try:
+            self.apply(batch)
+        except Exception as e:
+            logclass.log(f"{self.name} write failed for {batch}: {e}", 'error')
+
+    def snapshot(self):
+        with self.lock:
+            return {**self.stats, 'pending': len(self.pending),
+                    'max_rate': round(1 / self.min_interval, 1) if self.min_interval else 0}
+
+
+class VbanTextBackend:
+    """Send parameter scripts to a remote Voicemeeter as VBAN-TEXT UDP packets"""
+
+    HEADER = struct.Struct('<4sBBBB16sI')
+    PROTOCOL_TEXT = 0x40
+    BPS_INDEX_256000 = 18
+    FORMAT_UTF8 = 0x10
+    MAX_PAYLOAD = 1436
+
+    def __init__(self, host, port=6980, stream_name="Command1", max_rate=30):
+        self.address = (host, port)
+        self.stream_name = stream_name.encode('ascii', errors='replace')[:16]
+        self.min_interval = 1 / max_rate if max_rate > 0 else 0
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.frame_counter = 0
+        self.pending = {}  # encoded parameter name -> value, latest wins
+        self.last_send = 0
+        self.timer = None
+        self.lock = threading.Lock()
+        self.stats = {'packets': 0, 'parameters': 0, 'coalesced': 0, 'errors': 0}
+
+    def set_parameters(self, params):
+        """Queue {encoded name: value}, sending now unless the rate limit defers it to a trailing packet"""
+        with self.lock:
+            for name, value in params.items():
+                if name in self.pending:
+                    self.stats['coalesced'] += 1
+                self.pending[name] = value
+            if self.timer is not None:
+                return
+            delay = self.last_send + self.min_interval - time.monotonic()
+            if delay <= 0:
+                self._send_pending()
+            else:
+                self.timer = threading.Timer(delay, self.flush)
+                self.timer.daemon = True
+                self.timer.start()
+
+    def flush(self):
+        """Send whatever is pending right away"""
+        with self.lock:
+            self.timer = None
+            self._send_pending()
+
+    def _send_pending(self):
+        if not self.pending:
+            return
+        script = b";".join(name + b"=%.2f" % value for name, value in self.pending.items())
+        header = self.HEADER.pack(b'VBAN', self.PROTOCOL_TEXT | self.BPS_INDEX_256000, 0, 0,
+                                  self.FORMAT_UTF8, self.stream_name, self.frame_counter)
+        try:
+            self.sock.sendto(header + script[:self.MAX_PAYLOAD], self.address)
+            self.stats['packets'] += 1
+            self.stats['parameters'] += len(self.pending)
+        except OSError as e:
+            self.stats['errors'] += 1
+            logclass.log(f"Error sending VBAN-TEXT packet to {self.address[0]}:{self.address[1]}: {e}", 'error')
+        self.frame_counter = (self.frame_counter + 1) & 0xFFFFFFFF
+        self.last_send = time.monotonic()
+        self.pending.clear()
+
+    def close(self):
+        """Flush the trailing packet and release the socket"""
+        with self.lock:
+            if self.timer is not None:
+                self.timer.cancel()
+                self.timer = None
+            self._send_pending()
+            self.sock.close()
+
+
+class LevelSource:
+    """Where the meter gets bus output levels from"""
+
+    def read(self, channels):
+        """Return the linear level (0-1, peak of the last audio block) of each (bus, channel), or None if unavailable"""
+        raise NotImplementedError
+
+
+class VoicemeeterLevelSource(LevelSource):
+    """Bus output levels from VBVMR_GetLevel (type 3, channel bus * 8 + n), read in one actor request"""
+
+    LEVEL_OUTPUT = 3
+
+    def __init__(self, get_dll, call):
+        self.get_dll = get_dll  # get_dll() -> DLL handle while connected, else None
+        self.call = call  # call(name, func, *args, key=None) runs func on the DLL actor
+        self.value = ctypes.c_float()
+
+    def read(self, channels):
+        dll = self.get_dll()
+        if dll is None:
+            return None
+        return self.call('dll.GetLevel', self.read_levels, dll, channels, key='levels')
+
+    def read_levels(self, dll, channels):
+        levels = []
+        get_level = dll.VBVMR_GetLevel
+        value = self.value
+        for bus, channel in channels:
+            if get_level(self.LEVEL_OUTPUT, bus * 8 + channel, ctypes.byref(value)) != 0:
+                return None
+            levels.append(value.value)
+        return levels
+
+
+class SyntheticLevelSource(LevelSource):
+    """Generated levels for trying rules without audio: signal(bus, channel, seconds) -> linear level"""
+
+    def __init__(self, signal=None):
+        self.signal = signal or self.speech_bursts
+        self.start = time.monotonic()
+
+    @staticmethod
+    def speech_bursts(bus, channel, seconds):
+        # Bus 0 plays steady music, the other buses talk in 2s bursts every 5s
+        if bus == 0:
+            return 0.3 + 0.05 * math.sin(seconds * 7)
+        return 0.5 if seconds % 5 < 2 else 0.001
+
+    def read(self, channels):
+        seconds = time.monotonic() - self.start
+        return [self.signal(bus, channel, seconds) for bus, channel in channels]
+
+
+class LevelMeter:
+    """Polls bus levels into a ring buffer on its own thread and reports windowed RMS / peak per bus in batches.
+
+    Uses numpy for the window statistics when it is installed, plain arrays otherwise (the packaged exe
+    excludes numpy).
+    """
+
+    def __init__(self, source, buses, channels=2, rate=30, window=0.3, batch=3, on_levels=None, metrics=None):
+        self.source = source
+        self.buses = tuple(buses)
+        self.channels = [(bus, channel) for bus in self.buses for channel in range(channels)]
+        self.channels_per_bus = channels
+        self.period = 1 / rate if rate > 0 else 1 / 30
+        self.size = max(1, int(round(window * rate)))  # frames in the window
+        self.batch = max(1, batch)  # frames between two reports
+        self.on_levels = on_levels  # on_levels({bus: (rms_db, peak_db)}) from the meter thread
+        self.metrics = metrics
+        self.levels = {}
+        self.frames = 0
+        self.misses = 0
+        try:
+            import numpy
+        except ImportError:
+            numpy = None
+        self.numpy = numpy
+        width = len(self.channels)
+        if numpy is not None:
+            self.ring = numpy.zeros((self.size, width), dtype=numpy.float32)
+        else:
+            self.ring = array.array('f', bytes(4 * self.size * width))
+        self.running = False
+        self.thread = None
+
+    def start(self):
+        self.running = True
+        self.thread = threading.Thread(target=self.run, name="LevelMeter", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.running = False
+        if self.thread and self.thread.is_alive():
+            self.thread.join(timeout=1)
+
+    def push(self, frame):
+        """Store one frame (a level per channel) in the ring"""
+        row = self.frames % self.size
+        if self.numpy is not None:
+            self.ring[row] = frame
+        else:
+            width = len(self.channels)
+            self.ring[row * width:(row + 1) * width] = array.array('f', frame)
+        self.frames += 1
+
+    def window_levels(self):
+        """RMS and peak over the window for every bus, in dBFS"""
+        filled = min(self.frames, self.size)
+        per_bus = self.channels_per_bus
+        if self.numpy is not None:
+            np = self.numpy
+            window = self.ring[:filled]
+            mean_square = np.mean(np.square(window, dtype=np.float64), axis=0).reshape(-1, per_bus).mean(axis=1)
+            peaks = window.max(axis=0).reshape(-1, per_bus).max(axis=1)
+            pairs = zip(mean_square.tolist(), peaks.tolist())
+        else:
+            width = len(self.channels)
+            ring = self.ring[:filled * width]
+            pairs = []
+            for first in range(0, width, per_bus):
+                columns = [ring[column::width] for column in range(first, first + per_bus)]
+                mean_square = math.fsum(math.fsum(x * x for x in column) for column in columns) / (filled * per_bus)
+                pairs.append((mean_square, max(max(column) for column in columns)))
+        return {bus: (10 * math.log10(max(mean_square, 1e-12)), 20 * math.log10(max(peak, 1e-6)))
+                for bus, (mean_square, peak) in zip(self.buses, pairs)}
+
+    def poll(self):
+        frame = self.source.read(self.channels)
+        if frame is None:
+            self.misses += 1
+            return
+        self.push(frame)
+        if self.frames % self.batch == 0:
+            start = time.perf_counter()
+            self.levels = self.window_levels()
+            if self.metrics:
+                self.metrics.observe('meter.batch', time.perf_counter() - start)
+            if self.on_levels:
+                self.on_levels(self.levels)
+
+    def run(self):
+        deadline = time.monotonic()
+        while self.running:
+            start = time.perf_counter()
+            try:
+                self.poll()
+            except Exception as e:
+                self.misses += 1
+                logclass.log(f"Level meter poll failed: {e}", 'error')
+            if self.metrics:
+                self.metrics.observe('meter.poll', time.perf_counter() - start)
+            deadline += self.period
+            delay = deadline - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                deadline = time.monotonic()
+
+
+class LevelRule:
+    """Turns bus levels into a gain reduction for the synced buses.
+
+    'cap' keeps the loudest synced bus under cap_db (levels are post-fader, so the reduction is integrated
+    rather than recomputed), 'duck' lowers the synced buses by duck_amount_db while duck_bus is above
+    duck_threshold_db. The reduction drops at once and comes back at release_db_per_s.
+
+    After the cap raises the reduction it holds for settle_s (the meter window, plus the time the write takes to
+    reach the audio): until the window only holds frames played at the new gain, the level still shows part of
+    the excess the reduction already took away, and adding it again would overshoot.
+    """
+
+    def __init__(self, mode, cap_db=-12, duck_bus=-1, duck_threshold_db=-30, duck_amount_db=10,
+                 max_reduction_db=24, release_db_per_s=6, settle_s=0.3):
+        self.mode = mode
+        self.cap_db = cap_db
+        self.duck_bus = duck_bus
+        self.duck_threshold_db = duck_threshold_db
+        self.duck_amount_db = duck_amount_db
+        self.max_reduction_db = max_reduction_db
+        self.release_db_per_s = release_db_per_s
+        self.settle_s = settle_s
+        self.reduction = 0.0
+        self.last_update = None
+        self.settled_at = None  # when the meter window no longer holds frames from before the last cap increase
+
+    def update(self, levels, buses, now):
+        """Return the reduction in dB to apply to the synced buses for these levels"""
+        elapsed = now - self.last_update if self.last_update is not None else 0
+        self.last_update = now
+        release = self.release_db_per_s * elapsed
+        if self.mode == 'cap':
+            loudest = max((levels[bus][0] for bus in buses if bus in levels), default=None)
+            if loudest is None or (self.settled_at is not None and now < self.settled_at):
+                return self.reduction
+            if loudest > self.cap_db:
+                self.reduction = min(self.max_reduction_db, self.reduction + loudest - self.cap_db)
+                self.settled_at = now + self.settle_s
+            elif loudest < self.cap_db - 1:
+                # Give back only what keeps us under the cap, with 1dB of hysteresis
+                self.reduction = max(0.0, self.reduction - min(release, self.cap_db - 1 - loudest))
+        elif self.mode == 'duck':
+            trigger = levels.get(self.duck_bus)
+            if trigger is not None and trigger[0] > self.duck_threshold_db:
+                self.reduction = min(self.max_reduction_db, self.duck_amount_db)
+            else:
+                self.reduction = max(0.0, self.reduction - release)
+        return self.reduction
+
+
+class VoicemeeterActor:
+    """Owns every call into the Voicemeeter DLL: callers queue requests and get a Future, one thread runs them in order.
+
+    A request submitted with a key replaces a still queued request with the same key (a newer write to the same
+    parameters); all its callers get the result of the one that runs.
+    """
+
+    def __init__(self, metrics, maxsize=64, timeout=2.0):
+        self.metrics = metrics
+        self.maxsize = maxsize
+        self.timeout = timeout  # how long call() waits for a free slot and for the result
+        self.pending = collections.deque()  # [name, func, args, key, futures, submitted]
+        self.by_key = {}  # key -> queued request
+        self.cond = threading.Condition()
+        self.counts = collections.Counter()
+        self.max_depth = 0
+        self.running = False
+        self.thread = None
+
+    def start(self):
+        with self.cond:
+            if self.thread and self.thread.is_alive():
+                self.running = True
+                return
+            self.running = True
+            self.thread = threading.Thread(target=self.run, name="VoicemeeterActor", daemon=True)
+            self.thread.start()
+
+    def stop(self, timeout=2):
+        """Run what is already queued, then let the thread end"""
+        with self.cond:
+            self.running = False
+            self.cond.notify_all()
+        if self.thread and self.thread is not threading.current_thread():
+            self.thread.join(timeout)
+
+    def submit(self, name, func, *args, key=None):
+        """Queue func(*args) for the actor thread, return a Future of its result"""
+        future = concurrent.futures.Future()
+        if threading.current_thread() is self.thread:
+            # Already on the actor (a request calling back in): run it now rather than wait on ourselves
+            self.execute(name, func, args, [future], time.perf_counter())
+            return future
+        with self.cond:
+            if not self.running:
+                self.start()
+            if key is not None:
+                request = self.by_key.get(key)
+                if request is not None:
+                    request[1], request[2] = func, args
+                    request[4].append(future)
+                    self.counts['coalesced'] += 1
+                    return future
+            while len(self.pending) >= self.maxsize:
+                if not self.cond.wait(self.timeout):
+                    self.counts['rejected'] += 1
+                    raise queue.Full(f"Voicemeeter request queue full ({self.maxsize} pending)")
+            request = [name, func, args, key, [future], time.perf_counter()]
+            self.pending.append(request)
+            if key is not None:
+                self.by_key[key] = request
+            self.counts['submitted'] += 1
+            self.max_depth = max(self.max_depth, len(self.pending))
+            self.cond.notify_all()
+        return future
+
+    def call(self, name, func, *args, key=None):
+        """Submit and wait for the result, raising whatever the call raised"""
+        return self.submit(name, func, *args, key=key).result(self.timeout)
+
+    def run(self):
+        while True:
+            with self.cond:
+                while self.running and not self.pending:
+                    self.cond.wait()
+                if not self.pending:
+                    return
+                name, func, args, key, futures, submitted = self.pending.popleft()
+                if key is not None:
+                    self.by_key.pop(key, None)
+                self.cond.notify_all()
+            self.execute(name, func, args, futures, submitted)
+
+    def execute(self, name, func, args, futures, submitted):
+        start = time.perf_counter()
+        self.metrics.observe('dll.queue_wait', start - submitted)
+        try:
+            result = func(*args)
+        except Exception as e:
+            for future in futures:
+                future.set_exception(e)
+        else:
+            for future in futures:
+                future.set_result(result)
+        self.metrics.observe(name, time.perf_counter() - start)
+        self.counts['completed'] += 1
+
+    def stats(self):
+        with self.cond:
+            return {'depth': len(self.pending), 'max_depth': self.max_depth, **self.counts}
+
+
+class ReadinessCoordinator:
+    """Probes startup dependencies in parallel, each on its own thread at short intervals growing up to a cap.
+
+    wait() returns as soon as every probe passed (or at the timeout); notify() makes waiting probes try again
+    right away, for callbacks that know something just changed.
+    """
+
+    def __init__(self, probes, min_interval=0.05, max_interval=1.0, growth=1.5, timeout=120):
+        self.probes = probes  # {name: probe() -> True once ready}, a probe may block
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.growth = growth
+        self.timeout = timeout
+        self.started = None
+        self.ready_at = {}  # name -> perf_counter time the probe passed
+        self.attempts = collections.Counter()
+        self.wakes = {name: threading.Event() for name in probes}
+        self.done = threading.Event()
+        self.lock = threading.Lock()
+        self.stopped = False
+
+    def notify(self):
+        for wake in self.wakes.values():
+            wake.set()
+
+    def probe_loop(self, name, probe):
+        interval = self.min_interval
+        wake = self.wakes[name]
+        while not self.stopped:
+            self.attempts[name] += 1
+            try:
+                ready = probe()
+            except Exception as e:
+                ready = False
+                if self.attempts[name] == 1:
+                    logclass.log(f"{name} not ready yet: {e}")
+            if ready:
+                with self.lock:
+                    self.ready_at[name] = time.perf_counter()
+                    if len(self.ready_at) == len(self.probes):
+                        self.done.set()
+                return
+            wake.wait(interval)
+            wake.clear()
+            interval = min(interval * self.growth, self.max_interval)
+
+    def wait(self, keep_waiting=lambda: True):
+        """Run the probes until all pass, the timeout, or keep_waiting() turns False; True if all passed"""
+        self.started = time.perf_counter()
+        if not self.probes:
+            return True
+        for name, probe in self.probes.items():
+            threading.Thread(target=self.probe_loop, args=(name, probe), name=f"Probe-{name}", daemon=True).start()
+        deadline = self.started + self.timeout
+        while not self.done.is_set():
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0 or not keep_waiting():
+                break
+            self.done.wait(min(remaining, 0.2))
+        self.stopped = True
+        self.notify()
+        return self.done.is_set()
+
+    def missing(self):
+        return [name for name in self.probes if name not in self.ready_at]
+
+
+class ConnectionSupervisor:
+    """Keeps the Voicemeeter login alive from its own thread, retrying with jittered exponential backoff"""
+
+    def __init__(self, load, connect, on_change, min_delay=0.5, max_delay=30):
+        self.load = load  # load() -> DLL handle or None, called until it succeeds, then cached
+        self.connect = connect  # connect(dll) -> True once logged in and Voicemeeter answers
+        self.on_change = on_change  # on_change(connected), called from the supervisor thread
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.dll = None
+        self.connected = False
+        self.lost = False  # set by report_lost, published by the supervisor thread
+        self.attempts = 0
+        self.wake = threading.Event()
+        self.running = False
+        self.thread = None
+
+    def start(self):
+        if self.thread and self.thread.is_alive():
+            return
+        self.running = True
+        self.wake.clear()
+        self.thread = threading.Thread(target=self.run, name="ConnectionSupervisor", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.running = False
+        self.wake.set()
+        if self.thread and self.thread.is_alive():
+            self.thread.join(timeout=2)
+        self.thread = None
+
+    def reset_dll(self):
+        """Forget the cached handle so the next attempt loads the DLL again (dll_path changed)"""
+        self.dll = None
+
+    def retry_now(self):
+        """Skip the current backoff wait (startup probing)"""
+        if not self.connected:
+            self.wake.set()
+
+    def report_lost(self):
+        """A DLL call failed (any thread): have the supervisor thread publish the disconnect and start retrying"""
+        if not self.connected:
+            return
+        self.lost = True
+        self.connected = False
+        self.wake.set()
+
+    def run(self):
+        delay = self.min_delay
+        while self.running:
+            if self.connected:
+                self.wake.wait()
+                self.wake.clear()
+                delay = self.min_delay
+                continue
+            if self.lost:
+                self.lost = False
+                self.on_change(False)
+            if self.dll is None:
+                self.dll = self.load()
+            if self.dll is not None:
+                self.attempts += 1
+                try:
+                    connected = self.connect(self.dll)
+                except Exception as e:
+                    logclass.log(f"Exception connecting to Voicemeeter: {e}", 'error')
+                    connected = False
+                if connected and self.running:
+                    self.connected = True
+                    self.on_change(True)
+                    continue
+            # Jitter keeps retries from lining up with Voicemeeter's own restart cycle
+            wait = delay * random.uniform(0.5, 1.0)
+            if self.attempts <= 1 or delay >= self.max_delay:
+                logclass.log(f"Voicemeeter not available - retrying in {wait:.1f}s")
+            self.wake.wait(wait)
+            self.wake.clear()
+            delay = min(delay * 2, self.max_delay)
+
+
+class ControlRequestHandler(socketserver.StreamRequestHandler):
+    """One persistent control connection: HELLO VCVM, then a command per line, a reply per line, EVENT lines once subscribed.
+
+    The greeting keeps other protocols out: a browser can be made to POST "SET VOLUME 100" to this port, but the
+    first line it sends is always its request line, and the connection is closed on it.
+    """
+
+    def setup(self):
+        super().setup()
+        self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.write_lock = threading.Lock()
+        self.server.control.connections.add(self)
+
+    def send(self, line):
+        with self.write_lock:
+            self.wfile.write(line.encode('utf-8') + b'\n')
+
+    def handle(self):
+        greeted = False
+        try:
+            for raw in self.rfile:
+                line = raw.decode('utf-8', 'replace').strip()
+                if not line:
+                    continue
+                if not greeted:
+                    if line.upper() != ControlServer.GREETING:
+                        self.send(f"ERR expected {ControlServer.GREETING} first")
+                        break
+                    greeted = True
+                    self.send(f"{ControlServer.GREETING} {APP_VERSION}")
+                    continue
+                if line.upper() == 'QUIT':
+                    break
+                self.send(self.server.control.execute(line, self))
+        except OSError:
+            pass
+
+    def finish(self):
+        self.server.control.unsubscribe(self)
+        self.server.control.connections.discard(self)
+        try:
+            super().finish()
+        except OSError:
+            pass
+
+
+class ControlServer:
+    """Localhost line protocol for scripts and macro pads. Changes are queued for the sync loop, never applied here"""
+
+    GREETING = "HELLO VCVM"  # first line of every connection
+    USAGE = "PING | GET | SET VOLUME <0-100> | SET GAIN <dB> [bus] | NUDGE <+/-volume> | SUBSCRIBE | QUIT"
+    MAX_PENDING_EVENTS = 256
+
+    def __init__(self, port, submit, get_state):
+        self.port = port
+        self.submit = submit  # submit(kind, value, bus) queues a change for the sync loop
+        self.get_state = get_state  # get_state() -> dict, called from connection threads
+        self.connections = set()
+        self.subscribers = {}  # handler -> queue of EVENT lines, drained by one writer thread each
+        self.lock = threading.Lock()
+        self.dropped_events = 0
+        self.server = None
+
+    @staticmethod
+    def port_from_config(config_file):
+        """Control port from config.ini without loading the app, 0 when the control server is disabled"""
+        config = configparser.ConfigParser()
+        config.read_dict({'Control': DEFAULT_CONFIG['Control']})
+        try:
+            config.read(config_file)
+            return config.getint('Control', 'port') if config.getboolean('Control', 'enabled') else 0
+        except (configparser.Error, ValueError):
+            return 0
+
+    @staticmethod
+    def forward(port, command, timeout=2):
+        """Send one command to a running instance, return its reply or None when nobody answers"""
+        try:
+            with socket.create_connection(('127.0.0.1', port), timeout=timeout) as sock:
+                sock.sendall(f"{ControlServer.GREETING}\n{command}\n".encode('utf-8'))
+                lines = sock.makefile('rb')
+                if not lines.readline().decode('utf-8', 'replace').startswith(ControlServer.GREETING):
+                    return None
+                reply = lines.readline()
+        except OSError:
+            return None
+        return reply.decode('utf-8', 'replace').strip() or None
+
+    def start(self):
+        """Listen on 127.0.0.1:port, return False when the port is taken"""
+        server = socketserver.ThreadingTCPServer(('127.0.0.1', self.port), ControlRequestHandler, bind_and_activate=False)
+        server.daemon_threads = True
+        # Single instance relies on the bind failing: SO_REUSEADDR only lets us rebind over TIME_WAIT on POSIX,
+        # while on Windows it would let a second listener share the port, so Windows gets SO_EXCLUSIVEADDRUSE
+        exclusive = hasattr(socket, 'SO_EXCLUSIVEADDRUSE')
+        server.allow_reuse_address = not exclusive
+        try:
+            if exclusive:
+                server.socket.setsockopt(socket.SOL_SOCKET, socket.SO_EXCLUSIVEADDRUSE, 1)
+            server.server_bind()
+            server.server_activate()
+        except OSError:
+            server.server_close()
+            return False
+        server.control = self
+        self.server = server
+        threading.Thread(target=server.serve_forever, name="ControlServer", daemon=True).start()
+        return True
+
+    def stop(self):
+        if not self.server:
+            return
+        self.server.shutdown()
+        self.server.server_close()
+        self.server = None
+        for handler in list(self.connections):
             try:
-                file_handler = logging.FileHandler(self.log_file, encoding='utf-8')
-                file_handler.setLevel(logging.DEBUG)
-                formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
-                file_handler.setFormatter(formatter)
-                self.logger.addHandler(file_handler)
-            except IOError as e:
-                print(f"ERROR: Failed to open log file {self.log_file}: {e}")
-            
-            console_handler = logging.StreamHandler()
-            console_handler.setLevel(logging.INFO) 
-            formatter_console = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
-            console_handler.setFormatter(formatter_console)
-            self.logger.addHandler(console_handler)
+                handler.request.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
 
-            self.logger.propagate = False
-        else:
-            self.logger = None 
-      
-    def log(self, message, level='info', exc_info=None):
-        """Log a message"""
-        if self.logger:
-            if level.lower() == 'debug':
-                self.logger.debug(message, exc_info=exc_info)
-            elif level.lower() == 'warning':
-                self.logger.warning(message, exc_info=exc_info)
-            elif level.lower() == 'error':
-                self.logger.error(message, exc_info=exc_info)
+    @staticmethod
+    def number(text):
+        """float(text), refusing inf and nan"""
+        value = float(text)
+        if not math.isfinite(value):
+            raise ValueError(text)
+        return value
+
+    def execute(self, line, handler):
+        parts = line.split()
+        command = parts[0].upper()
+        target = parts[1].upper() if len(parts) > 1 else ''
+        try:
+            if command == 'PING':
+                return f"PONG VCVM {APP_VERSION}"
+            if command == 'GET':
+                return "STATE " + json.dumps(self.get_state())
+            if command == 'SUBSCRIBE':
+                self.subscribe(handler)
+                return "OK"
+            if command == 'SET' and target == 'VOLUME' and len(parts) == 3:
+                volume = self.number(parts[2])
+                if not 0 <= volume <= 100:
+                    return "ERR volume must be between 0 and 100"
+                self.submit('volume', volume, None)
+                return "OK"
+            if command == 'SET' and target == 'GAIN' and len(parts) in (3, 4):
+                gain = self.number(parts[2])
+                bus = int(parts[3]) if len(parts) == 4 else None
+                if not -60 <= gain <= 12:
+                    return "ERR gain must be between -60 and 12 dB"
+                if bus is not None and not 0 <= bus < BUS_COUNT:
+                    return f"ERR bus must be between 0 and {BUS_COUNT - 1}"
+                self.submit('gain', gain, bus)
+                return "OK"
+            if command == 'NUDGE' and len(parts) == 2:
+                self.submit('nudge', self.number(parts[1]), None)
+                return "OK"
+        except ValueError:
+            return f"ERR invalid number in '{line}'"
+        return f"ERR unknown command, expected {self.USAGE}"
+
+    def subscribe(self, handler):
+        with self.lock:
+            if handler in self.subscribers:
+                return
+            events = self.subscribers[handler] = queue.SimpleQueue()
+        threading.Thread(target=self.push_events, args=(handler, events), name="ControlEvents", daemon=True).start()
+
+    def unsubscribe(self, handler):
+        with self.lock:
+            events = self.subscribers.pop(handler, None)
+        if events is not None:
+            events.put(None)
+
+    def push_events(self, handler, events):
+        while True:
+            line = events.get()
+            if line is None:
+                return
+            try:
+                handler.send(line)
+            except OSError:
+                self.unsubscribe(handler)
+                return
+
+    def publish(self, event):
+        """Queue an EVENT line for every subscriber; a client that stops reading loses events, the sync never waits"""
+        if not self.subscribers:
+            return
+        line = "EVENT " + json.dumps(event)
+        with self.lock:
+            for events in self.subscribers.values():
+                if events.qsize() >= self.MAX_PENDING_EVENTS:
+                    self.dropped_events += 1
+                else:
+                    events.put(line)
+
+
+class AutostartManager:
+    """Autostart through a Windows scheduled task, with its state cached in memory"""
+
+    TASK_NAME = "VolumeControl for Voicemeeter"
+
+    def __init__(self, runner=None):
+        self.runner = runner or self.run_command  # runner(args) -> (returncode, message)
+        self.enabled = None  # unknown until the first query finishes
+        self.lock = threading.Lock()  # held by refresh, create and delete, so a refresh never undoes a toggle
+        self.refresh_thread = None
+
+    @staticmethod
+    def run_command(args):
+        """Default runner: spawn the command and return (returncode, stderr or stdout)"""
+        result = subprocess.run(args, stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True)
+        return result.returncode, (result.stderr or result.stdout).strip()
+
+    def is_enabled(self):
+        return bool(self.enabled)
+
+    def query(self):
+        """Ask the task scheduler whether the task exists (blocking)"""
+        try:
+            returncode, _ = self.runner(["schtasks", "/Query", "/TN", self.TASK_NAME])
+            return returncode == 0
+        except Exception as e:
+            logclass.log(f"Error querying autostart task: {e}", 'error')
+            return None
+
+    def refresh(self):
+        state = self.query()
+        if state is not None:
+            self.enabled = state
+        return self.enabled
+
+    def refresh_async(self, on_done=None):
+        """Re-query the task scheduler on a background thread, calling on_done() when finished"""
+        def worker():
+            with self.lock:
+                self.refresh()
+            if on_done:
+                on_done()
+        self.refresh_thread = threading.Thread(target=worker, name="AutostartRefresh", daemon=True)
+        self.refresh_thread.start()
+        return self.refresh_thread
+
+    def create(self, command):
+        """Create the logon task running command, 5 seconds after logon"""
+        schtasks_cmd = [
+            "schtasks",
+            "/Create",
+            "/TN", self.TASK_NAME,
+            "/TR", command,
+            "/SC", "ONLOGON",
+            "/RL", "HIGHEST",
+            "/DELAY", "0000:05",
+            "/F"
+        ]
+        with self.lock:
+            try:
+                returncode, message = self.runner(schtasks_cmd)
+                if returncode == 0:
+                    self.enabled = True
+                    logclass.log("Autostart task created successfully with 5 seconds delay")
+                    return True
+                logclass.log(f"Failed to create autostart task: {message}", 'error')
+            except Exception as e:
+                logclass.log(f"Error creating autostart task: {e}", 'error')
+            self.enabled = None
+            return False
+
+    def delete(self):
+        """Remove the logon task"""
+        with self.lock:
+            try:
+                returncode, message = self.runner(["schtasks", "/Delete", "/TN", self.TASK_NAME, "/F"])
+                if returncode == 0:
+                    self.enabled = False
+                    logclass.log("Autostart task removed successfully")
+                    return True
+                logclass.log(f"Failed to remove autostart task: {message}", 'error')
+            except Exception as e:
+                logclass.log(f"Error removing autostart task: {e}", 'error')
+            self.enabled = None
+            return False
+
+
+class VolumeCurve:
+    """Volume <-> gain curve for one curve_power, with both directions precomputed"""
+
+    _built = {}  # curve_power -> VolumeCurve, shared by settings snapshots and device profiles
+
+    def __init__(self, power):
+        self.power = power
+        self.volume_gain_table = tuple(self.curve_volume_to_gain(volume) for volume in range(101))  # gain for each integer volume
+        self.gain_volume_thresholds = tuple(self.lowest_gain_for_volume(volume) for volume in range(1, 101))  # searched by bisection
+
+    @classmethod
+    def for_power(cls, power):
+        curve = cls._built.get(power)
+        if curve is None:
+            curve = cls._built[power] = cls(power)
+            logclass.log(f"Built volume/gain tables for curve_power {power}")
+        return curve
+
+    def curve_volume_to_gain(self, volume):
+        """Volume to gain curve formula"""
+        if volume <= 0:
+            return -60
+        elif volume >= 100:
+            return 12
+        gain = (volume / 100) ** self.power * 72 - 60
+        return round(gain, 2)
+
+    def curve_gain_to_volume(self, gain):
+        """Gain to volume curve formula"""
+        if gain <= -60:
+            return 0
+        elif gain >= 12:
+            return 100
+        volume = ((gain + 60) / 72) ** (1 / self.power) * 100
+        return int(volume)
+
+    def lowest_gain_for_volume(self, volume):
+        """Smallest float gain that the curve maps to at least volume, found by bisecting down to adjacent floats"""
+        low, high = -60.0, 12.0
+        while True:
+            middle = (low + high) / 2
+            if middle == low or middle == high:
+                return high
+            if self.curve_gain_to_volume(middle) >= volume:
+                high = middle
             else:
-                self.logger.info(message, exc_info=exc_info)
-        else:
-            print(f"{datetime.now().strftime('%Y-%m-%d %H:%M:%S')} - {level.upper()} - {message}")
-            if exc_info:
-                import traceback
-                traceback.print_exception(exc_info[0], exc_info[1], exc_info[2], file=sys.stderr)
-            
-    def handle_exception(self, exc_type, exc_value, exc_traceback):
-        if issubclass(exc_type, KeyboardInterrupt):
-            sys.__excepthook__(exc_type, exc_value, exc_traceback)
+                low = middle
+
+    def volume_to_gain(self, volume):
+        if volume <= 0:
+            return -60
+        elif volume >= 100:
+            return 12
+        if type(volume) is int:
+            return self.volume_gain_table[volume]
+        return self.curve_volume_to_gain(volume)
+
+    def gain_to_volume(self, gain):
+        if gain <= -60:
+            return 0
+        elif gain >= 12:
+            return 100
+        return bisect.bisect_right(self.gain_volume_thresholds, gain)
+
+
+@dataclass(frozen=True)
+class DeviceProfile:
+    """A [Device:<name>] section: bus list and curve used while the output device name contains match"""
+    section: str
+    match: str
+    bus_list: tuple
+    curve: VolumeCurve
+
+
+@dataclass(frozen=True)
+class SessionRule:
+    """An [App:<name>] section: sessions of processes whose name contains match drive Strip[strip].Gain"""
+    section: str
+    match: str
+    strip: int
+    curve: VolumeCurve
+
+
+@dataclass(frozen=True)
+class Settings:
+    """Typed snapshot of config.ini. Never modified: a reload parses a new one and swaps the reference"""
+    dll_path: str
+    backend: str
+    vban_host: str
+    vban_port: int
+    vban_stream: str
+    vban_max_rate: float
+    dll_max_rate: float
+    reconnect_min_delay: float
+    reconnect_max_delay: float
+    logging_enabled: bool
+    verbose: bool
+    log_file: str
+    log_queued: bool
+    trace_size: int
+    record: bool
+    icon_mode: str
+    volume_icon_steps: int
+    metrics_enabled: bool
+    http_port: int
+    control_enabled: bool
+    control_port: int
+    meter_enabled: bool
+    meter_source: str
+    meter_rate: float
+    meter_window: float
+    meter_channels: int
+    meter_rule: str
+    cap_db: float
+    duck_bus: int
+    duck_threshold_db: float
+    duck_amount_db: float
+    max_reduction_db: float
+    release_db_per_s: float
+    sync_interval: float
+    sync_interval_idle: float
+    idle_after: float
+    echo_window: float
+    gain_threshold: float
+    volume_threshold: int
+    bus_list: tuple
+    curve: VolumeCurve
+    volume_events: bool
+    event_fallback_poll: float
+    ramp_duration: float
+    ramp_rate: float
+    ramp_buses: bool
+    windows_max_rate: float
+    ready_timeout: float
+    probe_max_interval: float
+    session_sync: bool = False
+    session_refresh: float = 10
+    device_profiles: tuple = ()
+    session_rules: tuple = ()
+
+    @classmethod
+    def from_config(cls, config):
+        """Parse a ConfigParser holding every DEFAULT_CONFIG key, raising ValueError on a malformed value"""
+        vm = config['Voicemeeter']
+        log = config['Logging']
+        tray = config['Tray']
+        metrics = config['Metrics']
+        control = config['Control']
+        meter = config['Metering']
+        sync = config['Settings']
+        curve_power = cls.checked('curve_power', sync.getfloat('curve_power'), 0, inclusive=False)
+        reconnect_min_delay = cls.checked('reconnect_min_delay', vm.getfloat('reconnect_min_delay'), 0, inclusive=False)
+        profiles = []
+        for section in config.sections():
+            if not section.lower().startswith('device:'):
+                continue
+            match = section.split(':', 1)[1].strip().lower()
+            if not match:
+                continue
+            profile = config[section]
+            try:
+                profile_power = cls.checked('curve_power', profile.getfloat('curve_power', fallback=curve_power), 0,
+                                            inclusive=False)
+            except ValueError as e:
+                logclass.log(f"Invalid curve_power in device profile: {e}", 'error')
+                profile_power = curve_power
+            profiles.append(DeviceProfile(section, match, cls.parse_bus_list(profile.get('bus', sync.get('bus'))),
+                                          VolumeCurve.for_power(profile_power)))
+        rules = []
+        for section in config.sections():
+            if not section.lower().startswith('app:'):
+                continue
+            match = section.split(':', 1)[1].strip().lower()
+            if not match:
+                continue
+            rule = config[section]
+            try:
+                rule_power = cls.checked('curve_power', rule.getfloat('curve_power', fallback=curve_power), 0, inclusive=False)
+                rules.append(SessionRule(section, match, rule.getint('strip'), VolumeCurve.for_power(rule_power)))
+            except (TypeError, ValueError) as e:
+                logclass.log(f"Invalid application rule [{section}]: {e}", 'error')
+        return cls(
+            dll_path=vm.get('dll_path'),
+            backend=vm.get('backend').strip().lower(),
+            vban_host=vm.get('vban_host'),
+            vban_port=cls.checked('vban_port', vm.getint('vban_port'), 0, maximum=65535),
+            vban_stream=vm.get('vban_stream'),
+            vban_max_rate=cls.checked('vban_max_rate', vm.getfloat('vban_max_rate'), 0),
+            dll_max_rate=cls.checked('dll_max_rate', vm.getfloat('dll_max_rate'), 0),
+            reconnect_min_delay=reconnect_min_delay,
+            reconnect_max_delay=cls.checked('reconnect_max_delay', vm.getfloat('reconnect_max_delay'), reconnect_min_delay),
+            logging_enabled=log.getboolean('enabled'),
+            verbose=log.getboolean('verbose'),
+            log_file=log.get('log_file'),
+            log_queued=log.getboolean('queued'),
+            trace_size=cls.checked('trace_size', log.getint('trace_size'), 0),
+            record=log.getboolean('record'),
+            icon_mode=tray.get('icon_mode').strip().lower(),
+            volume_icon_steps=cls.checked('volume_icon_steps', tray.getint('volume_icon_steps'), 1),
+            metrics_enabled=metrics.getboolean('enabled'),
+            http_port=cls.checked('http_port', metrics.getint('http_port'), 0, maximum=65535),
+            control_enabled=control.getboolean('enabled'),
+            control_port=cls.checked('port', control.getint('port'), 0, maximum=65535),
+            meter_enabled=meter.getboolean('enabled'),
+            meter_source=meter.get('source').strip().lower(),
+            meter_rate=cls.checked('rate', meter.getfloat('rate'), 0, inclusive=False),
+            meter_window=cls.checked('window', meter.getfloat('window'), 0, inclusive=False),
+            meter_channels=cls.checked('channels', meter.getint('channels'), 1, maximum=8),
+            meter_rule=meter.get('rule').strip().lower(),
+            cap_db=cls.checked('cap_db', meter.getfloat('cap_db'), -math.inf),
+            duck_bus=cls.checked('duck_bus', meter.getint('duck_bus'), -1, maximum=BUS_COUNT - 1),
+            duck_threshold_db=cls.checked('duck_threshold_db', meter.getfloat('duck_threshold_db'), -math.inf),
+            duck_amount_db=cls.checked('duck_amount_db', meter.getfloat('duck_amount_db'), 0),
+            max_reduction_db=cls.checked('max_reduction_db', meter.getfloat('max_reduction_db'), 0),
+            release_db_per_s=cls.checked('release_db_per_s', meter.getfloat('release_db_per_s'), 0, inclusive=False),
+            sync_interval=cls.checked('sync_interval', sync.getfloat('sync_interval'), 0, inclusive=False),
+            sync_interval_idle=cls.checked('sync_interval_idle', sync.getfloat('sync_interval_idle'), 0, inclusive=False),
+            idle_after=cls.checked('idle_after', sync.getfloat('idle_after'), 0),
+            echo_window=cls.checked('echo_window', sync.getfloat('echo_window'), 0),
+            gain_threshold=cls.checked('gain_threshold', sync.getfloat('gain_threshold'), 0),
+            volume_threshold=cls.checked('volume_threshold', sync.getint('volume_threshold'), 0),
+            bus_list=cls.parse_bus_list(sync.get('bus')),
+            curve=VolumeCurve.for_power(curve_power),
+            volume_events=sync.getboolean('volume_events'),
+            event_fallback_poll=cls.checked('event_fallback_poll', sync.getfloat('event_fallback_poll'), 0, inclusive=False),
+            ramp_duration=cls.checked('ramp_duration', sync.getfloat('ramp_duration'), 0),
+            ramp_rate=cls.checked('ramp_rate', sync.getfloat('ramp_rate'), 0),
+            ramp_buses=sync.getboolean('ramp_buses'),
+            windows_max_rate=cls.checked('windows_max_rate', sync.getfloat('windows_max_rate'), 0),
+            ready_timeout=cls.checked('ready_timeout', config.getfloat('Startup', 'ready_timeout'), 0),
+            probe_max_interval=cls.checked('probe_max_interval', config.getfloat('Startup', 'probe_max_interval'), 0,
+                                           inclusive=False),
+            session_sync=config.getboolean('Sessions', 'enabled'),
+            session_refresh=cls.checked('refresh_interval', config.getfloat('Sessions', 'refresh_interval'), 0,
+                                        inclusive=False),
+            device_profiles=tuple(profiles),
+            session_rules=tuple(rules),
+        )
+
+    @staticmethod
+    def checked(name, value, minimum, inclusive=True, maximum=None):
+        """Return value, raising ValueError naming the key when it is below minimum, above maximum or not finite"""
+        if not math.isfinite(value):
+            raise ValueError(f"{name} = {value} must be a finite number")
+        if value < minimum or (value == minimum and not inclusive):
+            raise ValueError(f"{name} = {value} must be {'at least' if inclusive else 'greater than'} {minimum:g}")
+        if maximum is not None and value > maximum:
+            raise ValueError(f"{name} = {value} must be at most {maximum:g}")
+        return value
+
+    @staticmethod
+    def parse_bus_list(bus_list_str):
+        """Parse a "0,1,2" bus setting, falling back to bus 0"""
+        try:
+            buses = tuple(int(x.strip()) for x in bus_list_str.split(','))
+            for bus in buses:
+                if not 0 <= bus < BUS_COUNT:
+                    raise ValueError(f"bus {bus} is not between 0 and {BUS_COUNT - 1}")
+            return buses
+        except ValueError as e:
+            logclass.log(f"Invalid bus configuration: '{bus_list_str}' - {e}", 'error')
+            return (0,)
+
+    @property
+    def use_vban(self):
+        return self.backend == 'vban'
+
+    def rule_for(self, process_name):
+        """Return the application rule whose name is contained in the process name, if any"""
+        lowered = process_name.lower()
+        for rule in self.session_rules:
+            if rule.match in lowered:
+                return rule
+        return None
+
+    def profile_for(self, device_name):
+        """Return the device profile whose name is contained in the device name, if any"""
+        if not device_name:
+            return None
+        lowered = device_name.lower()
+        for profile in self.device_profiles:
+            if profile.match in lowered:
+                return profile
+        return None
+
+
+class SessionRecorder:
+    """Sync loop inputs saved to a compact binary file, for replaying the sync logic away from Windows and Voicemeeter.
+
+    Only readings that differ from the previous ones are kept: repeats can only decide 'idle'. The file is a
+    header (magic, wall clock start) followed by chunks of four arrays: seconds since start (double), Windows
+    volume (float), gain of the synced bus compared against Windows, the one that moved last (float, NaN while
+    disconnected) and that bus index (signed byte, -1 while disconnected). VCVMREC1 files have no bus array:
+    their gain is bus 0's.
+    """
+
+    MAGIC = b'VCVMREC2'
+    MAGIC_V1 = b'VCVMREC1'
+    HEADER = struct.Struct('<8sd')
+    CHUNK = struct.Struct('<I')
+
+    def __init__(self, path, chunk_size=4096):
+        self.path = path
+        self.chunk_size = chunk_size
+        self.file = open(path, 'wb')
+        self.file.write(self.HEADER.pack(self.MAGIC, time.time()))
+        self.start = time.monotonic()
+        self.times = array.array('d')
+        self.windows = array.array('f')
+        self.gains = array.array('f')
+        self.buses = array.array('b')
+        self.last = None
+        self.samples = 0
+
+    def record(self, windows_vol, vm_gain, bus):
+        sample = (windows_vol, vm_gain, bus)
+        if sample == self.last:
             return
-        self.log("Uncaught exception", level='error', exc_info=(exc_type, exc_value, exc_traceback))
-   
-        
+        self.last = sample
+        self.times.append(time.monotonic() - self.start)
+        self.windows.append(windows_vol)
+        self.gains.append(math.nan if vm_gain is None else vm_gain)
+        self.buses.append(-1 if vm_gain is None or bus is None else bus)
+        self.samples += 1
+        if len(self.times) >= self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        if not self.times:
+            return
+        self.file.write(self.CHUNK.pack(len(self.times)))
+        for values in (self.times, self.windows, self.gains, self.buses):
+            values.tofile(self.file)
+            del values[:]
+        self.file.flush()
+
+    def close(self):
+        self.flush()
+        self.file.close()
+
+    @classmethod
+    def read(cls, path):
+        """Return (wall clock start, times, windows volumes, gains, bus indexes) arrays of a recorded session"""
+        times, windows, gains, buses = array.array('d'), array.array('f'), array.array('f'), array.array('b')
+        with open(path, 'rb') as f:
+            magic, started = cls.HEADER.unpack(f.read(cls.HEADER.size))
+            if magic not in (cls.MAGIC, cls.MAGIC_V1):
+                raise ValueError(f"{path} is not a VCVM session recording")
+            columns = (times, windows, gains, buses) if magic == cls.MAGIC else (times, windows, gains)
+            while True:
+                header = f.read(cls.CHUNK.size)
+                if len(header) < cls.CHUNK.size:
+                    break
+                count, = cls.CHUNK.unpack(header)
+                for values in columns:
+                    values.fromfile(f, count)
+        if magic == cls.MAGIC_V1:
+            buses.extend(-1 if math.isnan(gain) else 0 for gain in gains)
+        return started, times, windows, gains, buses
+
+
+class SessionReplay:
+    """Runs a recorded session through SyncCore on a virtual clock, as fast as the decisions can be made.
+
+    Writes are applied directly (no ramps) and journaled like the live ones, so echo suppression behaves the same.
+    """
+
+    def __init__(self, settings):
+        self.settings = settings
+        self.now = 0.0
+        self.journal = WriteJournal(settings.echo_window, clock=lambda: self.now)
+        self.core = SyncCore(self.journal)
+        self.writes = []  # (seconds, decision, value)
+        self.decisions = collections.Counter()
+        self.latency = LatencyHistogram()
+
+    def run(self, times, windows, gains, buses):
+        settings = self.settings
+        curve = settings.curve
+        core = self.core
+        connected = False
+        if times:
+            core.last_windows_vol = windows[0]
+        started = time.perf_counter()
+        for now, windows_vol, vm_gain, bus in zip(times, windows, gains, buses):
+            self.now = now
+            tick_start = time.perf_counter()
+            if math.isnan(vm_gain):
+                connected = False
+                self.decisions['disconnected'] += 1
+                continue
+            if not connected:
+                # Same as the live loop after a (re)connect: take the mixer as it is
+                connected = True
+                core.last_vm_gain = vm_gain
+            decision, value = core.decide(windows_vol, vm_gain, settings, curve, bus)
+            if decision == 'windows->vm':
+                for synced_bus in settings.bus_list:
+                    self.journal.record(VoicemeeterVolumeSync.bus_key(synced_bus), value)
+                self.writes.append((now, decision, value))
+            elif decision == 'vm->windows':
+                self.journal.record('windows', value)
+                self.writes.append((now, decision, value))
+            core.settle(decision, windows_vol, vm_gain, value)
+            self.decisions[decision] += 1
+            self.latency.observe(time.perf_counter() - tick_start)
+        elapsed = time.perf_counter() - started
+        recorded = times[-1] - times[0] if times else 0
+        return {
+            'samples': len(times),
+            'recorded_seconds': round(recorded, 3),
+            'replay_seconds': round(elapsed, 3),
+            'speedup': round(recorded / elapsed) if elapsed > 0 else None,
+            'writes': len(self.writes),
+            'decisions': dict(self.decisions),
+            'decision_latency': self.latency.snapshot(),
+        }
+
+    @staticmethod
+    def main(args):
+        """VCVM --replay <session.vcvmrec> [--config <config.ini>] [--writes <out.csv>]"""
+        def option(name, default=None):
+            return args[args.index(name) + 1] if name in args and args.index(name) + 1 < len(args) else default
+
+        session = option('--replay')
+        config = configparser.ConfigParser()
+        config.read_dict(DEFAULT_CONFIG)
+        config.read(option('--config', VoicemeeterVolumeSync.get_data_path("config.ini")))
+        settings = Settings.from_config(config)
+        _, times, windows, gains, buses = SessionRecorder.read(session)
+        replay = SessionReplay(settings)
+        stats = replay.run(times, windows, gains, buses)
+        writes_path = option('--writes')
+        if writes_path:
+            with open(writes_path, 'w', encoding='utf-8') as f:
+                f.write("seconds,decision,value\n")
+                for now, decision, value in replay.writes:
+                    f.write(f"{now:.3f},{decision},{value}\n")
+        else:
+            for now, decision, value in replay.writes:
+                print(f"{now:10.3f}  {decision:12}  {value}")
+        print(json.dumps(stats, indent=2))
+        return 0
+
+
 class VoicemeeterVolumeSync:
-    def __init__(self):
-        self.vm_lock = threading.RLock()
+    def __init__(self, headless=False):
+        self.headless = headless  # no tray icon: pystray and PIL are never imported
+        self.stop_event = threading.Event()  # ends run() in headless mode
+        self.startup = None  # startup report, filled on the first synced tick
+        self.startup_report_exit = False  # --startup-report: print the report and quit after the first sync
+        self.startup_marks = [('imports', APP_STARTED + IMPORT_SECONDS)]  # (phase, perf_counter time it ended)
+        self.readiness = None  # ReadinessCoordinator while the sync thread waits for its dependencies
         self.vm_connected = False
         self.running = False
         self.connected = False
         self.vol_interface = None
-        self.last_windows_vol = 0
-        self.last_vm_gain = 0
-        self.last_change_time = 0
         self.sync_thread = None
         self.monitor_thread = None
         self.icon = None
+        self.pending_tray_image = None  # (key, image) set before the tray icon existed
         self.voicemeeter = None
+        self.vban = None
+        self.supervisor = None  # ConnectionSupervisor, owns the DLL login and reconnects
+        self.vm_logged_in = False
+        self.vm_resync = False  # set on (re)connect, the sync loop re-reads the mixer before comparing
+        self.loaded_dll_path = None
+        self.endpoint_factory = None  # callable returning a VolumeEndpoint, replaces the Windows endpoint when set
+        self.device_enumerator = None  # DeviceEnumerator, WindowsDeviceEnumerator is created on first use
+        self.device_watcher = None
+        self.device_id = None
+        self.device_name = None
+        self.endpoint_failed = False
+        self.endpoint_refresh_time = 0
+        self.bus_list = (0,)
+        self.icon_images = {}  # icon file name -> decoded image
+        self.volume_icons = {}  # (level, connected) -> rendered image
+        self.tray_icon_key = None
+        self.icon_connected = False
+        self.tray_icon_mode = 'status'
+        self.windows_ramp = None
+        self.bus_ramp = None
+        self.ramp_applied_vol = None
+        self.journal = WriteJournal()
+        self.core = SyncCore(self.journal)  # holds last_windows_vol / last_vm_gain
+        self.recorder = None  # SessionRecorder while [Logging] record is on
+        self.meter = None  # LevelMeter while [Metering] is enabled
+        self.level_rule = None
+        self.meter_base_gain = None  # synced bus gain before the level rule's reduction
+        self.meter_writes = collections.deque(maxlen=64)  # recent gains written by the level rule
+        self.meter_reduction = 0.0
+        self.volume_icon_steps = 20
+        self.volume_event = threading.Event()
+        self.volume_events_active = False
+        self.event_windows_vol = None
+        self.event_time = 0
+        self.scheduler = None
+        self.last_vm_result = 0  # last Voicemeeter DLL result code, kept for the trace
+        self.metrics = Metrics()
+        self.metrics.providers['sync'] = self.get_sync_state
+        self.vm_actor = VoicemeeterActor(self.metrics)  # the only thread calling into the DLL
+        self.metrics.providers['dll_actor'] = self.vm_actor.stats
+        # Bursts of volume steps (held volume key, mouse wheel) reach each backend at most max_rate times per second
+        self.bus_writes = WriteCoalescer("Bus", self.set_bus_gains, 30, self.volume_event)
+        self.windows_writes = WriteCoalescer("Windows", self.write_windows_volume, 30, self.volume_event)
+        self.metrics_server = None
+        self.control = None  # ControlServer
+        self.control_queue = queue.SimpleQueue()  # (kind, value, bus, submit time) for the sync loop
+        self.has_connected = False
+        self.vm_gain_cache = {}  # bus index -> gain, valid until Voicemeeter reports dirty parameters
+        self.dll_stats = {'dirty_checks': 0, 'param_reads': 0, 'reads_avoided': 0}
+        self.bus_gain_params = {}  # bus index -> pre-encoded "Bus[i].Gain" parameter name
+        self.last_written_gain = {}  # bus index -> last gain written by us
+        self.bus_mute_params = {}  # bus index -> pre-encoded "Bus[i].Mute" parameter name
+        self.last_written_mute = {}  # bus index -> last mute state written by us (VBAN cannot read it back)
+        self.bus_snapshot = None  # BusSnapshot of the synced buses from the last read pass
+        self.snapshot_dirty = True  # parameters changed since bus_snapshot was read
+        self.vm_bus = None  # synced bus whose gain moved last, the one compared against Windows
+        self.vm_mute_bus = None  # same for mute
+        self.windows_muted = False
+        self.session_watcher = None  # SessionWatcher while [Sessions] is enabled
+        self.session_source_factory = None  # callable returning a SessionSource, replaces the Windows one when set
+        self.strip_gains = {}  # strip index -> gain last read or written, for the mapped strips
+        self.strip_gain_params = {}  # strip index -> pre-encoded "Strip[i].Gain" parameter name
+        self.vm_dirty_count = 0  # times Voicemeeter reported changed parameters
+        self.strips_seen_dirty = -1  # vm_dirty_count when the strip gains were last read
+        self.vm_batch_writes = False
         self.base_dir = os.path.dirname(sys.executable) if getattr(sys, 'frozen', False) else os.path.dirname(os.path.abspath(__file__))
         self.config_file = self.get_data_path("config.ini")
         self.log_file = "VCVM.log"
+        self.settings = None  # Settings snapshot, replaced as a whole by load_config
+        self.curve = None  # VolumeCurve of the current device
+        self.config_lock = threading.Lock()
+        self.config_mtime = None
         self.config = configparser.ConfigParser()        
         self.load_config()
         
-        self.autostart_enabled = self.is_autostart_enabled()
-        self.load_tray_icon()
-        self.last_change_source = None  # Can be 'windows' or 'voicemeeter'        
+        self.autostart = AutostartManager()
+        if not headless:
+            # Autostart state is only shown in the tray menu
+            self.autostart.refresh_async(self.refresh_tray_menu)
+            self.load_tray_icon()
         # Check if we're starting up with the system
         self.is_startup_launch = self.detect_startup_launch()
         
+        self.mark_startup('init')
         logclass.log("Application initialized")
 
+    @property
+    def last_windows_vol(self):
+        return self.core.last_windows_vol
+
+    @last_windows_vol.setter
+    def last_windows_vol(self, volume):
+        self.core.last_windows_vol = volume
+
+    @property
+    def last_vm_gain(self):
+        return self.core.last_vm_gain
+
+    @last_vm_gain.setter
+    def last_vm_gain(self, gain):
+        self.core.last_vm_gain = gain
+
     def detect_startup_launch(self):
         """Detect if we're being launched at system startup"""
         # Check if we're within the first few minutes after boot
@@ -132,52 +3010,52 @@ class VoicemeeterVolumeSync:
         
         return False
 
-    def initialize_com(self):
-        """Initialize COM for audio operations"""
+    def wait_for_system_ready(self):
+        """Wait until the audio endpoint and Voicemeeter both answer, probing them in parallel"""
+        settings = self.settings
+        probes = {'audio': self.probe_audio}
+        if not self.vban:
+            probes['voicemeeter'] = self.probe_voicemeeter
+        if self.is_startup_launch:
+            logclass.log("Startup launch detected - waiting for the audio system and Voicemeeter...")
+        self.readiness = ReadinessCoordinator(probes, max_interval=settings.probe_max_interval,
+                                              timeout=settings.ready_timeout)
+        ready = self.readiness.wait(lambda: self.running)
+        readiness, self.readiness = self.readiness, None
+        for name, ready_at in sorted(readiness.ready_at.items(), key=lambda entry: entry[1]):
+            self.mark_startup(f"{name} ready", ready_at)
+        if ready:
+            logclass.log(f"System ready after {(time.perf_counter() - readiness.started) * 1000:.0f}ms "
+                         f"(probes: {dict(readiness.attempts)})")
+        elif self.running:
+            logclass.log(f"Not ready after {settings.ready_timeout:g}s ({', '.join(readiness.missing())}) - proceeding anyway", 'warning')
+
+    def probe_audio(self):
+        """Readiness probe (own thread): True once the default output device answers"""
+        if self.endpoint_factory:
+            return True
+        if self.device_enumerator is not None and not isinstance(self.device_enumerator, WindowsDeviceEnumerator):
+            return bool(self.device_enumerator.get_default()[0])
+        # A COM enumerator belongs to the apartment that made it: probe on one of our own
+        import comtypes
+        comtypes.CoInitialize()
         try:
-            import comtypes
-            comtypes.CoInitialize()
-            logclass.log("COM initialized successfully")
+            return bool(WindowsDeviceEnumerator().get_default()[0])
+        finally:
+            comtypes.CoUninitialize()
+
+    def probe_voicemeeter(self):
+        """Readiness probe: True once the supervisor is logged in, else have it retry now instead of backing off"""
+        if self.vm_connected:
             return True
-        except Exception as e:
-            logclass.log(f"Failed to initialize COM: {e}", 'error')
-            return False
-        
-    def wait_for_system_ready(self):
-        """Wait for system to be ready before connecting"""
-        if not self.is_startup_launch:
-            return
-        
-        startup_delay = self.config.getint('Startup', 'delay_seconds', fallback=5)
-        logclass.log(f"Startup launch detected - waiting {startup_delay}s for system to be ready...")
-        time.sleep(startup_delay)
-        
-        # Initialize COM first
-        if not self.initialize_com():
-            logclass.log("Failed to initialize COM - audio operations may fail", 'warning')
-        
-        # Additional checks to ensure audio system is ready
-        max_wait = 120  # Maximum 2 minutes additional wait
-        wait_interval = 5
-        waited = 0
-        
-        while waited < max_wait:
-            try:
-                # Try to initialize audio interface as a readiness test
-                devices = AudioUtilities.GetSpeakers()
-                if devices:
-                    self.update_tray_icon("icon_status_on.ico")
-                    logclass.log("Audio system appears ready")
-                    break
-            except Exception as e:
-                logclass.log(f"Audio system not ready yet: {e}")
-            
-            logclass.log(f"Waiting for audio system... ({waited}s/{max_wait}s)")
-            time.sleep(wait_interval)
-            waited += wait_interval
-        
-        if waited >= max_wait:
-            logclass.log("Maximum wait time reached - proceeding anyway", 'warning')
+        if self.supervisor:
+            self.supervisor.retry_now()
+        return False
+
+    def mark_startup(self, phase, at=None):
+        """Note the end of a startup phase for the timeline logged on the first sync"""
+        if self.startup is None:
+            self.startup_marks.append((phase, at if at is not None else time.perf_counter()))
 
     def get_resource_path(self, relative_path):
         """Get absolute path to resource, works for dev and for PyInstaller"""
@@ -187,7 +3065,8 @@ class VoicemeeterVolumeSync:
             base_path = os.path.abspath(".")
         return os.path.join(base_path, relative_path)
 
-    def get_data_path(self, filename):
+    @staticmethod
+    def get_data_path(filename):
         """Get path for data files that should be in the same directory as the exe"""
         if getattr(sys, 'frozen', False):
             exe_dir = os.path.dirname(sys.executable)
@@ -196,36 +3075,13 @@ class VoicemeeterVolumeSync:
         return os.path.join(exe_dir, filename)
     
     def load_config(self):
-        """Load configuration from config.ini"""
-        default_config = {
-            'Voicemeeter': {
-                'dll_path': r'c:\Program Files (x86)\VB\Voicemeeter\VoicemeeterRemote64.dll'
-            },
-            'Logging': {
-                'enabled': 'true',
-                'verbose': 'false',
-                'log_file': 'VCVM.log'
-            },
-            'Settings': {
-                'curve_power': '0.55',
-                'sync_interval': '0.3',
-                'change_timeout': '4',
-                'gain_threshold': '3.0',
-                'volume_threshold': '1',
-                'bus': '0'
-            },
-            'Startup': {
-                'delay_seconds': '5',
-                'max_retry_attempts': '5',
-                'retry_interval': '2'
-            }
-        }
-
+        """Load configuration from config.ini and swap in the parsed settings, return False if they were rejected"""
+        config = configparser.ConfigParser()
         if not os.path.exists(self.config_file):
-            self.config.read_dict(default_config)
+            config.read_dict(DEFAULT_CONFIG)
             try:
                 with open(self.config_file, 'w') as f:
-                    self.config.write(f)
+                    config.write(f)
                 print(f"Created default config file: {self.config_file}")
                 logclass.log(f"Created config file at: {self.config_file}")
             except Exception as e:
@@ -233,65 +3089,120 @@ class VoicemeeterVolumeSync:
                 logclass.log(f"Error creating config file: {e}", 'error')
         else:
             try:
-                self.config.read(self.config_file)
+                config.read(self.config_file)
                 logclass.log(f"Loaded config from: {self.config_file}")
             except Exception as e:
                 logclass.log(f"Error reading config file: {e}", 'error')
-                self.config.read_dict(default_config)  
+                config.read_dict(DEFAULT_CONFIG)  
             
             config_changed = False
-            for section, options in default_config.items():
-                if not self.config.has_section(section):
-                    self.config.add_section(section)
+            for section, options in DEFAULT_CONFIG.items():
+                if not config.has_section(section):
+                    config.add_section(section)
                     config_changed = True
                 for key, value in options.items():
-                    if not self.config.has_option(section, key):
-                        self.config.set(section, key, value)
+                    if not config.has_option(section, key):
+                        config.set(section, key, value)
                         config_changed = True
             
             if config_changed:
                 try:
                     with open(self.config_file, 'w') as f:
-                        self.config.write(f)
+                        config.write(f)
                     logclass.log("Updated config file with missing entries")
                 except Exception as e:
                     logclass.log(f"Error updating config file: {e}", 'error')
+        self.config_mtime = self.get_config_mtime()
+
+        try:
+            settings = Settings.from_config(config)
+        except ValueError as e:
+            if self.settings is not None:
+                logclass.log(f"Invalid value in {self.config_file}: {e} - keeping the current settings", 'error')
+                return False
+            logclass.log(f"Invalid value in {self.config_file}: {e} - using default settings", 'error')
+            config = configparser.ConfigParser()
+            config.read_dict(DEFAULT_CONFIG)
+            settings = Settings.from_config(config)
+        self.config = config
+        self.apply_settings(settings)
+        return True
 
-        logclass.logging_enabled = self.config.getboolean('Logging', 'enabled', fallback=True)
-        log_filename = self.config.get('Logging', 'log_file', fallback="VCVM.log")
-        logclass.log_file = self.get_data_path(log_filename)
+    def apply_settings(self, settings):
+        """Publish a new settings snapshot; the sync loop applies its own part on its next tick"""
+        previous = self.settings
+        logclass.logging_enabled = settings.logging_enabled
+        logclass.log_file = self.get_data_path(settings.log_file)
+        logclass.queued = settings.log_queued
+        logclass.trace.resize(settings.trace_size)
+        self.metrics.enabled = settings.metrics_enabled
+        self.tray_icon_mode = settings.icon_mode
+        if settings.volume_icon_steps != self.volume_icon_steps:
+            self.volume_icon_steps = settings.volume_icon_steps
+            self.volume_icons.clear()
+        self.tray_icon_key = None
         logclass.setup_logging()
 
-        self.logging_verbose = self.config.getboolean('Logging', 'verbose', fallback=False)
+        self.logging_verbose = settings.verbose
+        logclass.verbose_enabled = self.logging_verbose
+        self.settings = settings
+        if previous is None:
+            self.apply_device_profile(self.device_name)
+            return
+        if settings.http_port != previous.http_port and self.metrics_server:
+            self.stop_metrics_server()
+            self.start_metrics_server()
+        if (settings.control_enabled, settings.control_port) != (previous.control_enabled, previous.control_port):
+            self.stop_control_server()
+            self.start_control_server()
+        self.volume_event.set()
+
+    def get_config_mtime(self):
+        try:
+            return os.stat(self.config_file).st_mtime_ns
+        except OSError:
+            return None
+
+    def reload_config(self):
+        """Re-read config.ini; the running sync picks the new settings up without restarting"""
+        with self.config_lock:
+            if self.load_config():
+                logclass.log("Settings reloaded")
+
+    def check_config_file(self):
+        """Reload when config.ini was modified since it was last read"""
+        mtime = self.get_config_mtime()
+        if mtime is not None and mtime != self.config_mtime:
+            logclass.log("config.ini changed on disk")
+            self.reload_config()
 
     def save_config(self):
         """Save current configuration to file"""
         try:
-            with open(self.config_file, 'w') as f:
-                self.config.write(f)
+            with self.config_lock:
+                with open(self.config_file, 'w') as f:
+                    self.config.write(f)
+                # Our own write: not a change to reload
+                self.config_mtime = self.get_config_mtime()
         except Exception as e:
             print(f"Error saving config: {e}")
 
     def load_voicemeeter_dll(self):
-        """Load the Voicemeeter DLL with retry"""
-        dll_path = self.config.get('Voicemeeter', 'dll_path')
-        max_attempts = 5
-        for attempt in range(max_attempts):
-            try:
-                if os.path.exists(dll_path):
-                    self.voicemeeter = ctypes.WinDLL(dll_path)
-                    self._setup_vm_prototypes()
-                    logclass.log(f"Loaded Voicemeeter DLL from: {dll_path} (attempt {attempt+1})")
-                    return
-                else:
-                    logclass.log(f"Voicemeeter DLL not found at: {dll_path}", 'error')
-                    break
-            except Exception as e:
-                logclass.log(f"Failed to load Voicemeeter DLL (attempt {attempt+1}): {e}", 'error')
-                time.sleep(2)
-
-        self.voicemeeter = None
-        logclass.log("Giving up on loading Voicemeeter DLL after retries", 'error')
+        """Load the Voicemeeter DLL and set up its prototypes, returning the handle or None"""
+        dll_path = self.settings.dll_path
+        if not os.path.exists(dll_path):
+            logclass.log(f"Voicemeeter DLL not found at: {dll_path}", 'error')
+            return None
+        try:
+            self.voicemeeter = ctypes.WinDLL(dll_path)
+            self._setup_vm_prototypes()
+        except Exception as e:
+            logclass.log(f"Failed to load Voicemeeter DLL: {e}", 'error')
+            self.voicemeeter = None
+            return None
+        self.loaded_dll_path = dll_path
+        logclass.log(f"Loaded Voicemeeter DLL from: {dll_path}")
+        return self.voicemeeter
 
     def _setup_vm_prototypes(self):
         # return types
@@ -299,12 +3210,23 @@ class VoicemeeterVolumeSync:
         self.voicemeeter.VBVMR_Logout.restype = ctypes.c_long
         self.voicemeeter.VBVMR_GetParameterFloat.restype = ctypes.c_long
         self.voicemeeter.VBVMR_SetParameterFloat.restype = ctypes.c_long
+        self.voicemeeter.VBVMR_IsParametersDirty.restype = ctypes.c_long
         # arg types
         self.voicemeeter.VBVMR_GetParameterFloat.argtypes = [ctypes.c_char_p, ctypes.POINTER(ctypes.c_float)]
         self.voicemeeter.VBVMR_SetParameterFloat.argtypes = [ctypes.c_char_p, ctypes.c_float]
+        self.voicemeeter.VBVMR_IsParametersDirty.argtypes = []
+        self.voicemeeter.VBVMR_GetLevel.restype = ctypes.c_long
+        self.voicemeeter.VBVMR_GetLevel.argtypes = [ctypes.c_long, ctypes.c_long, ctypes.POINTER(ctypes.c_float)]
+        # multi-parameter script, not exported by very old Remote API versions
+        self.vm_batch_writes = hasattr(self.voicemeeter, 'VBVMR_SetParameters')
+        if self.vm_batch_writes:
+            self.voicemeeter.VBVMR_SetParameters.restype = ctypes.c_long
+            self.voicemeeter.VBVMR_SetParameters.argtypes = [ctypes.c_char_p]
         
     def load_tray_icon(self):
         """Load the tray icon image"""
+        from PIL import Image, ImageDraw
+        self.preload_status_icons()
         try:
             icon_path = self.get_resource_path("icon.ico")
             if os.path.exists(icon_path):
@@ -328,44 +3250,88 @@ class VoicemeeterVolumeSync:
             d.arc((44, 18, 60, 46), start=300, end=60, fill=(255, 255, 255, 100), width=2)
             logclass.log("Generated fallback tray icon (speaker symbol)")
 
+    def use_vban(self):
+        """True when Voicemeeter is driven over the network instead of the local DLL"""
+        return self.settings.use_vban
+
+    def connect_vban(self):
+        """Open the VBAN-TEXT backend (write-only, no login round-trip)"""
+        settings = self.settings
+        host, port, stream_name, max_rate = settings.vban_host, settings.vban_port, settings.vban_stream, settings.vban_max_rate
+        try:
+            if self.vban is None:
+                self.vban = VbanTextBackend(host, port, stream_name, max_rate)
+        except OSError as e:
+            logclass.log(f"Failed to open VBAN-TEXT socket: {e}", 'error')
+            self.vm_connected = False
+            return False
+        self.vm_connected = True
+        self.last_written_gain.clear()
+        logclass.log(f"Sending VBAN-TEXT to {host}:{port} stream '{stream_name}' (Voicemeeter -> Windows sync unavailable in this mode)")
+        return True
+
     def connect_voicemeeter(self):
-        """Connect to Voicemeeter API with enhanced retry logic"""
-        self.load_voicemeeter_dll()
-        if not self.voicemeeter:
-            logclass.log("Voicemeeter DLL not loaded", 'error')
+        """Start connecting to Voicemeeter; the supervisor logs in and reconnects in the background"""
+        if self.use_vban():
+            return self.connect_vban()
+
+        if self.supervisor is None:
+            self.supervisor = ConnectionSupervisor(self.load_voicemeeter_dll, self.try_vm_login,
+                                                   self.on_vm_connection_changed)
+        self.supervisor.min_delay = self.settings.reconnect_min_delay
+        self.supervisor.max_delay = self.settings.reconnect_max_delay
+        self.supervisor.start()
+        return True
+
+    def try_vm_login(self, dll):
+        """One connection attempt from the supervisor thread: log in once, then check Voicemeeter answers"""
+        if not self.vm_logged_in:
+            self.metrics.incr('vm_login_attempts')
+            res = self.vm_call('dll.Login', dll.VBVMR_Login)
+            if res not in (0, 1):
+                logclass.log(f"VBVMR_Login failed (code: {res} - {self.get_voicemeeter_error_message(res)})")
+                return False
+            # 1: logged in but Voicemeeter is not running yet, the login stays valid once it starts
+            self.vm_logged_in = True
+        result = self.vm_call('dll.IsParametersDirty', dll.VBVMR_IsParametersDirty)
+        self.last_vm_result = result
+        if result < 0:
+            if self.logging_verbose:
+                logclass.log(f"Voicemeeter not answering (code: {result})")
             return False
+        return True
+
+    def on_vm_connection_changed(self, connected):
+        """Connection state published by the supervisor"""
+        self.vm_connected = connected
+        if connected:
+            if self.has_connected:
+                self.metrics.incr('vm_reconnects')
+            self.has_connected = True
+            self.vm_gain_cache.clear()
+            self.snapshot_dirty = True
+            self.last_written_gain.clear()
+            self.vm_resync = True
+            if self.readiness:
+                self.readiness.notify()
+            logclass.log(f"Connected to Voicemeeter (attempt {self.supervisor.attempts})")
+            self.update_tray_icon("icon_status_on.ico")
+        else:
+            logclass.log("Lost connection to Voicemeeter - reconnecting in the background", 'warning')
+            self.update_tray_icon("icon_status_off.ico")
+        self.publish_state('connection')
+        self.volume_event.set()
 
-        max_attempts = self.config.getint('Startup', 'max_retry_attempts', fallback=5)
-        retry_interval = self.config.getint('Startup', 'retry_interval', fallback=2)
-        
-        for attempt in range(max_attempts):
-            try:
-                with self.vm_lock:
-                    res = self.voicemeeter.VBVMR_Login()
-                if res == 0:
-                    self.vm_connected = True
-                    logclass.log(f"Connected to Voicemeeter on attempt {attempt+1}")
-                    return True
-                else:
-                    error_msg = self.get_voicemeeter_error_message(res)
-                    logclass.log(f"VBVMR_Login failed (code: {res} - {error_msg}), attempt {attempt+1}/{max_attempts}")
-                    
-                    # For startup launches, wait longer between attempts
-                    wait_time = retry_interval if self.is_startup_launch else 2
-                    if attempt < max_attempts - 1:  # Don't wait after the last attempt
-                        logclass.log(f"Waiting {wait_time}s before retry...")
-                        time.sleep(wait_time)
-                        
-            except Exception as e:
-                logclass.log(f"Exception in VBVMR_Login: {e}", 'error')
-                if attempt < max_attempts - 1:
-                    wait_time = retry_interval if self.is_startup_launch else 2
-                    time.sleep(wait_time)
+    def report_vm_lost(self):
+        """A DLL call failed or returned an error: let the supervisor reconnect"""
+        if self.supervisor:
+            self.supervisor.report_lost()
+        else:
+            self.vm_connected = False
 
-        logclass.log(f"Failed to connect to Voicemeeter after {max_attempts} attempts", 'error')
-        self.update_tray_icon("icon_status_off.ico")      
-        self.vm_connected = False        
-        return False
+    def vm_call(self, name, func, *args, key=None):
+        """Run func(*args) on the DLL actor thread and wait for the result; a keyed write supersedes a queued one"""
+        return self.vm_actor.call(name, func, *args, key=key)
 
     def get_voicemeeter_error_message(self, error_code):
         """Get human-readable error message for Voicemeeter error codes"""
@@ -383,72 +3349,551 @@ class VoicemeeterVolumeSync:
 
     def disconnect_voicemeeter(self):
         """Disconnect from Voicemeeter API"""
-        if not self.voicemeeter:
+        if self.vban:
+            self.vban.close()
+            logclass.log(f"Closed VBAN-TEXT backend: {self.vban.stats}")
+            self.vban = None
+            self.vm_connected = False
+        if self.supervisor:
+            self.supervisor.stop()
+            self.supervisor.connected = False
+        self.vm_connected = False
+        if not self.voicemeeter or not self.vm_logged_in:
             return
         try:
-            with self.vm_lock:
-                self.voicemeeter.VBVMR_Logout()
-                logclass.log("Disconnected from Voicemeeter")
+            self.vm_call('dll.Logout', self.voicemeeter.VBVMR_Logout)
+            logclass.log("Disconnected from Voicemeeter")
         except Exception as e:
             logclass.log(f"Error disconnecting from Voicemeeter: {e}", 'error')
         finally:
-            self.vm_connected = False
+            self.vm_logged_in = False
+            self.vm_actor.stop()
+
+    @staticmethod
+    def bus_key(bus_index):
+        """Write journal key of a bus gain"""
+        return ('bus', bus_index)
+
+    def bus_gain_param(self, bus_index):
+        """Encoded "Bus[i].Gain" parameter name, built once per bus"""
+        param_name = self.bus_gain_params.get(bus_index)
+        if param_name is None:
+            param_name = f"Bus[{bus_index}].Gain".encode("utf-8")
+            self.bus_gain_params[bus_index] = param_name
+        return param_name
+
+    def bus_mute_param(self, bus_index):
+        """Encoded "Bus[i].Mute" parameter name, built once per bus"""
+        param_name = self.bus_mute_params.get(bus_index)
+        if param_name is None:
+            param_name = f"Bus[{bus_index}].Mute".encode("utf-8")
+            self.bus_mute_params[bus_index] = param_name
+        return param_name
+
+    def set_bus_mutes(self, muted):
+        """Mute or unmute every synced bus in a single VBVMR_SetParameters call (one call per bus without it)"""
+        value = 1 if muted else 0
+        params = {bus: self.bus_mute_param(bus) for bus in self.bus_list}
+        if self.vban:
+            self.vban.set_parameters({param: value for param in params.values()})
+            self.last_written_mute.update((bus, bool(muted)) for bus in params)
+            return 0
+        if not self.voicemeeter:
+            return None
+        script = b";".join(param + b"=%d" % value for param in params.values())
+        try:
+            if self.vm_batch_writes:
+                result = self.vm_call('dll.SetParameters', self.voicemeeter.VBVMR_SetParameters, ctypes.c_char_p(script),
+                                      key=tuple(params.values()))
+            else:
+                # Remote API without VBVMR_SetParameters: one call per bus
+                result = 0
+                for param in params.values():
+                    result = self.vm_call('dll.SetParameterFloat', self.voicemeeter.VBVMR_SetParameterFloat,
+                                          ctypes.c_char_p(param), ctypes.c_float(value), key=(param,)) or result
+        except Exception as e:
+            logclass.log(f"Error setting bus mute: {e}", 'error')
+            self.report_vm_lost()
+            return None
+        self.last_vm_result = result
+        if result == 0:
+            self.snapshot_dirty = True
+            for bus in params:
+                self.last_written_mute[bus] = bool(muted)
+                self.journal.record(('mute', bus), bool(muted))
+        else:
+            logclass.log(f"Setting bus mute failed (code: {result}) for: {script.decode()}", 'error')
+        return result
+
+    def strip_gain_param(self, strip):
+        """Encoded "Strip[i].Gain" parameter name, built once per strip"""
+        param_name = self.strip_gain_params.get(strip)
+        if param_name is None:
+            param_name = f"Strip[{strip}].Gain".encode("utf-8")
+            self.strip_gain_params[strip] = param_name
+        return param_name
+
+    def set_strip_gains(self, gains):
+        """Write {strip: gain} in a single VBVMR_SetParameters call"""
+        params = {self.strip_gain_param(strip): gain for strip, gain in gains.items()}
+        if self.vban:
+            self.vban.set_parameters(params)
+            self.strip_gains.update(gains)
+            return 0
+        if not self.voicemeeter:
+            return None
+        try:
+            if self.vm_batch_writes:
+                script = b";".join(param + b"=%.2f" % gain for param, gain in params.items())
+                result = self.vm_call('dll.SetParameters', self.voicemeeter.VBVMR_SetParameters, ctypes.c_char_p(script),
+                                      key=tuple(params))
+            else:
+                result = 0
+                for param, gain in params.items():
+                    result = self.vm_call('dll.SetParameterFloat', self.voicemeeter.VBVMR_SetParameterFloat,
+                                          ctypes.c_char_p(param), ctypes.c_float(gain), key=(param,)) or result
+        except Exception as e:
+            logclass.log(f"Error setting strip gains: {e}", 'error')
+            self.report_vm_lost()
+            return None
+        self.last_vm_result = result
+        if result == 0:
+            # Read back as the current value, so our own write is not taken for a fader move
+            self.strip_gains.update(gains)
+        else:
+            logclass.log(f"Setting strip gains {gains} failed (code: {result})", 'error')
+        return result
+
+    @staticmethod
+    def read_parameters(get_parameter, params):
+        """Actor thread: read float parameters back to back, stopping at the first error"""
+        value = ctypes.c_float()
+        ref = ctypes.byref(value)
+        values = []
+        for param in params:
+            result = get_parameter(param, ref)
+            if result != 0:
+                return result, values
+            values.append(value.value)
+        return 0, values
+
+    def sync_sessions(self, settings):
+        """Sync thread: mapped app session volumes to their strips, and strip fader moves back to the sessions"""
+        watcher = self.session_watcher
+        changed = False
+        targets = {}
+        for key, (rule, volume) in watcher.take_changes().items():
+            targets[rule.strip] = round(rule.curve.volume_to_gain(volume), 2)
+        if targets:
+            self.set_strip_gains(targets)
+            self.metrics.incr('sessions.windows_to_vm', len(targets))
+            logclass.verbose("App volume changed: strip gains %s", targets)
+            changed = True
+        if self.vban or self.vm_dirty_count == self.strips_seen_dirty:
+            return changed
+        # Voicemeeter reported changes since the last read: check the mapped strips' faders
+        strips = watcher.strips()
+        if not strips:
+            # Nothing mapped yet: read once there is, or the first fader move would only set the baseline
+            return changed
+        self.strips_seen_dirty = self.vm_dirty_count
+        try:
+            result, gains = self.vm_call('dll.strips', self.read_parameters, self.voicemeeter.VBVMR_GetParameterFloat,
+                                         [self.strip_gain_param(strip) for strip in strips])
+        except Exception as e:
+            logclass.log(f"Error reading strip gains: {e}", 'error')
+            return changed
+        if result != 0:
+            return changed
+        for strip, gain in zip(strips, gains):
+            previous = self.strip_gains.get(strip)
+            self.strip_gains[strip] = gain
+            if previous is None or abs(gain - previous) < settings.gain_threshold:
+                continue
+            keys = watcher.keys_for(strip)
+            rule = watcher.sessions[keys[0]][1] if keys else None
+            if rule is None:
+                continue
+            volume = rule.curve.gain_to_volume(gain)
+            watcher.set_volume(keys, volume)
+            self.metrics.incr('sessions.vm_to_windows')
+            logclass.verbose("Strip %s gain changed: %sdB → app volume %s%%", strip, gain, volume)
+            changed = True
+        return changed
+
+    def start_session_watcher(self):
+        """Follow the mapped application sessions of the output device on a background thread"""
+        settings = self.settings
+        if self.session_watcher or not settings.session_sync:
+            return
+        if not settings.session_rules:
+            logclass.log("[Sessions] is enabled but there is no [App:<name>] section", 'warning')
+            return
+        source = self.session_source_factory() if self.session_source_factory else WindowsSessionSource()
+        self.strip_gains.clear()
+        self.strips_seen_dirty = -1
+        self.session_watcher = SessionWatcher(source, settings.rule_for, settings.session_refresh,
+                                              settings.event_fallback_poll, self.volume_event)
+        self.session_watcher.start()
+
+    def stop_session_watcher(self):
+        if self.session_watcher:
+            self.session_watcher.stop()
+            self.session_watcher = None
+
+    def read_bus_snapshot(self):
+        """Gain and mute of every synced bus in one actor request, reused as is while Voicemeeter reports no change"""
+        buses = tuple(self.bus_list)
+        previous = self.bus_snapshot
+        if self.vban:
+            # VBAN-TEXT cannot read back: report what we sent
+            return BusSnapshot(buses, [self.last_written_gain.get(bus, self.last_vm_gain) for bus in buses],
+                               [self.last_written_mute.get(bus, False) for bus in buses])
+        if not self.voicemeeter:
+            return None
+        if previous is not None and not self.snapshot_dirty and previous.buses == buses:
+            self.dll_stats['reads_avoided'] += 2 * len(buses)
+            return previous
+        params = [(self.bus_gain_param(bus), self.bus_mute_param(bus)) for bus in buses]
+        try:
+            result, gains, mutes = self.vm_call('dll.snapshot', self.read_bus_parameters,
+                                                self.voicemeeter.VBVMR_GetParameterFloat, params)
+        except Exception as e:
+            logclass.log(f"Error reading bus parameters: {e}", 'error')
+            self.report_vm_lost()
+            return None
+        self.dll_stats['param_reads'] += len(gains) + len(mutes)
+        self.last_vm_result = result
+        if result != 0:
+            self.report_vm_lost()
+            return None
+        snapshot = BusSnapshot(buses, gains, mutes)
+        self.vm_gain_cache.update(zip(buses, snapshot.gains))
+        self.snapshot_dirty = False
+        return snapshot
+
+    @staticmethod
+    def read_bus_parameters(get_parameter, params):
+        """Actor thread: read [(gain param, mute param)] back to back, stopping at the first error"""
+        value = ctypes.c_float()
+        ref = ctypes.byref(value)
+        gains = []
+        mutes = []
+        for gain_param, mute_param in params:
+            result = get_parameter(gain_param, ref)
+            if result != 0:
+                return result, gains, mutes
+            gains.append(value.value)
+            result = get_parameter(mute_param, ref)
+            if result != 0:
+                return result, gains, mutes
+            mutes.append(value.value >= 0.5)
+        return 0, gains, mutes
+
+    def track_bus_snapshot(self, snapshot):
+        """Take a new snapshot, following the synced bus that moved last; return (its gain, its mute state)"""
+        previous = self.bus_snapshot
+        self.bus_snapshot = snapshot
+        if not snapshot.same_as(previous):
+            if previous is not None and previous.buses != snapshot.buses:
+                # Bus list changed (device profile, config reload): take the new buses as they are
+                self.vm_resync = True
+            gains, mutes = snapshot.changed(previous)
+            if gains or self.vm_bus not in snapshot.buses:
+                self.vm_bus = gains[0] if gains else snapshot.buses[0]
+            if mutes or self.vm_mute_bus not in snapshot.buses:
+                self.vm_mute_bus = mutes[0] if mutes else snapshot.buses[0]
+        return snapshot.gain(self.vm_bus), snapshot.muted(self.vm_mute_bus)
 
     def set_bus_gain(self, bus_index, gain_db):
         """Set gain for a specific bus"""
+        if self.vban:
+            self.set_bus_gains({bus_index: gain_db})
+            return
         if not self.voicemeeter:
             return
         try:
-            param_name = f"Bus[{bus_index}].Gain".encode("utf-8")
-            with self.vm_lock:
-                self.voicemeeter.VBVMR_SetParameterFloat(ctypes.c_char_p(param_name), ctypes.c_float(gain_db))
+            param_name = self.bus_gain_param(bus_index)
+            self.vm_call('dll.SetParameterFloat', self.voicemeeter.VBVMR_SetParameterFloat,
+                         ctypes.c_char_p(param_name), ctypes.c_float(gain_db), key=(param_name,))
+            self.vm_gain_cache.pop(bus_index, None)
+            self.snapshot_dirty = True
+            self.last_written_gain[bus_index] = gain_db
+            self.journal.record(self.bus_key(bus_index), gain_db)
         except Exception as e:
             logclass.log(f"Error setting bus {bus_index} gain: {e}", 'error')
-            self.vm_connected = False
+            self.report_vm_lost()
+
+    def set_bus_gains(self, gains):
+        """Write {bus: gain} in a single VBVMR_SetParameters call, skipping buses already at that value"""
+        if not self.voicemeeter and not self.vban:
+            return None
+        pending = [(bus, gain) for bus, gain in gains.items() if self.last_written_gain.get(bus) != gain]
+        if not pending:
+            return 0
+        if self.vban:
+            self.vban.set_parameters({self.bus_gain_param(bus): gain for bus, gain in pending})
+            self.last_written_gain.update(pending)
+            return 0
+        if not self.vm_batch_writes:
+            for bus, gain in pending:
+                self.set_bus_gain(bus, gain)
+            return 0
+        script = b";".join(self.bus_gain_param(bus) + b"=%.2f" % gain for bus, gain in pending)
+        try:
+            # Keyed by the parameters written, so a newer write still queued replaces this one
+            result = self.vm_call('dll.SetParameters', self.voicemeeter.VBVMR_SetParameters, ctypes.c_char_p(script),
+                                  key=tuple(self.bus_gain_param(bus) for bus, _ in pending))
+        except Exception as e:
+            logclass.log(f"Error setting bus gains: {e}", 'error')
+            self.report_vm_lost()
+            return None
+        self.last_vm_result = result
+        if result == 0:
+            for bus, gain in pending:
+                self.vm_gain_cache.pop(bus, None)
+                self.snapshot_dirty = True
+                self.last_written_gain[bus] = gain
+                self.journal.record(self.bus_key(bus), gain)
+        else:
+            logclass.log(f"VBVMR_SetParameters failed (code: {result}) for script: {script.decode()}", 'error')
+        return result
 
 
-    def get_bus_gain(self, bus_index):
-        """Get gain for a specific bus"""
+    def poll_vm_dirty(self):
+        """Ask Voicemeeter whether any parameter changed since the last call, dropping cached reads if so"""
+        if self.vban:
+            return False
+        if not self.voicemeeter:
+            return True
+        try:
+            result = self.vm_call('dll.IsParametersDirty', self.voicemeeter.VBVMR_IsParametersDirty)
+            self.dll_stats['dirty_checks'] += 1
+        except Exception as e:
+            logclass.log(f"Error checking Voicemeeter parameters: {e}", 'error')
+            result = -1
+        self.last_vm_result = result
+        # 0: unchanged, 1: changed, negative: error (not connected...) - only trust the cache on 0
+        if result != 0:
+            self.vm_dirty_count += 1
+            self.vm_gain_cache.clear()
+            self.snapshot_dirty = True
+        return result != 0
+
+    def get_bus_gain(self, bus_index, use_cache=True):
+        """Get gain for a specific bus, served from the cache while parameters are not dirty"""
+        if self.vban:
+            # VBAN-TEXT cannot read back: report what we sent so no mixer-side change is ever seen
+            return self.last_written_gain.get(bus_index, self.last_vm_gain)
         if not self.voicemeeter:
             return None
+        if use_cache and bus_index in self.vm_gain_cache:
+            self.dll_stats['reads_avoided'] += 1
+            return self.vm_gain_cache[bus_index]
         try:
             param_name = f"Bus[{bus_index}].Gain".encode("utf-8")
             gain = ctypes.c_float()
-            with self.vm_lock:
-                result = self.voicemeeter.VBVMR_GetParameterFloat(ctypes.c_char_p(param_name), ctypes.byref(gain))
+            result = self.vm_call('dll.GetParameterFloat', self.voicemeeter.VBVMR_GetParameterFloat,
+                                  ctypes.c_char_p(param_name), ctypes.byref(gain))
+            self.dll_stats['param_reads'] += 1
+            self.last_vm_result = result
             """return gain.value if result == 0 else None"""
             if result == 0:
-                self.vm_connected = True
+                self.vm_gain_cache[bus_index] = gain.value
                 return gain.value
             else:
-                self.vm_connected = False
+                self.report_vm_lost()
                 return None
         except Exception as e:
-            self.vm_connected = False            
+            self.report_vm_lost()
             logclass.log(f"Error getting bus {bus_index} gain: {e}", 'error')
             return None
 
+    def get_dll_stats_text(self):
+        """Summary of Voicemeeter parameter reads served by the DLL vs. the dirty-check cache"""
+        stats = self.dll_stats
+        total = stats['param_reads'] + stats['reads_avoided']
+        avoided_pct = stats['reads_avoided'] / total * 100 if total else 0
+        return (f"DLL stats: {stats['param_reads']} parameter reads, {stats['reads_avoided']} served from cache "
+                f"({avoided_pct:.1f}% avoided), {stats['dirty_checks']} dirty checks")
+
+    def get_write_stats_text(self):
+        """Summary of the writes the coalescing stage let through vs. dropped for a newer value"""
+        parts = []
+        for name, coalescer in (('bus', self.bus_writes), ('Windows', self.windows_writes)):
+            stats = coalescer.stats
+            parts.append(f"{stats['written']} {name} writes, {stats['superseded']} superseded")
+        return "Write stats: " + ", ".join(parts)
+
+    def get_sync_state(self):
+        """Current sync state for the metrics snapshot"""
+        return {
+            'vm_connected': self.vm_connected,
+            'backend': 'vban' if self.vban else 'dll',
+            'volume_events': self.volume_events_active,
+            'windows_volume': self.last_windows_vol,
+            'vm_gain': self.last_vm_gain,
+            'windows_muted': self.windows_muted,
+            'buses': self.bus_snapshot.to_dict() if self.bus_snapshot else None,
+            'dll_stats': dict(self.dll_stats),
+            'writes': {'buses': self.bus_writes.snapshot(), 'windows': self.windows_writes.snapshot()},
+            'vban': dict(self.vban.stats) if self.vban else None,
+            'scheduler': self.scheduler.stats() if self.scheduler else None,
+            'levels_db': {bus: [round(rms, 1), round(peak, 1)] for bus, (rms, peak) in self.meter.levels.items()} if self.meter else None,
+            'level_reduction_db': round(self.meter_reduction, 2),
+            'sessions': self.session_watcher.state() if self.session_watcher else None,
+        }
+
+    def start_metrics_server(self):
+        """Serve the metrics snapshot as JSON on http://127.0.0.1:<http_port>/metrics"""
+        port = self.settings.http_port
+        if self.metrics_server or port <= 0:
+            return
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        metrics = self.metrics
+
+        class MetricsRequestHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.rstrip('/') not in ('', '/metrics'):
+                    self.send_error(404)
+                    return
+                body = metrics.to_json().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        try:
+            self.metrics_server = ThreadingHTTPServer(('127.0.0.1', port), MetricsRequestHandler)
+            self.metrics_server.daemon_threads = True
+        except OSError as e:
+            logclass.log(f"Failed to start metrics endpoint on port {port}: {e}", 'error')
+            return
+        threading.Thread(target=self.metrics_server.serve_forever, name="MetricsServer", daemon=True).start()
+        logclass.log(f"Metrics available at http://127.0.0.1:{port}/metrics")
+
+    def stop_metrics_server(self):
+        if self.metrics_server:
+            self.metrics_server.shutdown()
+            self.metrics_server.server_close()
+            self.metrics_server = None
+
+    def write_metrics_snapshot(self):
+        """Write the metrics snapshot to VCVM_metrics.json next to the config file"""
+        path = self.get_data_path("VCVM_metrics.json")
+        try:
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(self.metrics.to_json())
+            logclass.log(f"Metrics snapshot written to {path}")
+        except Exception as e:
+            logclass.log(f"Failed to write metrics snapshot: {e}", 'error')
+
+    def start_control_server(self):
+        """Serve the control protocol on 127.0.0.1:<port>, return False when the port is already taken"""
+        settings = self.settings
+        if self.control or not settings.control_enabled or settings.control_port <= 0:
+            return True
+        control = ControlServer(settings.control_port, self.submit_control, self.get_control_state)
+        if not control.start():
+            logclass.log(f"Control port {settings.control_port} is already in use - control server disabled", 'error')
+            return False
+        self.control = control
+        logclass.log(f"Control server listening on 127.0.0.1:{settings.control_port}")
+        return True
+
+    def stop_control_server(self):
+        if self.control:
+            self.control.stop()
+            self.control = None
+
+    def submit_control(self, kind, value, bus):
+        """Control connection thread: queue the change and wake the sync loop"""
+        self.metrics.incr('control.commands')
+        self.control_queue.put((kind, value, bus, time.perf_counter()))
+        self.volume_event.set()
+
+    def windows_volume_target(self):
+        """Where the Windows volume is heading: the ramp target while ramping, else the last known volume"""
+        ramp = self.windows_ramp
+        if ramp and ramp.active:
+            return int(round(ramp.target))
+        return self.last_windows_vol
+
+    def get_control_state(self):
+        return {
+            'volume': self.windows_volume_target(),
+            'gain': self.last_vm_gain,
+            'muted': self.windows_muted,
+            'buses': list(self.bus_list),
+            'connected': self.vm_connected,
+            'device': self.device_name,
+        }
+
+    def publish_state(self, source):
+        """Send the current state to control subscribers"""
+        if self.control:
+            event = self.get_control_state()
+            event['source'] = source
+            self.control.publish(event)
+
+    def run_control_commands(self):
+        """Sync thread: apply queued control changes to both sides at once, so neither reports it back as a change"""
+        while True:
+            try:
+                kind, value, bus, submitted = self.control_queue.get_nowait()
+            except queue.Empty:
+                return
+            try:
+                volume = self.apply_control_command(kind, value, bus)
+            except Exception as e:
+                # A bad command is that client's problem: never the sync loop's error and reconnect path
+                logclass.log(f"Control command {kind} {value} {bus} failed: {e}", 'error')
+                continue
+            logclass.trace.record(volume, self.last_vm_gain, 'control', f"{kind} {value} {bus}")
+            self.metrics.observe('control.latency', time.perf_counter() - submitted)
+            self.publish_state('control')
+
+    def apply_control_command(self, kind, value, bus):
+        """Write one control change, return the Windows volume it set (None for a bus outside the sync)"""
+        if kind == 'gain' and bus is not None and bus not in self.bus_list:
+            # A bus outside the sync: just write it
+            volume = None
+            self.bus_writes.submit({bus: round(value, 2)})
+        else:
+            if kind == 'gain':
+                gain = round(value, 2)
+                volume = self.map_gain_to_volume(gain)
+            else:
+                volume = value if kind == 'volume' else self.windows_volume_target() + value
+                volume = max(0, min(100, int(round(volume))))
+                gain = self.map_volume_to_gain(volume)
+            if self.bus_ramp:
+                self.bus_ramp.set_target(gain, self.last_vm_gain)
+            else:
+                self.bus_writes.submit({b: gain for b in self.bus_list})
+            if self.windows_ramp:
+                # Ramp steps move last_windows_vol along, the endpoint still reports the old volume until then
+                self.ramp_applied_vol = self.last_windows_vol
+                self.windows_ramp.set_target(volume, self.last_windows_vol)
+            else:
+                self.windows_writes.submit({'windows': volume})
+                self.last_windows_vol = volume
+            self.last_vm_gain = gain
+            self.update_volume_icon(volume)
+            self.scheduler.mark_active()
+        return volume
+
     def map_volume_to_gain(self, volume):
         """Convert Windows volume percentage to Voicemeeter gain in dB"""
-        if volume <= 0:
-            return -60
-        elif volume >= 100:
-            return 12
-        
-        curve_power = self.config.getfloat('Settings', 'curve_power')
-        gain = (volume / 100) ** curve_power * 72 - 60
-        return round(gain, 2)
+        return self.curve.volume_to_gain(volume)
 
     def map_gain_to_volume(self, gain):
         """Convert Voicemeeter gain to Windows volume percentage"""
-        if gain <= -60:
-            return 0
-        elif gain >= 12:
-            return 100
-        
-        curve_power = self.config.getfloat('Settings', 'curve_power')
-        volume = ((gain + 60) / 72) ** (1 / curve_power) * 100
-        return int(volume)
+        return self.curve.gain_to_volume(gain)
 
     def init_windows_volume_interface(self):
         """Initialize Windows volume control interface with retry"""
@@ -459,17 +3904,25 @@ class VoicemeeterVolumeSync:
         except:
             pass  # May already be initialized
         
+        self.metrics.incr('endpoint_inits')
+        if self.endpoint_factory:
+            return self.endpoint_factory()
+
         max_attempts = 5
         for attempt in range(max_attempts):
             try:
-                devices = AudioUtilities.GetSpeakers()
-                interface = devices.Activate(IAudioEndpointVolume._iid_, CLSCTX_ALL, None)
-                logclass.log(f"Initialized Windows volume interface (attempt {attempt+1})")
-                return ctypes.cast(interface, ctypes.POINTER(IAudioEndpointVolume))
+                if self.device_enumerator is None:
+                    self.device_enumerator = WindowsDeviceEnumerator()
+                device_id, device_name = self.device_enumerator.get_default()
+                endpoint = self.device_enumerator.create_endpoint(device_id)
+                self.device_id = device_id
+                self.device_name = device_name
+                logclass.log(f"Initialized Windows volume interface for '{device_name}' (attempt {attempt+1})")
+                return endpoint
             except Exception as e:
                 logclass.log(f"Failed to initialize Windows volume interface (attempt {attempt+1}): {e}", 'error')
                 if attempt < max_attempts - 1:
-                    time.sleep(2)
+                    time.sleep(min(0.25 * 2 ** attempt, 2))
         
         logclass.log("Failed to initialize Windows volume interface after retries", 'error')
         return None
@@ -478,26 +3931,199 @@ class VoicemeeterVolumeSync:
     def get_windows_volume(self):
         try:
             if self.vol_interface:
-                return int(self.vol_interface.GetMasterVolumeLevelScalar() * 100)
+                start = time.perf_counter()
+                volume = self.vol_interface.get_volume()
+                self.metrics.observe('com.get_windows_volume', time.perf_counter() - start)
+                self.endpoint_failed = False
+                return volume
         except Exception as e:
-            logclass.log(f"Error getting Windows volume: {e}", 'error')
-            # Recreate the endpoint interface
-            self.vol_interface = None
-            time.sleep(0.5)
-            self.vol_interface = self.init_windows_volume_interface()
-        return 0
+            self.metrics.incr('endpoint_errors')
+            self.on_endpoint_error(f"Error getting Windows volume: {e}")
+        return self.last_windows_vol
 
     def set_windows_volume(self, vol_percent):
         try:
             if self.vol_interface:
-                scalar = vol_percent / 100
-                self.vol_interface.SetMasterVolumeLevelScalar(scalar, None)
+                self.journal.record('windows', vol_percent)
+                start = time.perf_counter()
+                self.vol_interface.set_volume(vol_percent)
+                self.metrics.observe('com.set_windows_volume', time.perf_counter() - start)
         except Exception as e:
-            logclass.log(f"Error setting Windows volume: {e}", 'error')
-            self.vol_interface = None
-            time.sleep(0.5)
-            self.vol_interface = self.init_windows_volume_interface()
-            
+            self.metrics.incr('endpoint_errors')
+            self.on_endpoint_error(f"Error setting Windows volume: {e}")
+
+    def write_windows_volume(self, values):
+        """Windows write stage output: {'windows': volume}"""
+        self.set_windows_volume(values['windows'])
+
+    def configure_write_rates(self, settings):
+        """Bus writes are limited by dll_max_rate, VBAN-TEXT already packs them at vban_max_rate packets per second"""
+        self.bus_writes.configure(0 if self.vban else settings.dll_max_rate)
+        self.windows_writes.configure(settings.windows_max_rate)
+
+    def get_windows_mute(self):
+        try:
+            if self.vol_interface:
+                return self.vol_interface.get_mute()
+        except Exception as e:
+            self.metrics.incr('endpoint_errors')
+            self.on_endpoint_error(f"Error getting Windows mute: {e}")
+        return self.windows_muted
+
+    def set_windows_mute(self, muted):
+        try:
+            if self.vol_interface:
+                self.journal.record('windows_mute', muted)
+                self.vol_interface.set_mute(muted)
+                self.windows_muted = muted
+        except Exception as e:
+            self.metrics.incr('endpoint_errors')
+            self.on_endpoint_error(f"Error setting Windows mute: {e}")
+
+    def sync_mute(self, vm_muted, trace):
+        """Mirror a mute toggled on either side to the other one"""
+        windows_muted = self.windows_muted
+        decision = self.core.decide_mute(windows_muted, vm_muted, self.vm_mute_bus)
+        if decision == 'idle':
+            return
+        if decision == 'windows->vm':
+            self.set_bus_mutes(windows_muted)
+            self.metrics.incr('sync.mute_windows_to_vm')
+            logclass.verbose("Windows %s → buses %s", 'muted' if windows_muted else 'unmuted', list(self.bus_list))
+        elif decision == 'vm->windows':
+            self.set_windows_mute(vm_muted)
+            # One mute state for all synced buses, as Windows only has one
+            self.set_bus_mutes(vm_muted)
+            self.metrics.incr('sync.mute_vm_to_windows')
+            logclass.verbose("Bus %s %s → Windows", self.vm_mute_bus, 'muted' if vm_muted else 'unmuted')
+        trace.record(self.last_windows_vol, self.last_vm_gain, 'mute ' + decision, windows_muted if decision == 'windows->vm' else vm_muted)
+        self.core.settle_mute(decision, windows_muted, vm_muted)
+        if decision in ('windows->vm', 'vm->windows'):
+            self.scheduler.mark_active()
+            self.publish_state('mute')
+
+    def on_endpoint_error(self, message):
+        """Endpoint call failed (device unplugged, switched...): let the device watcher reopen it, never block here"""
+        if not self.endpoint_failed:
+            self.endpoint_failed = True
+            logclass.log(message, 'error')
+        now = time.monotonic()
+        if self.device_watcher and now - self.endpoint_refresh_time >= 5:
+            self.endpoint_refresh_time = now
+            self.device_watcher.request_refresh()
+
+    def on_device_switched(self, endpoint, device_id, device_name):
+        """Device watcher callback: swap in the new endpoint and apply its profile"""
+        self.detach_volume_events()
+        self.vol_interface = endpoint
+        self.device_id = device_id
+        self.device_name = device_name
+        self.endpoint_failed = False
+        self.attach_volume_events()
+        self.apply_device_profile(device_name)
+        if self.session_watcher:
+            self.session_watcher.request_reopen()
+        self.last_windows_poll = 0
+        self.metrics.incr('device_switches')
+        logclass.log(f"Audio output device is now '{device_name}'")
+        self.volume_event.set()
+
+    def start_device_watcher(self):
+        """Follow default output device changes on a background thread"""
+        if self.device_enumerator is None or self.device_watcher:
+            return
+        self.device_watcher = DeviceWatcher(self.device_enumerator, self.on_device_switched, self.device_id)
+        self.device_watcher.start()
+
+    def stop_device_watcher(self):
+        if self.device_watcher:
+            self.device_watcher.stop()
+            self.device_watcher = None
+
+    def apply_ramped_windows_volume(self, value):
+        """Windows ramp step: write the rounded volume when it changes"""
+        volume = int(round(value))
+        if volume == self.ramp_applied_vol:
+            return
+        self.ramp_applied_vol = volume
+        self.last_windows_vol = volume
+        self.windows_writes.submit({'windows': volume})
+        self.update_volume_icon(volume)
+
+    def apply_ramped_bus_gain(self, value):
+        """Bus ramp step: write the gain to every configured bus"""
+        gain = round(value, 2)
+        self.bus_writes.submit({bus: gain for bus in self.bus_list})
+
+    def start_ramps(self):
+        """Create the Voicemeeter -> Windows ramp and, if enabled, the Windows -> buses ramp"""
+        duration = self.settings.ramp_duration
+        rate = self.settings.ramp_rate
+        if duration <= 0:
+            return
+        self.windows_ramp = RampEngine("Windows", self.apply_ramped_windows_volume, duration, rate,
+                                       lambda seconds: self.metrics.observe('ramp.windows_convergence', seconds))
+        self.windows_ramp.start()
+        if self.settings.ramp_buses:
+            self.bus_ramp = RampEngine("Bus", self.apply_ramped_bus_gain, duration, rate,
+                                       lambda seconds: self.metrics.observe('ramp.bus_convergence', seconds))
+            self.bus_ramp.start()
+
+    def stop_ramps(self):
+        for ramp in (self.windows_ramp, self.bus_ramp):
+            if ramp:
+                ramp.stop()
+        self.windows_ramp = self.bus_ramp = None
+
+    def apply_device_profile(self, device_name):
+        """Use the bus list and curve of the device profile, or the [Settings] ones without a profile"""
+        settings = self.settings
+        profile = settings.profile_for(device_name)
+        if profile is None:
+            self.bus_list, self.curve = settings.bus_list, settings.curve
+            return
+        self.bus_list, self.curve = profile.bus_list, profile.curve
+        logclass.log(f"Applied device profile [{profile.section}]: bus {list(self.bus_list)}, curve_power {self.curve.power}")
+
+    def on_windows_volume_event(self, volume, timestamp, muted=None):
+        """Endpoint callback: hand the new volume and mute state to the sync loop and wake it up"""
+        self.event_windows_vol = volume
+        if muted is not None:
+            self.windows_muted = muted
+        self.event_time = timestamp
+        self.metrics.incr('volume_events')
+        self.volume_event.set()
+
+    def attach_volume_events(self):
+        """Switch to event mode if enabled and supported by the endpoint, otherwise keep polling"""
+        self.volume_events_active = False
+        self.event_windows_vol = None
+        if not self.vol_interface or not self.settings.volume_events:
+            return False
+        if self.vol_interface.register_callback(self.on_windows_volume_event):
+            self.volume_events_active = True
+            logclass.log("Windows volume tracking: event mode")
+        else:
+            logclass.log("Windows volume tracking: polling mode")
+        return self.volume_events_active
+
+    def detach_volume_events(self):
+        """Unregister the endpoint volume callback"""
+        if self.vol_interface and self.volume_events_active:
+            self.vol_interface.unregister_callback()
+        self.volume_events_active = False
+
+    def read_windows_volume(self, fallback_poll):
+        """Current Windows volume: last event value in event mode, a COM read when polling or when the fallback poll is due"""
+        now = time.perf_counter()
+        if self.volume_events_active and self.event_windows_vol is not None and now - self.last_windows_poll < fallback_poll:
+            return self.event_windows_vol
+        self.last_windows_poll = now
+        volume = self.get_windows_volume()
+        self.windows_muted = self.get_windows_mute()
+        if self.volume_events_active:
+            self.event_windows_vol = volume
+        return volume
             
     # def get_windows_volume(self):
         # """Get current Windows volume"""
@@ -527,102 +4153,276 @@ class VoicemeeterVolumeSync:
     def sync_volumes(self):
         """Main volume synchronization loop with startup handling"""
         logclass.log("Starting volume sync...")
-        
-        self.wait_for_system_ready()
-        
+        self.mark_startup('sync thread')
+
+        # Start logging in right away: the readiness probes only wait for it
         if not self.connect_voicemeeter():
-            logclass.log("Failed to connect to Voicemeeter - sync will not start", 'error')
+            logclass.log("Failed to open the Voicemeeter backend - sync will not start", 'error')
             return
-            
+
+        self.wait_for_system_ready()
         self.vol_interface = self.init_windows_volume_interface()
+        self.mark_startup('endpoint')
         if not self.vol_interface:
             logclass.log("Failed to initialize Windows volume interface - sync will not start", 'error')
             self.disconnect_voicemeeter()
             return
 
+        self.attach_volume_events()
+        self.last_windows_poll = 0
         self.last_windows_vol = self.get_windows_volume()
-        self.last_vm_gain = self.get_bus_gain(0) or 0
-        self.last_change_time = time.time()
+        # The mixer gain is read on the first connected tick (vm_resync)
+        self.last_vm_gain = self.get_bus_gain(0) if self.vban else 0
 
         logclass.log("Volume sync active. Monitoring...")
 
-        sync_interval = self.config.getfloat('Settings', 'sync_interval')
-        change_timeout = self.config.getfloat('Settings', 'change_timeout')
-        gain_threshold = self.config.getfloat('Settings', 'gain_threshold')
-        volume_threshold = self.config.getint('Settings', 'volume_threshold')
-        bus_list_str = self.config.get('Settings', 'bus', fallback='0')
-        try:
-            bus_list = [int(x.strip()) for x in bus_list_str.split(',')]
-        except ValueError as e:
-            logclass.log(f"Invalid bus configuration: '{bus_list_str}' - {e}", 'error')
-            bus_list = [0]
+        settings = self.settings
+        self.scheduler = TickScheduler(settings.sync_interval, settings.sync_interval_idle, settings.idle_after,
+                                       self.volume_event)
+        self.journal.ttl = settings.echo_window
+        self.configure_write_rates(settings)
+        self.apply_device_profile(self.device_name)
+        self.start_device_watcher()
+        self.start_session_watcher()
+        self.start_ramps()
+        self.set_recording(settings.record)
+        self.start_meter()
+        trace = logclass.trace
 
         while self.running:
             try:
-                current_windows_vol = self.get_windows_volume()
-                current_vm_gain = self.get_bus_gain(0) or 0
+                tick_start = time.perf_counter()
+                if self.settings is not settings:
+                    self.apply_sync_settings(settings, self.settings)
+                    settings = self.settings
+                self.run_control_commands()
+                # Trailing writes of a burst whose turn came (the coalescers set volume_event for it)
+                self.bus_writes.flush_due()
+                self.windows_writes.flush_due()
+                current_windows_vol = self.read_windows_volume(settings.event_fallback_poll)
+                self.poll_vm_dirty()
+                snapshot = self.read_bus_snapshot() if self.vm_connected else None
+                current_vm_gain = current_vm_mute = None
+                if snapshot is not None:
+                    current_vm_gain, current_vm_mute = self.track_bus_snapshot(snapshot)
+                if self.recorder:
+                    self.recorder.record(current_windows_vol, current_vm_gain, self.vm_bus)
                 if current_vm_gain is None:
-                    # likely disconnected; attempt lazy reconnect
-                    if not self.vm_connected:
-                        time.sleep(1.0)
-                        self.connect_voicemeeter()
-                    time.sleep(sync_interval)
+                    # The supervisor reconnects in the background; keep ticking without touching the DLL.
+                    # last_windows_vol is left alone so a change made meanwhile is pushed once reconnected.
+                    trace.record(current_windows_vol, None, 'disconnected', result=self.last_vm_result)
+                    self.scheduler.wait()
                     continue
+                if self.vm_resync:
+                    # (Re)connected: take the mixer as it is now instead of treating the gap as a change
+                    self.vm_resync = False
+                    self.last_vm_gain = current_vm_gain
+                    self.core.settle_mute('resync', self.windows_muted, current_vm_mute)
+                    trace.record(current_windows_vol, current_vm_gain, 'resync', result=self.last_vm_result)
 
-                time_now = time.time()
+                self.sync_mute(current_vm_mute, trace)
+                if self.session_watcher and self.sync_sessions(settings):
+                    self.scheduler.mark_active()
+                if self.startup is None:
+                    self.report_startup()
+                decision, value = self.core.decide(current_windows_vol, current_vm_gain, settings, self.curve, self.vm_bus)
 
-                if abs(current_windows_vol - self.last_windows_vol) >= volume_threshold:
-                    gain = self.map_volume_to_gain(current_windows_vol)
+                if decision == 'windows-echo':
+                    trace.record(current_windows_vol, current_vm_gain, 'windows-echo', result=self.last_vm_result)
+                    self.metrics.incr('echo.windows')
+                    self.core.settle(decision, current_windows_vol, current_vm_gain, value)
 
-                    for bus in bus_list:
-                        try:
-                            self.set_bus_gain(bus, gain)
-                            self.last_vm_gain = gain
-                        except Exception as e:
-                            logclass.log(f"Failed to set gain for bus {bus}: {e}", 'error')
-                    
-                    if self.logging_verbose:
-                        logclass.log(f"Windows volume changed: {current_windows_vol}% → {gain}dB", 'debug')
-                    self.last_windows_vol = current_windows_vol
-                    self.last_vm_gain = gain
-                    self.last_change_time = time_now
-                    self.last_change_source = 'windows'                    
-
-                elif time_now - self.last_change_time > change_timeout:
-                    if abs(current_vm_gain - self.last_vm_gain) >= gain_threshold and self.last_change_source != 'windows':
-                        target_volume = self.map_gain_to_volume(current_vm_gain)
-                        gain_diff = current_vm_gain - self.last_vm_gain
-                        if self.logging_verbose:
-                            logclass.log(f"Voicemeeter gain changed: {self.last_vm_gain}dB → {current_vm_gain}dB (Δ{gain_diff:+.1f}dB) | Target Windows vol: {target_volume}%", 'debug')
-
-                        if abs(target_volume - current_windows_vol) > 10:
-                            step = int((target_volume - current_windows_vol) * 0.3)
-                            new_volume = current_windows_vol + step
-                            self.set_windows_volume(new_volume)
-                            self.last_windows_vol = new_volume
-                            if self.logging_verbose:
-                                logclass.log(f"Applied smooth Windows volume adjustment: {current_windows_vol}% → {new_volume}% (step: {step})", 'debug')
+                elif decision == 'windows->vm':
+                    gain = value
+
+                    try:
+                        if self.bus_ramp:
+                            self.bus_ramp.set_target(gain, self.last_vm_gain)
+                            result = 0
                         else:
-                            self.set_windows_volume(target_volume)
-                            self.last_windows_vol = target_volume
-                            if self.logging_verbose:
-                                logclass.log(f"Applied direct Windows volume adjustment: {current_windows_vol}% → {target_volume}%", 'debug')
+                            self.bus_writes.submit({bus: gain for bus in self.bus_list})
+                            result = self.last_vm_result
+                    except Exception as e:
+                        result = None
+                        logclass.log(f"Failed to set gain for buses {self.bus_list}: {e}", 'error')
+                    trace.record(current_windows_vol, current_vm_gain, 'windows->vm', gain, result)
+                    # End-to-end: from the endpoint notification when it triggered this tick, else from the tick start
+                    origin = self.event_time if self.volume_events_active and self.event_windows_vol == current_windows_vol and self.event_time else tick_start
+                    self.metrics.observe('propagation.windows_to_vm', time.perf_counter() - origin)
+                    self.metrics.incr('sync.windows_to_vm')
+                    
+                    logclass.verbose("Windows volume changed: %s%% → %sdB", current_windows_vol, gain)
+                    self.update_volume_icon(current_windows_vol)
+                    self.core.settle(decision, current_windows_vol, current_vm_gain, gain)
+                    self.scheduler.mark_active()
+                    self.publish_state('windows')
 
-                        self.last_vm_gain = current_vm_gain
-                        self.last_change_time = time_now
-                        self.last_change_source = 'voicemeeter'
-                time.sleep(sync_interval)
+                elif decision == 'vm-echo':
+                    trace.record(current_windows_vol, current_vm_gain, 'vm-echo', result=self.last_vm_result)
+                    self.metrics.incr('echo.vm')
+                    self.core.settle(decision, current_windows_vol, current_vm_gain, value)
+
+                elif decision == 'vm->windows':
+                    target_volume = value
+                    gain_diff = current_vm_gain - self.last_vm_gain
+                    logclass.verbose("Voicemeeter bus %s gain changed: %sdB → %sdB (Δ%+.1fdB) | Target Windows vol: %s%%",
+                                     self.vm_bus, self.last_vm_gain, current_vm_gain, gain_diff, target_volume)
+
+                    if self.windows_ramp:
+                        self.ramp_applied_vol = current_windows_vol
+                        self.windows_ramp.set_target(target_volume, current_windows_vol)
+                        logclass.verbose("Ramping Windows volume: %s%% → %s%%", current_windows_vol, target_volume)
+                    else:
+                        self.windows_writes.submit({'windows': target_volume})
+                        logclass.verbose("Applied direct Windows volume adjustment: %s%% → %s%%", current_windows_vol, target_volume)
+
+                    trace.record(current_windows_vol, current_vm_gain, 'vm->windows', target_volume, self.last_vm_result)
+                    self.metrics.observe('propagation.vm_to_windows', time.perf_counter() - tick_start)
+                    self.update_volume_icon(target_volume)
+                    self.metrics.incr('sync.vm_to_windows')
+                    self.core.settle(decision, current_windows_vol, current_vm_gain, target_volume,
+                                     windows_written=not self.windows_ramp)
+                    self.scheduler.mark_active()
+                    self.publish_state('voicemeeter')
+                    # The mixer moved on its own: what we wrote last is no longer what the buses hold
+                    self.last_written_gain.clear()
+                else:
+                    trace.record(current_windows_vol, current_vm_gain, 'idle', result=self.last_vm_result)
+                self.metrics.observe('sync.iteration', time.perf_counter() - tick_start)
+                self.scheduler.wait()
 
             except Exception as e:
                 logclass.log(f"Error in sync loop: {e}", 'error')
-                self.vm_connected = False
+                self.metrics.incr('sync.errors')
+                trace.record(None, None, 'error', repr(e))
+                logclass.dump_trace(f"error in sync loop: {e}")
+                self.report_vm_lost()
                 time.sleep(1)
 
         logclass.log("Volume sync stopped")
+        logclass.log(self.get_dll_stats_text())
+        logclass.log(f"Tick stats: {self.scheduler.stats()}")
+        self.set_recording(False)
+        self.stop_meter()
+        self.stop_ramps()
+        self.bus_writes.flush()
+        self.windows_writes.flush()
+        logclass.log(self.get_write_stats_text())
+        self.stop_device_watcher()
+        self.stop_session_watcher()
+        self.detach_volume_events()
         self.disconnect_voicemeeter()
 
+    def start_meter(self):
+        """Start polling bus levels and, if configured, applying the level rule"""
+        settings = self.settings
+        if self.meter or not settings.meter_enabled:
+            return
+        if settings.meter_source == 'synthetic':
+            source = SyntheticLevelSource()
+        elif self.vban:
+            logclass.log("Level metering needs the Voicemeeter DLL backend", 'warning')
+            return
+        else:
+            source = VoicemeeterLevelSource(lambda: self.voicemeeter if self.vm_connected else None, self.vm_call)
+        buses = list(self.bus_list)
+        if settings.meter_rule == 'duck' and settings.duck_bus >= 0 and settings.duck_bus not in buses:
+            buses.append(settings.duck_bus)
+        self.level_rule = None
+        if settings.meter_rule in ('cap', 'duck'):
+            self.level_rule = LevelRule(settings.meter_rule, settings.cap_db, settings.duck_bus, settings.duck_threshold_db,
+                                        settings.duck_amount_db, settings.max_reduction_db, settings.release_db_per_s,
+                                        settings.meter_window + (2 / settings.meter_rate if settings.meter_rate > 0 else 0))
+        self.meter_base_gain = None
+        self.meter_writes.clear()
+        self.meter_reduction = 0.0
+        self.meter = LevelMeter(source, buses, settings.meter_channels, settings.meter_rate, settings.meter_window,
+                                on_levels=self.on_levels, metrics=self.metrics)
+        self.meter.start()
+        logclass.log(f"Metering buses {buses} at {settings.meter_rate:g}Hz ({'numpy' if self.meter.numpy else 'array'} statistics), rule: {settings.meter_rule}")
+
+    def stop_meter(self):
+        if self.meter:
+            self.meter.stop()
+            self.meter = None
+        if self.meter_reduction and self.meter_base_gain is not None:
+            # Give the buses their gain back
+            self.bus_writes.submit({bus: self.meter_base_gain for bus in self.bus_list})
+        self.meter_reduction = 0.0
+
+    def on_levels(self, levels):
+        """Meter thread: turn the window levels into a gain reduction of the synced buses"""
+        rule = self.level_rule
+        if rule is None or not self.vm_connected:
+            return
+        reduction = rule.update(levels, self.bus_list, time.monotonic())
+        synced = self.last_vm_gain
+        if self.meter_base_gain is None or not any(abs(synced - written) <= 0.01 for written in self.meter_writes):
+            # The sync moved the buses (Windows or mixer change), not us: that is the unreduced gain now
+            self.meter_base_gain = synced
+        if reduction == 0 and self.meter_reduction == 0:
+            return
+        self.meter_reduction = reduction
+        target = round(max(-60.0, self.meter_base_gain - reduction), 2)
+        if not self.meter_writes or target != self.meter_writes[-1]:
+            self.meter_writes.append(target)
+            self.metrics.incr('meter.rule_writes')
+        # Journaled like any of our writes, so the sync loop takes it as an echo, not a mixer change
+        self.bus_writes.submit({bus: target for bus in self.bus_list})
+
+    def set_recording(self, enabled):
+        """Start or stop recording the sync loop inputs to VCVM_session_*.vcvmrec next to the log file"""
+        if enabled and not self.recorder:
+            path = os.path.join(os.path.dirname(os.path.abspath(logclass.log_file)),
+                                f"VCVM_session_{datetime.now().strftime('%Y%m%d_%H%M%S')}.vcvmrec")
+            try:
+                self.recorder = SessionRecorder(path)
+            except OSError as e:
+                logclass.log(f"Failed to start session recording: {e}", 'error')
+                return
+            logclass.log(f"Recording sync inputs to {path}")
+        elif not enabled and self.recorder:
+            recorder, self.recorder = self.recorder, None
+            recorder.close()
+            logclass.log(f"Recorded {recorder.samples} samples to {recorder.path}")
+
+    def apply_sync_settings(self, previous, settings):
+        """Sync thread side of a settings reload: only what changed is rebuilt, the loop keeps running"""
+        self.scheduler.configure(settings.sync_interval, settings.sync_interval_idle, settings.idle_after)
+        self.journal.ttl = settings.echo_window
+        self.apply_device_profile(self.device_name)
+        if (previous.ramp_duration, previous.ramp_rate, previous.ramp_buses) != (settings.ramp_duration, settings.ramp_rate, settings.ramp_buses):
+            self.stop_ramps()
+            self.start_ramps()
+        if previous.volume_events != settings.volume_events:
+            self.detach_volume_events()
+            self.attach_volume_events()
+        self.set_recording(settings.record)
+        meter_keys = ('meter_enabled', 'meter_source', 'meter_rate', 'meter_window', 'meter_channels', 'meter_rule',
+                      'cap_db', 'duck_bus', 'duck_threshold_db', 'duck_amount_db', 'max_reduction_db', 'release_db_per_s')
+        if any(getattr(previous, key) != getattr(settings, key) for key in meter_keys):
+            self.stop_meter()
+            self.start_meter()
+        if (previous.session_sync, previous.session_refresh, previous.session_rules) != \
+                (settings.session_sync, settings.session_refresh, settings.session_rules):
+            self.stop_session_watcher()
+            self.start_session_watcher()
+        backend_keys = ('backend', 'dll_path', 'vban_host', 'vban_port', 'vban_stream', 'vban_max_rate')
+        if any(getattr(previous, key) != getattr(settings, key) for key in backend_keys):
+            logclass.log("Voicemeeter backend settings changed - reconnecting")
+            self.disconnect_voicemeeter()
+            if self.supervisor and settings.dll_path != self.loaded_dll_path:
+                self.supervisor.reset_dll()
+            self.connect_voicemeeter()
+        elif self.supervisor:
+            self.supervisor.min_delay = settings.reconnect_min_delay
+            self.supervisor.max_delay = settings.reconnect_max_delay
+        self.configure_write_rates(settings)
+        self.last_windows_poll = 0
+        logclass.log("Applied new settings to the running sync")
+
     def monitor_voicemeeter_status(self):
-        """Monitor Voicemeeter connection status"""
+        """Monitor Voicemeeter connection status and config.ini changes"""
         last_status = None
         while self.running:
 
@@ -642,6 +4442,7 @@ class VoicemeeterVolumeSync:
                     else:
                         self.update_tray_icon("icon_status_off.ico")
                     last_status = status
+                self.check_config_file()
             except Exception as e:
                 logclass.log(f"Error monitoring Voicemeeter status: {e}", 'error')
                 self.connected = False
@@ -667,6 +4468,7 @@ class VoicemeeterVolumeSync:
             
         logclass.log("Stopping volume sync...")
         self.running = False
+        self.volume_event.set()
         
         if self.sync_thread and self.sync_thread.is_alive():
             self.sync_thread.join(timeout=2)
@@ -675,68 +4477,21 @@ class VoicemeeterVolumeSync:
             
         logclass.log("Volume sync stopped")
 
-    def delete_startup_task(task_name="VolumeControl for Voicemeeter"):
-        try:
-            result = subprocess.run(
-                ["schtasks", "/Delete", "/TN", task_name, "/F"],
-                stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True
-            )
-            if result.returncode == 0:
-                print(f"Scheduled task '{task_name}' deleted.")
-                return True
-            else:
-                print(f"Error deleting task: {result.stderr.strip()}")
-                return False
-        except Exception as e:
-            print(f"Exception deleting task: {e}")
-            return False
-
     def toggle_autostart(self, enable):
         """Toggle autostart using Windows Task Scheduler with delay"""
-        task_name = "VolumeControl for Voicemeeter"
         if enable:
             is_py = not getattr(sys, 'frozen', False)
             python_exe = sys.executable
             script_path = os.path.abspath(__file__)
             cmd = f'"{python_exe}" "{script_path}"' if is_py else f'"{sys.executable}"' #keep as such to AVOID having quotes around python path, otherwise will fail
-
-            schtasks_cmd = [
-                "schtasks",
-                "/Create",
-                "/TN", task_name,
-                "/TR", cmd,
-                "/SC", "ONLOGON",
-                "/RL", "HIGHEST",
-                "/DELAY", "0000:05",
-                "/F"
-            ]
-            try:
-                result = subprocess.run(schtasks_cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True)
-                if result.returncode == 0:
-                    logclass.log("Autostart task created successfully with 5 seconds delay")
-                else:
-                    logclass.log(f"Failed to create autostart task: {result.stderr.strip()}", 'error')
-            except Exception as e:
-                logclass.log(f"Error creating autostart task: {e}", 'error')
+            self.autostart.create(cmd)
         else:
-            try:
-                result = subprocess.run(
-                    ["schtasks", "/Delete", "/TN", task_name, "/F"],
-                    stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True
-                )
-                if result.returncode == 0:
-                    logclass.log("Autostart task removed successfully")
-                else:
-                    logclass.log(f"Failed to remove autostart task: {result.stderr.strip()}", 'error')
-            except Exception as e:
-                logclass.log(f"Error removing autostart task: {e}", 'error')
+            self.autostart.delete()
+        self.autostart.refresh_async(self.refresh_tray_menu)
 
     def is_autostart_enabled(self):
-        result = subprocess.run(
-            ["schtasks", "/Query", "/TN", "VolumeControl for Voicemeeter"],
-            stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True
-        )
-        return result.returncode == 0
+        """Cached autostart state, refreshed in the background"""
+        return self.autostart.is_enabled()
 
     def on_quit(self, icon, _):
         """Handle quit from tray menu"""
@@ -748,19 +4503,27 @@ class VoicemeeterVolumeSync:
     def on_reload(self, icon, _):
         """Handle reload from tray menu"""
         logclass.log("Reload requested from tray")
-        self.stop_sync()
-        time.sleep(1)
-        self.load_config()
-        self.load_voicemeeter_dll()
-        if self.voicemeeter:
+        self.reload_config()
+        if not self.running:
             self.start_sync()
-        else:
-            logclass.log("Voicemeeter DLL not loaded — skipping sync", 'error')
+
+    def on_metrics_snapshot(self, icon, _):
+        """Handle metrics snapshot from tray menu"""
+        self.write_metrics_snapshot()
+
+    def on_dump_trace(self, icon, _):
+        """Handle trace dump from tray menu"""
+        logclass.dump_trace("requested from tray", force=True)
 
     def on_toggle_autostart(self, icon, _):
         """Handle autostart toggle from tray menu"""
-        self.autostart_enabled = not self.autostart_enabled
-        self.toggle_autostart(self.autostart_enabled)
+        state = self.autostart.enabled
+        if state is None:
+            # Creating the task blindly could replace one the user set up; ask the task scheduler again first
+            logclass.log("Autostart state is not known yet - not changing it", 'warning')
+            self.autostart.refresh_async(self.refresh_tray_menu)
+            return
+        threading.Thread(target=self.toggle_autostart, args=(not state,), name="AutostartToggle", daemon=True).start()
 
     def on_toggle_logging(self, icon, _):
         """Handle logging toggle from tray menu"""
@@ -772,6 +4535,7 @@ class VoicemeeterVolumeSync:
     
     def on_toggle_logging_verbose(self, icon, _):
         self.logging_verbose = not self.logging_verbose
+        logclass.verbose_enabled = self.logging_verbose
         self.config.set('Logging', 'verbose', str(self.logging_verbose).lower())
         self.save_config()
         logclass.log(f"Verbose logging {'enabled' if self.logging_verbose else 'disabled'}")
@@ -779,8 +4543,8 @@ class VoicemeeterVolumeSync:
     
     def get_autostart_text(self, icon):
         """Get autostart menu text"""
-        state = self.is_autostart_enabled()
-        return f"Autostart: {'On' if state else 'Off'}"
+        state = self.autostart.enabled
+        return f"Autostart: {'Unknown' if state is None else 'On' if state else 'Off'}"
     
     def get_logging_text(self, icon):
         """Get logging menu text"""
@@ -799,7 +4563,7 @@ class VoicemeeterVolumeSync:
             
             title = "About VolumeControl for Voicemeeter"
             message = ("VolumeControl for Voicemeeter.\n"
-                      "Version 1.0.3 of may 2026\n\n"
+                      f"Version {APP_VERSION} of may 2026\n\n"
                       "https://github.com/dayeggpi \n\n"
                       "Synchronizes Windows volume with Voicemeeter.\n"
                       "Support them : https://vb-audio.com/\n\n"
@@ -819,7 +4583,7 @@ class VoicemeeterVolumeSync:
             logclass.log(error_msg, level='error', exc_info=True)
             print(f"Error: {error_msg}")
             print("\n=== About VolumeControl for Voicemeeter ===")
-            print("Version 1.0.3")  
+            print(f"Version {APP_VERSION}")  
             print("https://github.com/dayeggpi")  
             print("Synchronizes Windows volume with Voicemeeter")
             print("by dayeggpi")
@@ -827,23 +4591,42 @@ class VoicemeeterVolumeSync:
 
     def start_tray(self):
         """Start the system tray icon"""
+        from pystray import Icon, MenuItem as item
+        image = self.tray_icon_image
+        pending, self.pending_tray_image = self.pending_tray_image, None
+        if pending:
+            self.tray_icon_key, image = pending
         self.icon = Icon(
             "Voicemeeter", 
-            self.tray_icon_image, 
+            image, 
             "VolumeControl for Voicemeeter",
             menu=(
                 item("About", self.creditsinfo),
                 item(self.get_autostart_text, self.on_toggle_autostart),
                 item(self.get_logging_text, self.on_toggle_logging),
                 item(self.get_verbose_text, self.on_toggle_logging_verbose),
+                item("Dump trace", self.on_dump_trace),
+                item("Metrics snapshot", self.on_metrics_snapshot),
                 item("Reload", self.on_reload),
                 item("Quit", self.on_quit),
             )
         )
+        pending, self.pending_tray_image = self.pending_tray_image, None
+        if pending:
+            # Arrived while the icon was being created
+            self.set_tray_image(*pending)
         logclass.log("Starting tray icon...")
         self.icon.run() 
 
 
+    def refresh_tray_menu(self):
+        """Redraw dynamic menu labels after a background state change"""
+        if self.icon:
+            try:
+                self.icon.update_menu()
+            except Exception as e:
+                logclass.log(f"Failed to refresh tray menu: {e}", 'warning')
+
     def resource_path(self, filename):
         if getattr(sys, 'frozen', False):  # running as .exe (PyInstaller)
             return os.path.join(sys._MEIPASS, filename)
@@ -851,35 +4634,219 @@ class VoicemeeterVolumeSync:
             base_dir = os.path.dirname(os.path.abspath(__file__))
             return os.path.join(base_dir, filename)
 
+    def get_status_icon(self, icon_name):
+        """Decoded status icon, read from disk only the first time"""
+        image = self.icon_images.get(icon_name)
+        if image is None:
+            icon_path = self.resource_path(icon_name)
+            if not os.path.exists(icon_path):
+                logclass.log(f"Icon not found: {icon_path}", 'error')
+                return None
+            from PIL import Image
+            image = Image.open(icon_path)
+            image.load()
+            self.icon_images[icon_name] = image
+        return image
+
+    def preload_status_icons(self):
+        """Decode the status icons once at startup"""
+        for icon_name in ("icon_status_on.ico", "icon_status_off.ico"):
+            try:
+                self.get_status_icon(icon_name)
+            except Exception as e:
+                logclass.log(f"Failed to load tray icon {icon_name}: {e}", 'warning')
+
+    def set_tray_image(self, key, image):
+        """Show image in the tray unless it is already the one displayed"""
+        if key == self.tray_icon_key or image is None:
+            return
+        if not self.icon:
+            # The sync can report its status before the tray starts: start_tray shows it
+            self.pending_tray_image = (key, image)
+            return
+        self.tray_icon_key = key
+        self.icon.icon = image
+
     def update_tray_icon(self, icon_name):
         """Change the tray icon dynamically"""
+        self.icon_connected = icon_name == "icon_status_on.ico"
+        if self.headless:
+            return
         try:
-            icon_path = self.resource_path(icon_name)
-            if os.path.exists(icon_path):
-                image = Image.open(icon_path)
-                self.icon.icon = image
-                logclass.log(f"Tray icon updated to: {icon_name}")
-            else:
-                logclass.log(f"Icon not found: {icon_path}", 'error')
+            if self.tray_icon_mode == 'volume':
+                self.update_volume_icon(self.last_windows_vol)
+                return
+            if icon_name == self.tray_icon_key:
+                return
+            self.set_tray_image(icon_name, self.get_status_icon(icon_name))
+            logclass.log(f"Tray icon updated to: {icon_name}")
         except Exception as e:
             logclass.log(f"Failed to update tray icon to {icon_name}: {e}", 'error')
 
+    def render_volume_icon(self, level, connected):
+        """Draw the volume icon for a quantized level (0..volume_icon_steps), memoized"""
+        key = (level, connected)
+        image = self.volume_icons.get(key)
+        if image is not None:
+            return image
+        from PIL import Image, ImageDraw
+        image = Image.new('RGBA', (64, 64), color=(0, 0, 0, 0))
+        d = ImageDraw.Draw(image)
+        d.ellipse((0, 0, 63, 63), fill=(10, 50, 120, 255) if connected else (90, 90, 90, 255))
+        d.rectangle((10, 24, 20, 40), fill=(255, 255, 255, 255))
+        d.polygon([(20, 24), (30, 18), (30, 46), (20, 40)], fill=(255, 255, 255, 255))
+        # Level bar on the right, filled from the bottom
+        d.rectangle((40, 12, 52, 52), outline=(255, 255, 255, 255), width=2)
+        fill_top = 50 - round(36 * level / self.volume_icon_steps)
+        if level > 0:
+            d.rectangle((43, fill_top, 49, 49), fill=(120, 220, 120, 255) if connected else (200, 200, 200, 255))
+        self.volume_icons[key] = image
+        return image
+
+    def update_volume_icon(self, volume):
+        """Show the Windows volume in the tray icon, only redrawing when the quantized level changes"""
+        if self.tray_icon_mode != 'volume' or self.headless:
+            return
+        level = round(max(0, min(100, volume)) * self.volume_icon_steps / 100)
+        key = ('volume', level, self.icon_connected)
+        if key == self.tray_icon_key:
+            return
+        self.set_tray_image(key, self.render_volume_icon(level, self.icon_connected))
+
+
+    @staticmethod
+    def process_rss():
+        """Resident memory of this process in bytes, None if it cannot be read"""
+        try:
+            import psutil
+            return psutil.Process().memory_info().rss
+        except ImportError:
+            pass
+        try:
+            if sys.platform == 'win32':
+                class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+                    _fields_ = [('cb', ctypes.c_ulong), ('PageFaultCount', ctypes.c_ulong),
+                                ('PeakWorkingSetSize', ctypes.c_size_t), ('WorkingSetSize', ctypes.c_size_t),
+                                ('QuotaPeakPagedPoolUsage', ctypes.c_size_t), ('QuotaPagedPoolUsage', ctypes.c_size_t),
+                                ('QuotaPeakNonPagedPoolUsage', ctypes.c_size_t), ('QuotaNonPagedPoolUsage', ctypes.c_size_t),
+                                ('PagefileUsage', ctypes.c_size_t), ('PeakPagefileUsage', ctypes.c_size_t)]
+                counters = PROCESS_MEMORY_COUNTERS()
+                counters.cb = ctypes.sizeof(counters)
+                current_process = ctypes.c_void_p(-1)  # GetCurrentProcess() pseudo handle
+                if ctypes.windll.psapi.GetProcessMemoryInfo(current_process, ctypes.byref(counters), counters.cb):
+                    return counters.WorkingSetSize
+                return None
+            with open('/proc/self/statm') as f:
+                return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+        except Exception:
+            return None
+
+    def report_startup(self):
+        """First synced tick: log import time, time since launch and memory, once"""
+        self.mark_startup('first sync')
+        rss = self.process_rss()
+        timeline = []
+        previous = APP_STARTED
+        for phase, at in self.startup_marks:
+            timeline.append((phase, round((at - previous) * 1000, 1)))
+            previous = max(previous, at)
+        self.startup = {
+            'mode': 'headless' if self.headless else 'tray',
+            'import_ms': round(IMPORT_SECONDS * 1000, 1),
+            'first_sync_ms': round((time.perf_counter() - APP_STARTED) * 1000, 1),
+            'rss_mb': round(rss / 1048576, 1) if rss else None,
+            'timeline_ms': dict(timeline),
+        }
+        self.metrics.providers['startup'] = lambda: self.startup
+        logclass.log(f"Startup ({self.startup['mode']}): imports {self.startup['import_ms']}ms, "
+                     f"first sync {self.startup['first_sync_ms']}ms after launch, RSS {self.startup['rss_mb']}MB")
+        logclass.log("Startup timeline: " + ", ".join(f"{phase} +{ms:g}ms" for phase, ms in timeline))
+        if self.startup_report_exit:
+            print("STARTUP " + json.dumps(self.startup), flush=True)
+            self.request_stop()
+
+    def request_stop(self):
+        """Leave run(): stop the tray loop, or the headless wait"""
+        self.stop_event.set()
+        if self.icon:
+            self.icon.stop()
+
+    def wait_headless(self):
+        """Headless mode: keep syncing until Ctrl+C, SIGTERM / SIGBREAK or request_stop()"""
+        logclass.log("Running headless (no tray icon)")
+        for name in ('SIGTERM', 'SIGBREAK'):
+            if hasattr(signal, name):
+                signal.signal(getattr(signal, name), lambda signum, frame: self.stop_event.set())
+        # Wake up regularly so Ctrl+C gets through on Windows
+        while not self.stop_event.wait(0.5):
+            pass
+
+    @staticmethod
+    def startup_benchmark(args):
+        """--startup-benchmark [runs]: start VCVM in tray then headless mode and compare their startup reports"""
+        import statistics
+        index = args.index("--startup-benchmark")
+        runs = int(args[index + 1]) if len(args) > index + 1 and args[index + 1].isdigit() else 3
+        command = [sys.executable] if getattr(sys, 'frozen', False) else [sys.executable, os.path.abspath(__file__)]
+        for mode, extra in (('tray', []), ('headless', ['--headless'])):
+            reports = []
+            for _ in range(runs):
+                try:
+                    output = subprocess.run(command + extra + ['--startup-report'], capture_output=True,
+                                            text=True, timeout=120).stdout
+                except subprocess.TimeoutExpired:
+                    continue
+                reports += [json.loads(line[8:]) for line in output.splitlines() if line.startswith("STARTUP ")]
+            if not reports:
+                print(f"{mode:9} no report (Voicemeeter not running, or VCVM already running?)")
+                continue
+            median = {key: statistics.median(report[key] or 0 for report in reports)
+                      for key in ('import_ms', 'first_sync_ms', 'rss_mb')}
+            print(f"{mode:9} imports {median['import_ms']:7.1f}ms  first sync {median['first_sync_ms']:7.1f}ms  "
+                  f"RSS {median['rss_mb']:6.1f}MB  (median of {len(reports)} runs)")
+        return 0
 
     def run(self):
         """Main application entry point"""
         logclass.log("Starting VolumeControl for Voicemeeter application")
+        self.start_metrics_server()
+        self.start_control_server()
         self.start_sync()
         try:
-            self.start_tray()
+            if self.headless:
+                self.wait_headless()
+            else:
+                self.start_tray()
         except KeyboardInterrupt:
             logclass.log("KeyboardInterrupt received")
         except Exception as e:
             logclass.log(f"Tray error: {e}", 'error')
         finally:
             self.stop_sync()
+            self.stop_control_server()
+            self.stop_metrics_server()
             logclass.log("Application stopped")
+            logclass.flush()
 
 if __name__ == "__main__":
+    args = sys.argv[1:]
+    if "--replay" in args:
+        logclass = LoggerMaster()
+        sys.exit(SessionReplay.main(args))
+    if "--startup-benchmark" in args:
+        sys.exit(VoicemeeterVolumeSync.startup_benchmark(args))
+    control_port = ControlServer.port_from_config(VoicemeeterVolumeSync.get_data_path("config.ini"))
+    if control_port:
+        # Single instance: a running VCVM answers on the control port, hand it the command and leave
+        command = " ".join(args[args.index("--send") + 1:]) if "--send" in args else "PING"
+        reply = ControlServer.forward(control_port, command)
+        if reply is not None and (command != "PING" or reply.startswith("PONG VCVM")):
+            print(reply)
+            sys.exit(1 if reply.startswith("ERR") else 0)
+    if "--send" in args:
+        print("VCVM is not running")
+        sys.exit(1)
     logclass = LoggerMaster()
-    app = VoicemeeterVolumeSync()
+    app = VoicemeeterVolumeSync(headless="--headless" in args)
+    app.startup_report_exit = "--startup-report" in args
     app.run()
\ No newline at end of file
@@ -0,0 +1,51 @@
+"""Per-call cost of logging on the calling (sync) thread: synchronous file handler vs. the queued writer.
+
+    python tests/bench_logging.py [records]
+"""
+import logging
+import os
+import sys
+import tempfile
+import time
+
+import conftest  # noqa: F401  (puts VCVM on the path)
+import VCVM
+
+
+def bench(queued, records, directory):
+    logger = VCVM.LoggerMaster()
+    logger.logging_enabled = True
+    logger.queued = queued
+    logger.log_file = os.path.join(directory, f"bench_{'queued' if queued else 'sync'}.log")
+    logger.setup_logging()
+    # Console output would dominate the figures
+    logger.logger.handlers = [handler for handler in logger.logger.handlers
+                              if isinstance(handler, logging.FileHandler) or not isinstance(handler, logging.StreamHandler)]
+    start = time.perf_counter()
+    for i in range(records):
+        logger.log("Windows volume changed: %s%% → %sdB", 'debug', args=(i, -3.2))
+    elapsed = time.perf_counter() - start
+    logger.flush(10)
+    with open(logger.log_file, encoding='utf-8') as f:
+        written = sum(1 for _ in f)
+    logger.verbose_enabled = False
+    start = time.perf_counter()
+    for i in range(records):
+        logger.verbose("Windows volume changed: %s%% → %sdB", i, -3.2)
+    disabled = time.perf_counter() - start
+    for handler in logger.logger.handlers[:]:
+        logger.logger.removeHandler(handler)
+        handler.close()
+    return elapsed / records, written, disabled / records
+
+
+def main(records=20000):
+    with tempfile.TemporaryDirectory() as directory:
+        for queued in (False, True):
+            per_call, written, disabled = bench(queued, records, directory)
+            print(f"{'queued' if queued else 'synchronous':12} {per_call * 1e6:6.2f} us/call "
+                  f"({written} lines written), verbose() while off {disabled * 1e9:4.0f} ns/call")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
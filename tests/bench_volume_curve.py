@@ -0,0 +1,28 @@
+"""Micro-benchmark of the volume/gain curve: table lookups vs. the formulas they replace.
+
+    python tests/bench_volume_curve.py [calls]
+"""
+import sys
+import timeit
+
+import conftest  # noqa: F401  (puts VCVM on the path with a logger)
+from VCVM import VolumeCurve
+from test_volume_curve import formula_gain_to_volume, formula_volume_to_gain
+
+
+def main(calls=200000):
+    power = 0.55
+    curve = VolumeCurve(power)
+    cases = [
+        ("volume->gain formula", lambda: formula_volume_to_gain(37, power)),
+        ("volume->gain table", lambda: curve.volume_to_gain(37)),
+        ("gain->volume formula", lambda: formula_gain_to_volume(-17.3, power)),
+        ("gain->volume table", lambda: curve.gain_to_volume(-17.3)),
+    ]
+    for name, func in cases:
+        seconds = min(timeit.repeat(func, number=calls, repeat=5))
+        print(f"{name:22} {seconds / calls * 1e9:8.0f} ns/call")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200000)
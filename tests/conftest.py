@@ -0,0 +1,9 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import VCVM  # noqa: E402
+
+# VCVM.py creates its logger in __main__; the classes under test log through it
+VCVM.logclass = VCVM.LoggerMaster()
@@ -0,0 +1,95 @@
+"""Stand-ins shared by the tests that run the whole sync without Windows or Voicemeeter"""
+import collections
+import ctypes
+import dataclasses
+import threading
+import time
+
+import VCVM
+
+
+class FakeFunction:
+    def __init__(self, func):
+        self.func = func
+        self.argtypes = None
+        self.restype = None
+
+    def __call__(self, *args):
+        return self.func(*args)
+
+
+class FakeVoicemeeterDLL:
+    """The part of VoicemeeterRemote the sync uses, with parameters kept in a dict"""
+
+    def __init__(self):
+        self.params = {}
+        self.dirty = True
+        self.writes = []  # (parameter, value) of every write made through the DLL
+        self.calls = collections.Counter()  # VBVMR_ function name -> calls
+        self.lock = threading.Lock()
+        self.VBVMR_Login = FakeFunction(lambda: 0)
+        self.VBVMR_Logout = FakeFunction(lambda: 0)
+        self.VBVMR_GetParameterFloat = FakeFunction(self.get_parameter)
+        self.VBVMR_SetParameterFloat = FakeFunction(self.set_parameter)
+        self.VBVMR_SetParameters = FakeFunction(self.set_parameters)
+        self.VBVMR_IsParametersDirty = FakeFunction(self.is_dirty)
+        self.VBVMR_GetLevel = FakeFunction(lambda kind, channel, value: 0)
+
+    @staticmethod
+    def text(value):
+        return (value.value if isinstance(value, ctypes.c_char_p) else value).decode()
+
+    def get_parameter(self, name, value):
+        self.calls['GetParameterFloat'] += 1
+        with self.lock:
+            value._obj.value = self.params.get(self.text(name), 0.0)
+        return 0
+
+    def set_parameter(self, name, value):
+        self.calls['SetParameterFloat'] += 1
+        self.external(self.text(name), value.value)
+        self.writes.append((self.text(name), value.value))
+        return 0
+
+    def set_parameters(self, script):
+        self.calls['SetParameters'] += 1
+        for part in self.text(script).split(';'):
+            name, value = part.split('=')
+            self.external(name.strip(), float(value))
+            self.writes.append((name.strip(), float(value)))
+        return 0
+
+    def is_dirty(self):
+        with self.lock:
+            dirty, self.dirty = self.dirty, False
+        return 1 if dirty else 0
+
+    def external(self, name, value):
+        """A change made in Voicemeeter itself"""
+        with self.lock:
+            self.params[name] = value
+            self.dirty = True
+
+
+def wait_for(condition, timeout=3.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.005)
+    return False
+
+
+def make_app(tmp_path, monkeypatch, dll, **settings):
+    """A headless VoicemeeterVolumeSync with its data files in tmp_path, logging in to dll, not started yet"""
+    monkeypatch.setattr(VCVM.VoicemeeterVolumeSync, 'get_data_path', staticmethod(lambda name: str(tmp_path / name)))
+    app = VCVM.VoicemeeterVolumeSync(headless=True)
+    app.settings = dataclasses.replace(app.settings, ramp_duration=0, control_enabled=False, **settings)
+
+    def load():
+        app.voicemeeter = dll
+        app._setup_vm_prototypes()
+        return dll
+
+    app.load_voicemeeter_dll = load
+    return app
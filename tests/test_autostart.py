@@ -0,0 +1,78 @@
+"""AutostartManager through a fake schtasks runner: cached state, toggles not undone by a refresh, no blind toggle"""
+import threading
+
+from VCVM import AutostartManager
+from fakes import FakeVoicemeeterDLL, make_app, wait_for
+
+
+class FakeSchtasks:
+    """Answers schtasks like Windows would for a task that exists or not; /Query can be held to race it"""
+
+    def __init__(self, exists=False, fail=False):
+        self.exists = exists
+        self.fail = fail
+        self.commands = []
+        self.query_started = threading.Event()
+        self.release_query = threading.Event()
+        self.release_query.set()
+
+    def __call__(self, args):
+        action = args[1]
+        self.commands.append(action)
+        if self.fail:
+            raise OSError("schtasks not found")
+        if action == '/Query':
+            exists = self.exists  # what the task scheduler had when the query ran
+            self.query_started.set()
+            self.release_query.wait(2)
+            return (0, "") if exists else (1, "ERROR: The system cannot find the file specified.")
+        self.exists = action == '/Create'
+        return 0, "SUCCESS"
+
+
+def test_refresh_create_and_delete():
+    runner = FakeSchtasks()
+    autostart = AutostartManager(runner)
+    assert autostart.enabled is None
+    assert autostart.refresh() is False
+    assert autostart.create('"VCVM.exe"')
+    assert autostart.enabled is True
+    assert autostart.delete()
+    assert autostart.enabled is False
+    assert runner.commands == ['/Query', '/Create', '/Delete']
+
+
+def test_failing_runner_leaves_the_state_unknown():
+    autostart = AutostartManager(FakeSchtasks(fail=True))
+    assert autostart.refresh() is None
+    assert not autostart.create('"VCVM.exe"')
+    assert autostart.enabled is None
+
+
+def test_refresh_in_flight_does_not_undo_create():
+    runner = FakeSchtasks()
+    autostart = AutostartManager(runner)
+    runner.release_query.clear()
+    refresh = autostart.refresh_async()
+    assert runner.query_started.wait(1)
+    # The query saw no task; creating it now must wait for the refresh rather than be overwritten by it
+    create = threading.Thread(target=autostart.create, args=('"VCVM.exe"',))
+    create.start()
+    runner.release_query.set()
+    refresh.join(2)
+    create.join(2)
+    assert autostart.enabled is True
+
+
+def test_toggle_is_refused_while_the_state_is_unknown(tmp_path, monkeypatch):
+    app = make_app(tmp_path, monkeypatch, FakeVoicemeeterDLL())
+    runner = FakeSchtasks(exists=True)
+    app.autostart = AutostartManager(runner)
+    assert app.get_autostart_text(None) == "Autostart: Unknown"
+    app.on_toggle_autostart(None, None)
+    # No /Create or /Delete: only a new query, which finds the existing task
+    assert wait_for(lambda: app.autostart.enabled is True)
+    assert runner.commands == ['/Query']
+    app.on_toggle_autostart(None, None)
+    assert wait_for(lambda: '/Delete' in runner.commands and app.autostart.enabled is False)
+    assert app.get_autostart_text(None) == "Autostart: Off"
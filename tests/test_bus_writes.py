@@ -0,0 +1,61 @@
+"""Bus gains of all synced buses go out in one VBVMR_SetParameters call, or one call per bus without it"""
+import pytest
+
+from fakes import FakeVoicemeeterDLL, make_app
+
+
+@pytest.fixture
+def connect(tmp_path, monkeypatch):
+    def connect(batch=True, buses=(0, 2, 4)):
+        dll = FakeVoicemeeterDLL()
+        if not batch:
+            del dll.VBVMR_SetParameters  # Remote API versions that predate it
+        app = make_app(tmp_path, monkeypatch, dll)
+        app.voicemeeter = dll
+        app._setup_vm_prototypes()
+        app.bus_list = buses
+        return app, dll
+    return connect
+
+
+def test_gains_are_written_in_one_call(connect):
+    app, dll = connect()
+    assert app.set_bus_gains({0: -12.0, 2: -12.0, 4: -12.0}) == 0
+    assert dll.calls == {'SetParameters': 1}
+    assert dll.writes == [('Bus[0].Gain', -12.0), ('Bus[2].Gain', -12.0), ('Bus[4].Gain', -12.0)]
+    assert all(app.journal.is_echo(app.bus_key(bus), -12.0, 0.01) for bus in (0, 2, 4))
+
+
+def test_buses_already_at_the_gain_are_skipped(connect):
+    app, dll = connect()
+    app.set_bus_gains({0: -12.0, 2: -12.0, 4: -12.0})
+    app.set_bus_gains({0: -12.0, 2: -6.0, 4: -12.0})
+    assert dll.calls == {'SetParameters': 2}
+    assert dll.writes[3:] == [('Bus[2].Gain', -6.0)]
+    assert app.set_bus_gains({0: -12.0, 2: -6.0, 4: -12.0}) == 0
+    assert dll.calls == {'SetParameters': 2}
+
+
+def test_gains_one_call_per_bus_without_set_parameters(connect):
+    app, dll = connect(batch=False)
+    app.set_bus_gains({0: -12.0, 2: -12.0})
+    assert dll.calls == {'SetParameterFloat': 2}
+    assert dll.params == {'Bus[0].Gain': -12.0, 'Bus[2].Gain': -12.0}
+
+
+def test_mutes_are_written_in_one_call(connect):
+    app, dll = connect()
+    assert app.set_bus_mutes(True) == 0
+    assert dll.calls == {'SetParameters': 1}
+    assert dll.params == {'Bus[0].Mute': 1.0, 'Bus[2].Mute': 1.0, 'Bus[4].Mute': 1.0}
+
+
+def test_mutes_one_call_per_bus_without_set_parameters(connect):
+    app, dll = connect(batch=False)
+    assert app.set_bus_mutes(True) == 0
+    assert dll.calls == {'SetParameterFloat': 3}
+    assert dll.params == {'Bus[0].Mute': 1.0, 'Bus[2].Mute': 1.0, 'Bus[4].Mute': 1.0}
+    assert app.set_bus_mutes(False) == 0
+    assert dll.params == {'Bus[0].Mute': 0.0, 'Bus[2].Mute': 0.0, 'Bus[4].Mute': 0.0}
+    # A failed write would have reported the connection lost and dropped the snapshot
+    assert app.last_vm_result == 0
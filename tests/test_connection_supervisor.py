@@ -0,0 +1,43 @@
+"""ConnectionSupervisor publishes every state change from its own thread, even a loss reported by the sync loop"""
+import threading
+
+from VCVM import ConnectionSupervisor
+from fakes import wait_for
+
+
+class Recorder:
+    def __init__(self):
+        self.changes = []  # (connected, thread name)
+
+    def __call__(self, connected):
+        self.changes.append((connected, threading.current_thread().name))
+
+
+def test_loss_is_published_from_the_supervisor_thread():
+    recorder = Recorder()
+    supervisor = ConnectionSupervisor(lambda: object(), lambda dll: True, recorder, min_delay=0.01, max_delay=0.05)
+    supervisor.start()
+    try:
+        assert wait_for(lambda: recorder.changes == [(True, "ConnectionSupervisor")])
+        reporter = threading.Thread(target=supervisor.report_lost, name="VolumeSync")
+        reporter.start()
+        reporter.join()
+        supervisor.report_lost()  # a second failing call before the loss is published changes nothing
+        assert wait_for(lambda: len(recorder.changes) == 3)
+        assert recorder.changes[1:] == [(False, "ConnectionSupervisor"), (True, "ConnectionSupervisor")]
+    finally:
+        supervisor.stop()
+
+
+def test_retries_back_off_until_voicemeeter_answers():
+    recorder = Recorder()
+    answers = iter([False, False, True])
+    supervisor = ConnectionSupervisor(lambda: object(), lambda dll: next(answers), recorder, min_delay=0.01,
+                                      max_delay=0.05)
+    supervisor.start()
+    try:
+        assert wait_for(lambda: recorder.changes)
+        assert supervisor.attempts == 3
+        assert recorder.changes == [(True, "ConnectionSupervisor")]
+    finally:
+        supervisor.stop()
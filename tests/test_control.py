@@ -0,0 +1,69 @@
+"""ControlServer validates commands before anything reaches the sync loop, and only after the HELLO VCVM greeting"""
+import socket
+
+import pytest
+
+from VCVM import ControlServer
+
+
+@pytest.fixture
+def server():
+    submitted = []
+    server = ControlServer(0, lambda kind, value, bus: submitted.append((kind, value, bus)), lambda: {})
+    server.submitted = submitted
+    return server
+
+
+@pytest.mark.parametrize("line", [
+    "NUDGE inf", "NUDGE -inf", "NUDGE nan",
+    "SET VOLUME nan", "SET VOLUME inf",
+    "SET GAIN nan", "SET GAIN -inf", "SET GAIN -12 -1", "SET GAIN -12 8", "SET GAIN -12 99",
+])
+def test_rejects_non_finite_and_invalid_values(server, line):
+    assert server.execute(line, None).startswith("ERR")
+    assert server.submitted == []
+
+
+def test_accepts_valid_commands(server):
+    assert server.execute("NUDGE +2", None) == "OK"
+    assert server.execute("SET VOLUME 40", None) == "OK"
+    assert server.execute("SET GAIN -12 3", None) == "OK"
+    assert server.submitted == [('nudge', 2.0, None), ('volume', 40.0, None), ('gain', -12.0, 3)]
+
+
+@pytest.fixture
+def running(server):
+    assert server.start()
+    yield server, server.server.server_address[1]
+    server.stop()
+
+
+def converse(port, data):
+    """Send data on a fresh connection, return every line received until the server closes it"""
+    with socket.create_connection(('127.0.0.1', port), timeout=2) as sock:
+        sock.sendall(data)
+        sock.shutdown(socket.SHUT_WR)
+        return sock.makefile('rb').read().decode('utf-8').splitlines()
+
+
+def test_connection_without_greeting_is_closed(running):
+    server, port = running
+    post = (b"POST / HTTP/1.1\r\nHost: 127.0.0.1\r\nContent-Type: text/plain\r\nContent-Length: 16\r\n\r\n"
+            b"SET VOLUME 100\r\n")
+    assert converse(port, post) == ["ERR expected HELLO VCVM first"]
+    assert server.submitted == []
+
+
+def test_commands_after_greeting(running):
+    server, port = running
+    lines = converse(port, b"HELLO VCVM\nSET VOLUME 40\nQUIT\nSET VOLUME 50\n")
+    assert lines[0].startswith("HELLO VCVM ")
+    assert lines[1:] == ["OK"]
+    assert server.submitted == [('volume', 40.0, None)]
+
+
+def test_forward_greets_first(running):
+    server, port = running
+    assert ControlServer.forward(port, "PING").startswith("PONG VCVM")
+    assert ControlServer.forward(port, "NUDGE -5") == "OK"
+    assert server.submitted == [('nudge', -5.0, None)]
@@ -0,0 +1,54 @@
+"""Default device switches through a FakeDeviceEnumerator swap the endpoint and apply the device profile"""
+import configparser
+
+import pytest
+
+import VCVM
+from fakes import FakeVoicemeeterDLL, make_app, wait_for
+
+
+@pytest.fixture
+def sync(tmp_path, monkeypatch):
+    config = configparser.ConfigParser()
+    config.read_dict(VCVM.DEFAULT_CONFIG)
+    config.read_dict({'Device:Headset': {'bus': '1,2', 'curve_power': '0.8'}})
+    profiles = VCVM.Settings.from_config(config).device_profiles
+    dll = FakeVoicemeeterDLL()
+    # A long ready_timeout: startup only stays quick if the audio probe asks the fake enumerator
+    app = make_app(tmp_path, monkeypatch, dll, bus_list=(0,), device_profiles=profiles, ready_timeout=30)
+    devices = VCVM.FakeDeviceEnumerator({'speakers': 'Speakers', 'headset': 'USB Headset'}, default_id='speakers')
+    app.device_enumerator = devices
+    app.start_sync()
+    assert wait_for(lambda: app.startup is not None)
+    yield app, dll, devices
+    app.stop_sync()
+
+
+def test_probe_asks_the_injected_enumerator(sync):
+    app, dll, devices = sync
+    assert app.probe_audio()
+    assert app.device_name == 'Speakers'
+    assert app.bus_list == (0,)
+
+
+def test_switch_applies_the_device_profile(sync):
+    app, dll, devices = sync
+    devices.switch('headset')
+    headset = devices.devices['headset'][1]
+    assert wait_for(lambda: app.vol_interface is headset)
+    assert app.bus_list == (1, 2)
+    assert app.curve.power == 0.8
+    headset.emit(30)
+    expected = VCVM.VolumeCurve.for_power(0.8).volume_to_gain(30)
+    assert wait_for(lambda: dll.params.get('Bus[1].Gain') == pytest.approx(expected, abs=0.01))
+    assert dll.params.get('Bus[2].Gain') == pytest.approx(expected, abs=0.01)
+    assert 'Bus[0].Gain' not in dll.params or dll.params['Bus[0].Gain'] != pytest.approx(expected, abs=0.01)
+
+
+def test_switch_back_restores_the_settings(sync):
+    app, dll, devices = sync
+    devices.switch('headset')
+    assert wait_for(lambda: app.bus_list == (1, 2))
+    devices.switch('speakers')
+    assert wait_for(lambda: app.bus_list == (0,))
+    assert app.curve is app.settings.curve
@@ -0,0 +1,38 @@
+"""Bus gains are only read back while Voicemeeter reports its parameters dirty"""
+import time
+
+import pytest
+
+import VCVM
+from fakes import FakeVoicemeeterDLL, make_app, wait_for
+
+
+@pytest.fixture
+def sync(tmp_path, monkeypatch):
+    dll = FakeVoicemeeterDLL()
+    app = make_app(tmp_path, monkeypatch, dll, sync_interval=0.02, sync_interval_idle=0.02, bus_list=(0, 1))
+    endpoint = VCVM.FakeVolumeEndpoint(50)
+    app.endpoint_factory = lambda: endpoint
+    app.start_sync()
+    assert wait_for(lambda: app.startup is not None)
+    yield app, dll, endpoint
+    app.stop_sync()
+
+
+def test_clean_ticks_do_not_read_gains(sync):
+    app, dll, endpoint = sync
+    assert wait_for(lambda: app.dll_stats['reads_avoided'] > 0)
+    reads = dll.calls['GetParameterFloat']
+    checks = app.dll_stats['dirty_checks']
+    time.sleep(0.3)
+    assert app.dll_stats['dirty_checks'] > checks + 5
+    assert dll.calls['GetParameterFloat'] == reads
+
+
+def test_dirty_flag_brings_the_change_in(sync):
+    app, dll, endpoint = sync
+    reads = dll.calls['GetParameterFloat']
+    dll.external('Bus[1].Gain', -20.0)
+    assert wait_for(lambda: endpoint.volume == app.curve.gain_to_volume(-20.0))
+    # One pass over gain and mute of both buses
+    assert dll.calls['GetParameterFloat'] - reads >= 4
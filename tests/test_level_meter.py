@@ -0,0 +1,87 @@
+"""LevelMeter windowed RMS / peak from a SyntheticLevelSource, with numpy and with the array fallback the exe uses"""
+import math
+import sys
+
+import pytest
+
+from VCVM import LevelMeter, SyntheticLevelSource
+
+
+@pytest.fixture(params=['array', 'numpy'])
+def backend(request, monkeypatch):
+    if request.param == 'numpy':
+        pytest.importorskip('numpy')
+    else:
+        # As in the packaged exe, which excludes numpy
+        monkeypatch.setitem(sys.modules, 'numpy', None)
+    return request.param
+
+
+class Signal:
+    """Bus 0: level on both channels; bus 1: level on the left channel, silence on the right"""
+
+    def __init__(self, level):
+        self.level = level
+
+    def __call__(self, bus, channel, seconds):
+        return self.level if bus == 0 or channel == 0 else 0.0
+
+
+def meter_for(signal, **kwargs):
+    return LevelMeter(SyntheticLevelSource(signal), [0, 1], channels=2, rate=30, window=0.3, **kwargs)
+
+
+def test_uses_the_expected_backend(backend):
+    meter = meter_for(Signal(0.5))
+    assert (meter.numpy is None) == (backend == 'array')
+
+
+def test_window_rms_and_peak(backend):
+    meter = meter_for(Signal(0.5))
+    for _ in range(meter.size):
+        meter.poll()
+    levels = meter.window_levels()
+    assert levels[0][0] == pytest.approx(20 * math.log10(0.5), abs=0.01)
+    assert levels[0][1] == pytest.approx(20 * math.log10(0.5), abs=0.01)
+    # Half the channels silent: the RMS is 3dB under the peak
+    assert levels[1][0] == pytest.approx(20 * math.log10(0.5) - 10 * math.log10(2), abs=0.01)
+    assert levels[1][1] == pytest.approx(20 * math.log10(0.5), abs=0.01)
+
+
+def test_partly_filled_window_only_counts_received_frames(backend):
+    meter = meter_for(Signal(0.25))
+    meter.poll()
+    assert meter.window_levels()[0][0] == pytest.approx(20 * math.log10(0.25), abs=0.01)
+
+
+def test_old_frames_leave_the_window(backend):
+    signal = Signal(1.0)
+    meter = meter_for(signal)
+    for _ in range(meter.size):
+        meter.poll()
+    signal.level = 0.1
+    for _ in range(meter.size // 3):
+        meter.poll()
+    mixed = meter.window_levels()[0]
+    expected_ms = (1.0 * (meter.size - meter.size // 3) + 0.01 * (meter.size // 3)) / meter.size
+    assert mixed[0] == pytest.approx(10 * math.log10(expected_ms), abs=0.01)
+    assert mixed[1] == pytest.approx(0, abs=0.01)
+    for _ in range(meter.size):
+        meter.poll()
+    assert meter.window_levels()[0] == pytest.approx((-20, -20), abs=0.01)
+
+
+def test_levels_are_reported_every_batch(backend):
+    reports = []
+    meter = meter_for(Signal(0.5), batch=3, on_levels=reports.append)
+    for _ in range(7):
+        meter.poll()
+    assert len(reports) == 2
+    assert set(reports[-1]) == {0, 1}
+
+
+def test_missing_frames_are_counted():
+    meter = LevelMeter(type('Source', (), {'read': lambda self, channels: None})(), [0])
+    meter.poll()
+    assert meter.misses == 1
+    assert meter.frames == 0
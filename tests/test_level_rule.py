@@ -0,0 +1,36 @@
+"""The cap rule must not overshoot while the meter window still holds frames from before its last write"""
+import collections
+import math
+
+import pytest
+
+from VCVM import LevelRule
+
+RATE = 30
+WINDOW = 0.3
+
+
+def simulate(source_db, seconds=4.0, delay_frames=1, settle_s=None):
+    """Post-fader RMS over a sliding window, the reduction reaching the audio delay_frames after it is decided"""
+    rule = LevelRule('cap', cap_db=-12, release_db_per_s=6,
+                     settle_s=WINDOW + 2 / RATE if settle_s is None else settle_s)
+    frames = collections.deque(maxlen=round(WINDOW * RATE))
+    applied = collections.deque([0.0] * (delay_frames + 1), maxlen=delay_frames + 1)
+    reductions = []
+    for i in range(int(seconds * RATE)):
+        frames.append(10 ** ((source_db - applied[0]) / 10))
+        rms = 10 * math.log10(sum(frames) / len(frames))
+        applied.append(rule.update({0: (rms, rms)}, [0], i / RATE))
+        reductions.append(applied[-1])
+    return reductions
+
+
+@pytest.mark.parametrize("delay_frames", [0, 1, 2])
+def test_cap_settles_without_overshoot(delay_frames):
+    reductions = simulate(-6, delay_frames=delay_frames)
+    assert max(reductions) == pytest.approx(6, abs=0.2)
+    assert reductions[-1] == pytest.approx(6, abs=0.2)
+
+
+def test_no_reduction_under_the_cap():
+    assert max(simulate(-20)) == 0
@@ -0,0 +1,33 @@
+"""http.server is only imported when the metrics endpoint is enabled, and the endpoint still serves JSON"""
+import json
+import os
+import socket
+import subprocess
+import sys
+import urllib.request
+
+from fakes import FakeVoicemeeterDLL, make_app
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_import_does_not_load_http_server():
+    loaded = subprocess.check_output(
+        [sys.executable, '-c', "import sys, VCVM; print(' '.join(m for m in ('http.server', 'ssl') if m in sys.modules))"],
+        cwd=ROOT, text=True)
+    assert loaded.strip() == ''
+
+
+def test_endpoint_serves_metrics(tmp_path, monkeypatch):
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+    app = make_app(tmp_path, monkeypatch, FakeVoicemeeterDLL(), http_port=port)
+    app.metrics.incr('volume_events')
+    app.start_metrics_server()
+    try:
+        with urllib.request.urlopen(f'http://127.0.0.1:{port}/metrics', timeout=2) as response:
+            snapshot = json.load(response)
+    finally:
+        app.stop_metrics_server()
+    assert snapshot['counters']['volume_events'] == 1
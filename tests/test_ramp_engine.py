@@ -0,0 +1,64 @@
+"""RampEngine moves a value to its target in steps over its duration, and retargets from where it is"""
+import threading
+
+import pytest
+
+from VCVM import RampEngine
+from fakes import wait_for
+
+
+@pytest.fixture
+def ramp():
+    steps = []
+    converged = []
+    ramp = RampEngine("Test", steps.append, duration=0.1, rate=100, on_converged=converged.append)
+    ramp.start()
+    yield ramp, steps, converged
+    ramp.stop()
+
+
+def test_ramp_steps_monotonically_to_the_target(ramp):
+    ramp, steps, converged = ramp
+    ramp.set_target(80, 20)
+    assert wait_for(lambda: converged)
+    assert steps[-1] == 80
+    assert steps == sorted(steps)
+    assert all(20 <= step <= 80 for step in steps)
+    # About duration * rate steps, not a single jump
+    assert len(steps) >= 4
+    assert 0.1 <= converged[0] < 0.5
+
+
+def test_retarget_continues_from_the_current_value(ramp):
+    ramp, steps, converged = ramp
+    ramp.duration = 0.5  # long enough to still be running when the new target comes
+    ramp.set_target(100, 0)
+    assert wait_for(lambda: len(steps) >= 3)
+    ramp.set_target(0, 100)  # the caller's idea of current is ignored while a ramp runs
+    assert wait_for(lambda: converged)
+    peak = max(steps)
+    assert peak < 100
+    assert steps[steps.index(peak):] == sorted(steps[steps.index(peak):], reverse=True)
+    assert steps[-1] == 0
+    assert ramp.retargets == 1
+    assert len(converged) == 1
+
+
+def test_failing_apply_does_not_stop_the_ramp():
+    calls = []
+    done = threading.Event()
+
+    def apply(value):
+        calls.append(value)
+        if value == 10:
+            done.set()
+        raise OSError("endpoint gone")
+
+    ramp = RampEngine("Test", apply, duration=0.05, rate=100)
+    ramp.start()
+    try:
+        ramp.set_target(10, 0)
+        assert done.wait(1)
+        assert len(calls) > 1
+    finally:
+        ramp.stop()
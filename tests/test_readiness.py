@@ -0,0 +1,83 @@
+"""ReadinessCoordinator probes startup dependencies in parallel and returns as soon as all of them pass"""
+import threading
+import time
+
+from VCVM import ReadinessCoordinator
+from fakes import wait_for
+
+
+class Probe:
+    """Ready once ready is set; records the threads it ran on"""
+
+    def __init__(self, ready=False, delay=0.0):
+        self.ready = ready
+        self.delay = delay
+        self.threads = set()
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        self.threads.add(threading.current_thread().name)
+        time.sleep(self.delay)
+        return self.ready
+
+
+def test_all_ready_returns_at_once():
+    coordinator = ReadinessCoordinator({'audio': Probe(True), 'voicemeeter': Probe(True)})
+    started = time.perf_counter()
+    assert coordinator.wait()
+    assert time.perf_counter() - started < 0.5
+    assert set(coordinator.ready_at) == {'audio', 'voicemeeter'}
+    assert coordinator.missing() == []
+
+
+def test_probes_run_in_parallel():
+    # Two blocking probes of 0.3s each: together they take 0.3s, not 0.6s
+    probes = {'audio': Probe(True, delay=0.3), 'voicemeeter': Probe(True, delay=0.3)}
+    started = time.perf_counter()
+    assert ReadinessCoordinator(probes).wait()
+    assert time.perf_counter() - started < 0.55
+    assert probes['audio'].threads == {"Probe-audio"}
+    assert probes['voicemeeter'].threads == {"Probe-voicemeeter"}
+
+
+def test_notify_retries_right_away():
+    probe = Probe()
+    coordinator = ReadinessCoordinator({'voicemeeter': probe}, min_interval=5, max_interval=5, timeout=3)
+    waiter = threading.Thread(target=coordinator.wait)
+    waiter.start()
+    assert wait_for(lambda: probe.calls == 1)
+    probe.ready = True
+    started = time.perf_counter()
+    coordinator.notify()
+    waiter.join(2)
+    assert not waiter.is_alive()
+    assert time.perf_counter() - started < 0.5
+    assert probe.calls == 2
+
+
+def test_timeout_reports_what_is_missing():
+    coordinator = ReadinessCoordinator({'audio': Probe(True), 'voicemeeter': Probe()}, timeout=0.3)
+    assert not coordinator.wait()
+    assert coordinator.missing() == ['voicemeeter']
+
+
+def test_keep_waiting_stops_early():
+    coordinator = ReadinessCoordinator({'audio': Probe()}, timeout=30)
+    started = time.perf_counter()
+    stop_at = started + 0.2
+    assert not coordinator.wait(lambda: time.perf_counter() < stop_at)
+    assert time.perf_counter() - started < 1
+
+
+def test_probe_errors_count_as_not_ready():
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise OSError("not yet")
+        return True
+    coordinator = ReadinessCoordinator({'audio': flaky}, min_interval=0.01)
+    assert coordinator.wait()
+    assert coordinator.attempts['audio'] == 3
@@ -0,0 +1,49 @@
+"""Session recordings keep the bus each gain was read from, and replay feeds it to the sync decisions"""
+import array
+import configparser
+import math
+import struct
+
+from VCVM import DEFAULT_CONFIG, SessionRecorder, SessionReplay, Settings
+
+
+def settings():
+    config = configparser.ConfigParser()
+    config.read_dict(DEFAULT_CONFIG)
+    config.set('Settings', 'bus', '0,3')
+    return Settings.from_config(config)
+
+
+def test_round_trip_keeps_bus(tmp_path):
+    path = str(tmp_path / "session.vcvmrec")
+    recorder = SessionRecorder(path)
+    recorder.record(50, -10.0, 0)
+    recorder.record(50, None, 3)
+    recorder.record(50, -20.0, 3)
+    recorder.close()
+    _, times, windows, gains, buses = SessionRecorder.read(path)
+    assert list(windows) == [50, 50, 50]
+    assert math.isnan(gains[1])
+    assert list(buses) == [0, -1, 3]
+
+
+def test_version_1_recordings_read_as_bus_0(tmp_path):
+    path = tmp_path / "old.vcvmrec"
+    with open(path, 'wb') as f:
+        f.write(SessionRecorder.HEADER.pack(SessionRecorder.MAGIC_V1, 0.0))
+        f.write(struct.pack('<I', 2))
+        array.array('d', [0.0, 1.0]).tofile(f)
+        array.array('f', [50, 50]).tofile(f)
+        array.array('f', [-10.0, math.nan]).tofile(f)
+    _, _, _, _, buses = SessionRecorder.read(str(path))
+    assert list(buses) == [0, -1]
+
+
+def test_replay_decides_on_the_recorded_bus():
+    current = settings()
+    gain = current.curve.volume_to_gain(50)
+    replay = SessionReplay(current)
+    # Bus 3's fader moves: the mixer side changed, Windows follows
+    stats = replay.run([0.0, 1.0], [50, 50], [gain, -30.0], [3, 3])
+    assert stats['decisions'].get('vm->windows') == 1
+    assert replay.writes[0][2] == current.curve.gain_to_volume(-30.0)
@@ -0,0 +1,93 @@
+"""Application sessions from a FakeSessionSource follow their strips, and strip faders move the sessions"""
+import configparser
+
+import pytest
+
+import VCVM
+from fakes import FakeVoicemeeterDLL, make_app, wait_for
+
+
+def settings():
+    config = configparser.ConfigParser()
+    config.read_dict(VCVM.DEFAULT_CONFIG)
+    config.read_dict({'App:spotify': {'strip': '3', 'curve_power': '0.5'}})
+    return VCVM.Settings.from_config(config)
+
+
+@pytest.fixture
+def watcher():
+    source = VCVM.FakeSessionSource({'s1': ('Spotify.exe', 40), 's2': ('chrome.exe', 70)})
+    watcher = VCVM.SessionWatcher(source, settings().rule_for)
+    watcher.start()
+    assert wait_for(lambda: watcher.stats['refreshes'])
+    yield watcher, source
+    watcher.stop()
+
+
+@pytest.fixture
+def sync(tmp_path, monkeypatch):
+    source = VCVM.FakeSessionSource({'s1': ('Spotify.exe', 40)})
+    dll = FakeVoicemeeterDLL()
+    app = make_app(tmp_path, monkeypatch, dll, session_sync=True, session_rules=settings().session_rules)
+    app.endpoint_factory = lambda: VCVM.FakeVolumeEndpoint(50)
+    app.session_source_factory = lambda: source
+    app.start_sync()
+    assert wait_for(lambda: app.startup is not None and app.session_watcher is not None)
+    assert wait_for(lambda: 3 in app.strip_gains)
+    yield app, dll, source
+    app.stop_sync()
+
+
+def test_only_sessions_with_a_rule_are_mapped(watcher):
+    watcher, source = watcher
+    assert watcher.state()['mapped'] == {'s1': 'Spotify.exe'}
+    assert watcher.state()['ignored'] == 1
+    assert watcher.strips() == [3]
+
+
+def test_sessions_are_added_and_removed(watcher):
+    watcher, source = watcher
+    source.add('s3', 'spotify.exe', 20)
+    assert wait_for(lambda: 's3' in watcher.state()['mapped'])
+    assert watcher.keys_for(3) == ['s1', 's3']
+    source.remove('s1')
+    assert wait_for(lambda: 's1' not in watcher.state()['mapped'])
+    assert watcher.keys_for(3) == ['s3']
+
+
+def test_volume_change_is_taken_once(watcher):
+    watcher, source = watcher
+    source.emit('s1', 60)
+    source.emit('s2', 10)
+    assert wait_for(lambda: watcher.stats['volume_changes'])
+    changes = watcher.take_changes()
+    assert list(changes) == ['s1']
+    assert changes['s1'][1] == 60
+    assert watcher.take_changes() == {}
+
+
+def test_app_volume_moves_its_strip(sync):
+    app, dll, source = sync
+    source.emit('s1', 25)
+    expected = VCVM.VolumeCurve.for_power(0.5).volume_to_gain(25)
+    assert wait_for(lambda: dll.params.get('Strip[3].Gain') == pytest.approx(expected, abs=0.01))
+
+
+def test_strip_fader_moves_the_app_volume(sync):
+    app, dll, source = sync
+    dll.external('Strip[3].Gain', -20.0)
+    expected = VCVM.VolumeCurve.for_power(0.5).gain_to_volume(-20.0)
+    assert wait_for(lambda: source.get_volume('s1') == expected)
+    # Our own session write comes back as a notification but is not pushed to the strip again
+    writes = len(dll.writes)
+    app.volume_event.set()
+    assert not wait_for(lambda: dll.writes[writes:], timeout=0.5)
+
+
+def test_new_session_follows_the_strip_too(sync):
+    app, dll, source = sync
+    source.add('s2', 'Spotify.exe', 90)
+    assert wait_for(lambda: 's2' in app.session_watcher.state()['mapped'])
+    dll.external('Strip[3].Gain', -30.0)
+    expected = VCVM.VolumeCurve.for_power(0.5).gain_to_volume(-30.0)
+    assert wait_for(lambda: source.get_volume('s1') == expected and source.get_volume('s2') == expected)
@@ -0,0 +1,97 @@
+"""Settings.from_config rejects out-of-range values with a ValueError naming the key"""
+import configparser
+
+import pytest
+
+from VCVM import DEFAULT_CONFIG, Settings
+
+
+def config_with(section, key, value):
+    config = configparser.ConfigParser()
+    config.read_dict(DEFAULT_CONFIG)
+    config.set(section, key, value)
+    return config
+
+
+def test_defaults_parse():
+    config = configparser.ConfigParser()
+    config.read_dict(DEFAULT_CONFIG)
+    assert Settings.from_config(config).curve.power == 0.55
+
+
+@pytest.mark.parametrize("key, value", [
+    ('curve_power', '0'),
+    ('curve_power', '-1'),
+    ('curve_power', 'nan'),
+    ('sync_interval', '0'),
+    ('sync_interval_idle', '-2'),
+    ('event_fallback_poll', '0'),
+    ('gain_threshold', '-1'),
+    ('volume_threshold', '-1'),
+    ('echo_window', 'inf'),
+    ('ramp_duration', '-0.1'),
+    ('windows_max_rate', '-5'),
+])
+def test_out_of_range_values_raise(key, value):
+    with pytest.raises(ValueError, match=key):
+        Settings.from_config(config_with('Settings', key, value))
+
+
+@pytest.mark.parametrize("section, key, value", [
+    ('Voicemeeter', 'vban_port', '-1'),
+    ('Voicemeeter', 'vban_port', '70000'),
+    ('Voicemeeter', 'reconnect_min_delay', '0'),
+    ('Voicemeeter', 'reconnect_min_delay', '-1'),
+    ('Voicemeeter', 'reconnect_max_delay', '0.1'),
+    ('Logging', 'trace_size', '-1'),
+    ('Tray', 'volume_icon_steps', '0'),
+    ('Metrics', 'http_port', '-1'),
+    ('Metrics', 'http_port', '65536'),
+    ('Control', 'port', '70000'),
+    ('Metering', 'rate', '0'),
+    ('Metering', 'window', '0'),
+    ('Metering', 'channels', '9'),
+    ('Metering', 'cap_db', 'nan'),
+    ('Metering', 'duck_bus', '8'),
+    ('Metering', 'duck_bus', '-2'),
+    ('Metering', 'duck_threshold_db', 'inf'),
+    ('Metering', 'duck_amount_db', '-3'),
+    ('Metering', 'max_reduction_db', '-1'),
+    ('Metering', 'release_db_per_s', '0'),
+    ('Startup', 'ready_timeout', '-1'),
+    ('Startup', 'probe_max_interval', '0'),
+    ('Sessions', 'refresh_interval', '0'),
+])
+def test_out_of_range_values_raise_in_every_section(section, key, value):
+    with pytest.raises(ValueError, match=key):
+        Settings.from_config(config_with(section, key, value))
+
+
+@pytest.mark.parametrize("section, key, value", [
+    ('Voicemeeter', 'vban_port', '65535'),
+    ('Metrics', 'http_port', '0'),
+    ('Control', 'port', '0'),
+    ('Logging', 'trace_size', '0'),
+    ('Metering', 'duck_bus', '-1'),
+    ('Metering', 'duck_bus', '7'),
+    ('Startup', 'ready_timeout', '0'),
+])
+def test_boundary_values_are_allowed(section, key, value):
+    Settings.from_config(config_with(section, key, value))
+
+
+def test_out_of_range_bus_falls_back_to_bus_0():
+    assert Settings.from_config(config_with('Settings', 'bus', '1,8')).bus_list == (0,)
+
+
+def test_zero_thresholds_are_allowed():
+    settings = Settings.from_config(config_with('Settings', 'gain_threshold', '0'))
+    assert settings.gain_threshold == 0
+
+
+def test_bad_profile_curve_falls_back():
+    config = config_with('Settings', 'curve_power', '0.7')
+    config.read_dict({'Device:Headset': {'curve_power': '0'}, 'App:spotify': {'strip': '3', 'curve_power': '0'}})
+    settings = Settings.from_config(config)
+    assert settings.device_profiles[0].curve.power == 0.7
+    assert settings.session_rules == ()
@@ -0,0 +1,35 @@
+"""TickScheduler backs off while idle even when other wake sources keep waking it"""
+import threading
+import time
+
+from VCVM import TickScheduler
+
+
+def run_for(scheduler, seconds, wake=None):
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        if wake is not None and scheduler.ticks % 2:
+            wake.set()  # a write timer, meter write or control command
+        scheduler.wait()
+
+
+def test_backs_off_when_idle():
+    scheduler = TickScheduler(0.01, 0.08, 0.05)
+    run_for(scheduler, 0.4)
+    assert scheduler.interval == 0.08
+
+
+def test_wakes_are_not_activity():
+    wake = threading.Event()
+    scheduler = TickScheduler(0.01, 0.08, 0.05, wake)
+    run_for(scheduler, 0.4, wake)
+    assert scheduler.early_wakes > 0
+    assert scheduler.interval == 0.08
+
+
+def test_mark_active_returns_to_the_fast_rate():
+    scheduler = TickScheduler(0.01, 0.08, 0.05)
+    run_for(scheduler, 0.4)
+    scheduler.mark_active()
+    assert scheduler.interval == 0.01
+    assert scheduler.next_deadline <= time.monotonic() + 0.01
@@ -0,0 +1,42 @@
+"""TraceBuffer keeps the last events in memory and writes them out only when dumped"""
+import VCVM
+from VCVM import TraceBuffer
+
+
+def test_keeps_only_the_newest_events():
+    trace = TraceBuffer(size=3)
+    for volume in range(5):
+        trace.record(volume, -10.0, 'idle')
+    assert [event[1] for event in trace.events] == [2, 3, 4]
+
+
+def test_resize_keeps_the_newest_events():
+    trace = TraceBuffer(size=4)
+    for volume in range(4):
+        trace.record(volume, -10.0, 'idle')
+    trace.resize(2)
+    assert [event[1] for event in trace.events] == [2, 3]
+    trace.resize(0)
+    trace.record(9, -10.0, 'idle')
+    assert len(trace.events) == 0
+
+
+def test_dump_writes_oldest_first(tmp_path):
+    trace = TraceBuffer(size=8)
+    trace.record(40, -20.0, 'windows->vm', -18.5)
+    trace.record(None, None, 'disconnected', result=-2)
+    path = tmp_path / "trace.log"
+    assert trace.dump(path, "test") == 2
+    lines = path.read_text(encoding='utf-8').splitlines()
+    assert lines[0] == "VCVM trace dump - test - 2 events"
+    assert lines[1].endswith("win=40 gain=-20.0 decision=windows->vm detail=-18.5 result=0")
+    assert lines[2].endswith("win=None gain=None decision=disconnected detail=None result=-2")
+
+
+def test_dumps_are_rate_limited_unless_forced(tmp_path):
+    logger = VCVM.LoggerMaster()
+    logger.log_file = str(tmp_path / "VCVM.log")
+    logger.trace.record(50, -10.0, 'idle')
+    assert logger.dump_trace("first") is not None
+    assert logger.dump_trace("again") is None
+    assert logger.dump_trace("forced", force=True) is not None
@@ -0,0 +1,57 @@
+"""VbanTextBackend sends VBAN-TEXT packets a real listener can parse, rate-limited to the latest values"""
+import socket
+import time
+
+import pytest
+
+from VCVM import VbanTextBackend
+
+
+@pytest.fixture
+def listener():
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind(('127.0.0.1', 0))
+    sock.settimeout(1)
+    yield sock
+    sock.close()
+
+
+def receive(sock):
+    """Return (header fields, script) of the next packet"""
+    packet = sock.recv(2048)
+    header = VbanTextBackend.HEADER.unpack_from(packet)
+    return header, packet[VbanTextBackend.HEADER.size:].decode('utf-8')
+
+
+def test_packet_header_and_payload(listener):
+    backend = VbanTextBackend('127.0.0.1', listener.getsockname()[1], stream_name="Command1", max_rate=0)
+    backend.set_parameters({b'Bus[0].Gain': -12.5, b'Bus[3].Mute': 1})
+    (magic, protocol, _, _, data_format, stream, frame), script = receive(listener)
+    assert magic == b'VBAN'
+    assert protocol == VbanTextBackend.PROTOCOL_TEXT | VbanTextBackend.BPS_INDEX_256000
+    assert data_format == VbanTextBackend.FORMAT_UTF8
+    assert stream.rstrip(b'\0') == b'Command1'
+    assert frame == 0
+    assert script == 'Bus[0].Gain=-12.50;Bus[3].Mute=1.00'
+    backend.set_parameters({b'Bus[0].Gain': -6})
+    assert receive(listener)[0][6] == 1
+    backend.close()
+
+
+def test_burst_is_rate_limited_and_ends_on_the_last_value(listener):
+    backend = VbanTextBackend('127.0.0.1', listener.getsockname()[1], max_rate=20)
+    started = time.monotonic()
+    for step in range(1, 51):
+        backend.set_parameters({b'Bus[0].Gain': -float(step)})
+    scripts = [receive(listener)[1]]
+    scripts.append(receive(listener)[1])
+    elapsed = time.monotonic() - started
+    listener.settimeout(0.2)
+    with pytest.raises(socket.timeout):
+        listener.recv(2048)
+    # The first value goes out at once, the rest of the burst in one trailing packet a rate interval later
+    assert scripts == ['Bus[0].Gain=-1.00', 'Bus[0].Gain=-50.00']
+    assert elapsed >= 0.04
+    assert backend.stats['packets'] == 2
+    assert backend.stats['coalesced'] == 48
+    backend.close()
@@ -0,0 +1,78 @@
+"""VoicemeeterActor runs every DLL call on one thread, in order, and callers never wait forever"""
+import concurrent.futures
+import queue
+import threading
+
+import pytest
+
+from VCVM import Metrics, VoicemeeterActor
+
+
+@pytest.fixture
+def actor():
+    actor = VoicemeeterActor(Metrics(), maxsize=4, timeout=0.3)
+    yield actor
+    actor.stop()
+
+
+def blocker(actor):
+    """Queue a call that holds the actor thread until the returned event is set"""
+    started, release = threading.Event(), threading.Event()
+
+    def hold():
+        started.set()
+        release.wait(2)
+    actor.submit('hold', hold)
+    assert started.wait(1)
+    return release
+
+
+def test_calls_run_in_submission_order_on_one_thread(actor):
+    ran = []
+    release = blocker(actor)
+    futures = [actor.submit('call', lambda n=n: ran.append((n, threading.current_thread().name)) or n) for n in range(4)]
+    release.set()
+    assert [future.result(1) for future in futures] == [0, 1, 2, 3]
+    assert ran == [(n, "VoicemeeterActor") for n in range(4)]
+
+
+def test_keyed_write_replaces_the_queued_one(actor):
+    written = []
+    release = blocker(actor)
+    first = actor.submit('write', written.append, -10, key='Bus[0].Gain')
+    other = actor.submit('write', written.append, 'mute', key='Bus[0].Mute')
+    second = actor.submit('write', written.append, -20, key='Bus[0].Gain')
+    release.set()
+    assert first.result(1) is None and second.result(1) is None and other.result(1) is None
+    # The newer gain took the older one's place in the queue, ahead of the mute
+    assert written == [-20, 'mute']
+    assert actor.stats()['coalesced'] == 1
+
+
+def test_exceptions_reach_the_caller(actor):
+    def fail():
+        raise OSError("DLL gone")
+    with pytest.raises(OSError):
+        actor.call('fail', fail)
+    assert actor.call('after', lambda: 1) == 1
+
+
+def test_call_times_out_when_the_actor_is_stuck(actor):
+    release = blocker(actor)
+    with pytest.raises(concurrent.futures.TimeoutError):
+        actor.call('late', lambda: 1)
+    release.set()
+
+
+def test_full_queue_rejects_after_the_timeout(actor):
+    release = blocker(actor)
+    for n in range(4):
+        actor.submit('fill', lambda: None)
+    with pytest.raises(queue.Full):
+        actor.submit('overflow', lambda: None)
+    assert actor.stats()['rejected'] == 1
+    release.set()
+
+
+def test_call_from_the_actor_thread_runs_inline(actor):
+    assert actor.call('outer', lambda: actor.call('inner', lambda: 'nested')) == 'nested'
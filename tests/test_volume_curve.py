@@ -0,0 +1,59 @@
+"""The precomputed curve tables must give exactly what the original formulas gave"""
+import math
+import random
+
+import pytest
+
+from VCVM import VolumeCurve
+
+POWERS = [0.55, 0.3, 1.0, 1.7, 2.5, 0.123]
+
+
+def formula_volume_to_gain(volume, power):
+    if volume <= 0:
+        return -60
+    elif volume >= 100:
+        return 12
+    gain = (volume / 100) ** power * 72 - 60
+    return round(gain, 2)
+
+
+def formula_gain_to_volume(gain, power):
+    if gain <= -60:
+        return 0
+    elif gain >= 12:
+        return 100
+    volume = ((gain + 60) / 72) ** (1 / power) * 100
+    return int(volume)
+
+
+@pytest.mark.parametrize("power", POWERS)
+def test_every_integer_volume(power):
+    curve = VolumeCurve(power)
+    for volume in range(-5, 106):
+        assert curve.volume_to_gain(volume) == formula_volume_to_gain(volume, power), volume
+
+
+@pytest.mark.parametrize("power", POWERS)
+def test_gain_boundaries(power):
+    """Each threshold and the float just below it land on either side of a volume step, like the formula"""
+    curve = VolumeCurve(power)
+    for threshold in curve.gain_volume_thresholds:
+        for gain in (threshold, math.nextafter(threshold, -math.inf), math.nextafter(threshold, math.inf)):
+            assert curve.gain_to_volume(gain) == formula_gain_to_volume(gain, power), gain
+    for gain in (-61, -60, math.nextafter(-60, math.inf), 0, math.nextafter(12, -math.inf), 12, 13):
+        assert curve.gain_to_volume(gain) == formula_gain_to_volume(gain, power), gain
+
+
+@pytest.mark.parametrize("power", POWERS)
+def test_round_trip_and_random_gains(power):
+    curve = VolumeCurve(power)
+    for volume in range(101):
+        gain = curve.volume_to_gain(volume)
+        assert curve.gain_to_volume(gain) == formula_gain_to_volume(gain, power)
+    rng = random.Random(power)
+    for i in range(20000):
+        gain = rng.uniform(-62, 14)
+        if i % 3 == 0:
+            gain = round(gain, 2)
+        assert curve.gain_to_volume(gain) == formula_gain_to_volume(gain, power), gain
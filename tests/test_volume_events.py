@@ -0,0 +1,58 @@
+"""Endpoint volume notifications drive the sync without polling, and the sync's own writes come back as echoes"""
+import time
+
+import pytest
+
+import VCVM
+from fakes import FakeVoicemeeterDLL, make_app, wait_for
+
+
+class CountingEndpoint(VCVM.FakeVolumeEndpoint):
+    def __init__(self, volume):
+        super().__init__(volume)
+        self.reads = 0
+
+    def get_volume(self):
+        self.reads += 1
+        return super().get_volume()
+
+
+@pytest.fixture
+def sync(tmp_path, monkeypatch):
+    dll = FakeVoicemeeterDLL()
+    # Slow ticks and a long fallback poll: only a notification can make the sync react quickly
+    app = make_app(tmp_path, monkeypatch, dll, sync_interval=1.0, sync_interval_idle=1.0, event_fallback_poll=60,
+                   bus_list=(0,))
+    endpoint = CountingEndpoint(50)
+    app.endpoint_factory = lambda: endpoint
+    app.start_sync()
+    assert wait_for(lambda: app.startup is not None)
+    yield app, dll, endpoint
+    app.stop_sync()
+
+
+def test_change_is_picked_up_without_polling(sync):
+    app, dll, endpoint = sync
+    assert app.volume_events_active
+    reads = endpoint.reads
+    started = time.monotonic()
+    endpoint.emit(30)
+    expected = app.curve.volume_to_gain(30)
+    assert wait_for(lambda: dll.params.get('Bus[0].Gain') == pytest.approx(expected, abs=0.01))
+    # Well under the 1s tick: the notification woke the loop
+    assert time.monotonic() - started < 0.5
+    assert endpoint.reads == reads
+
+
+def test_own_windows_write_is_an_echo(sync):
+    app, dll, endpoint = sync
+    dll.external('Bus[0].Gain', -30.0)
+    expected = app.curve.gain_to_volume(-30.0)
+    assert wait_for(lambda: endpoint.volume == expected)
+    writes = len(dll.writes)
+    # The endpoint notified our own write: the loop sees it, but must not push it back to the bus
+    assert wait_for(lambda: app.event_windows_vol == expected)
+    time.sleep(1.2)
+    assert dll.writes[writes:] == []
+    assert dll.params['Bus[0].Gain'] == -30.0
+    assert app.metrics.snapshot()['counters'].get('sync.windows_to_vm', 0) == 0
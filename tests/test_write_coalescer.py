@@ -0,0 +1,38 @@
+"""WriteCoalescer: the latest value always reaches the backend last"""
+import threading
+import time
+
+from VCVM import WriteCoalescer
+
+
+def test_slow_write_is_not_overtaken():
+    applied = []
+    first = threading.Event()
+
+    def apply(batch):
+        if not applied:
+            first.set()
+            time.sleep(0.1)  # a slow DLL call on the first write
+        applied.append(batch['gain'])
+
+    coalescer = WriteCoalescer("test", apply, max_rate=0)
+    writer = threading.Thread(target=coalescer.submit, args=({'gain': 1},))
+    writer.start()
+    first.wait(1)
+    coalescer.submit({'gain': 2})
+    writer.join()
+    assert applied == [1, 2]
+
+
+def test_burst_keeps_latest_and_flushes_trailing_value():
+    applied = []
+    wake = threading.Event()
+    coalescer = WriteCoalescer("test", lambda batch: applied.append(batch['gain']), max_rate=20, wake=wake)
+    for gain in range(10):
+        coalescer.submit({'gain': gain})
+    assert applied == [0]
+    assert wake.wait(1)
+    coalescer.flush_due()
+    assert applied == [0, 9]
+    assert coalescer.stats['superseded'] == 8
+
@@ -0,0 +1,69 @@
+"""WriteJournal tells the sync's own writes coming back from external changes, within its echo window"""
+import configparser
+
+import pytest
+
+import VCVM
+from VCVM import SyncCore, WriteJournal
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+@pytest.fixture
+def journal(clock):
+    return WriteJournal(ttl=2.0, clock=clock)
+
+
+def test_own_write_is_an_echo_within_tolerance(journal):
+    journal.record('windows', 40)
+    assert journal.is_echo('windows', 40, 1)
+    assert journal.is_echo('windows', 41, 1)
+    assert not journal.is_echo('windows', 43, 1)
+    assert not journal.is_echo('bus:0', 40, 1)
+
+
+def test_echo_expires_after_the_window(journal, clock):
+    journal.record('windows', 40)
+    clock.now = 1.9
+    assert journal.is_echo('windows', 40, 0)
+    clock.now = 2.1
+    assert not journal.is_echo('windows', 40, 0)
+
+
+def test_every_recent_write_counts(journal, clock):
+    # Ramp steps: the endpoint may report any of them, in any order
+    for step, volume in enumerate((30, 35, 40)):
+        clock.now = step * 0.1
+        journal.record('windows', volume)
+    assert all(journal.is_echo('windows', volume, 0) for volume in (35, 30, 40))
+    journal.clear()
+    assert not journal.is_echo('windows', 40, 0)
+
+
+def test_sync_core_skips_echoes_but_not_external_changes(journal, clock):
+    config = configparser.ConfigParser()
+    config.read_dict(VCVM.DEFAULT_CONFIG)
+    settings = VCVM.Settings.from_config(config)
+    core = SyncCore(journal)
+    core.last_windows_vol, core.last_vm_gain = 50, settings.curve.volume_to_gain(50)
+    # Mixer moved: the sync ramps Windows to the matching volume, and the endpoint reports the steps back
+    gain = core.last_vm_gain - 10
+    decision, volume = core.decide(50, gain, settings, settings.curve)
+    assert decision == 'vm->windows'
+    journal.record('windows', volume)
+    core.settle(decision, 50, gain, volume, windows_written=False)
+    assert core.decide(volume, gain, settings, settings.curve)[0] == 'windows-echo'
+    # The same value long after the echo window is the user's own change
+    clock.now = 10
+    assert core.decide(volume, gain, settings, settings.curve)[0] == 'windows->vm'